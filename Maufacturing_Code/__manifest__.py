@@ -3,7 +3,7 @@
     'version': '18.0.1.0.0',
     'category': 'Manufacturing',
     'summary': 'Auto-generate codes for semi-finished and finished products',
-    'depends': ['mrp'],
+    'depends': ['mrp', 'stock_lot_numbering'],
     'data': [
         'data/ir_sequence_data.xml',
         'views/product_template_views.xml',
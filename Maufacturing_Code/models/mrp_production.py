@@ -51,20 +51,9 @@ class MrpProduction(models.Model):
 
             prefix = f"{semi_initial}-WIP-{year}"
 
-            # Get last lot for this product
-            last_lot = StockLot.search([
-                ('product_id', '=', self.product_id.id),
-                ('name', '=like', f'{prefix}-%')
-            ], order='id desc', limit=1)
-
-            last_number = 0
-            if last_lot:
-                match = re.search(r'-(\d+)$', last_lot.name)
-                if match:
-                    last_number = int(match.group(1))
-
-            lot_number = str(last_number + 1).zfill(5)
-            lot_name = f"{prefix}-{lot_number}"
+            # Next number of this product's yearly counter
+            lot_name = self.env['stock.lot.counter']._next_lot_names(
+                self.product_id, prefix, padding=5, year=int(year))[0]
             self.semi_finish_code = lot_name
 
             # Create or fetch lot
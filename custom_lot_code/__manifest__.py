@@ -3,7 +3,7 @@
     'version': '1.0',
     'category': 'Inventory',
     'summary': 'Auto-generate lot numbers based on vendor codes',
-    'depends': ['stock', 'base','mrp'],
+    'depends': ['stock', 'base','mrp', 'stock_lot_numbering'],
     'data': [
         'views/res_partner_views.xml',
         'views/mrp_production_views.xml',
@@ -1,5 +1,5 @@
 import logging
-import re
+from collections import defaultdict
 from odoo import models, fields, api
 
 _logger = logging.getLogger(__name__)
@@ -9,58 +9,53 @@ class MrpProduction(models.Model):
     _inherit = 'mrp.production'
 
     def action_generate_custom_mfg_lot(self):
-        """Logic for MO: ProductCode-0001, 0002... and assign to lot_producing_id"""
-        self.ensure_one()
-        _logger.info(">>> Starting Custom MFG Lot Generation for MO: %s", self.name)
-
-        if not self.product_id or self.product_id.tracking == 'none':
-            _logger.warning(">>> MO %s product is not tracked by Lots/Serials.", self.name)
+        """Logic for MO: ProductCode-0001, 0002... and assign to lot_producing_id
+
+        Works on any number of MOs: numbers are reserved with one counter
+        update per product/prefix and all lots are created in one create.
+        """
+        productions = self.filtered(lambda mo: mo.product_id and mo.product_id.tracking != 'none')
+        for mo in self - productions:
+            _logger.warning(">>> MO %s product is not tracked by Lots/Serials.", mo.name)
+        if not productions:
             return
 
-        # 1. Get Prefix from Product
-        prefix = self.product_id.manuf_lot_code or "MFG"
-        _logger.info(">>> Using Prefix: %s for Product: %s", prefix, self.product_id.display_name)
-
-        # 2. Find the last lot for this product with this prefix
-        last_lot = self.env['stock.lot'].search([
-            ('product_id', '=', self.product_id.id),
-            ('name', '=like', f'{prefix}-%')
-        ], order='name desc', limit=1)
-
-        last_number = 0
-        if last_lot:
-            _logger.info(">>> Found last lot: %s", last_lot.name)
-            match = re.search(r'-(\d+)$', last_lot.name)
-            if match:
-                last_number = int(match.group(1))
-
-        generated_name = f"{prefix}-{str(last_number + 1).zfill(4)}"
-        _logger.info(">>> Generated New Lot Name: %s", generated_name)
-
-        # 3. Create or Find the Lot record
-        # We need an actual stock.lot record to assign it to lot_producing_id (Many2one)
-        new_lot = self.env['stock.lot'].create({
-            'name': generated_name,
-            'product_id': self.product_id.id,
-            'company_id': self.company_id.id,
-        })
-        _logger.info(">>> Created New Stock Lot Record ID: %s", new_lot.id)
-
-        # 4. Assign to the MO Header Field
-        self.write({'lot_producing_id': new_lot.id})
-        _logger.info(">>> Assigned Lot %s to MO Header (lot_producing_id)", generated_name)
-
-        # 5. Sync with Move Lines
-        # This ensures the 'Finished Product' move lines also get the same lot
-        for move in self.move_finished_ids.filtered(lambda m: m.product_id == self.product_id):
-            if not move.move_line_ids:
-                move._generate_serial_numbers()
-
-            for line in move.move_line_ids:
-                line.write({
+        # 1. Group MOs by product and prefix
+        groups = defaultdict(lambda: self.browse())
+        for mo in productions:
+            groups[(mo.product_id, mo.product_id.manuf_lot_code or "MFG")] |= mo
+
+        # 2. Reserve one number per MO from each product/prefix counter
+        Counter = self.env['stock.lot.counter']
+        ordered = self.browse()
+        lot_vals_list = []
+        for (product, prefix), mos in groups.items():
+            names = Counter._next_lot_names(product, prefix, count=len(mos))
+            lot_vals_list += [{
+                'name': name,
+                'product_id': product.id,
+                'company_id': mo.company_id.id,
+            } for mo, name in zip(mos, names)]
+            ordered |= mos
+
+        # 3. Create the Lot records
+        # We need actual stock.lot records to assign them to lot_producing_id (Many2one)
+        new_lots = self.env['stock.lot'].create(lot_vals_list)
+        _logger.info(">>> Created %s Stock Lot Records for %s MOs", len(new_lots), len(ordered))
+
+        for mo, new_lot in zip(ordered, new_lots):
+            # 4. Assign to the MO Header Field
+            mo.lot_producing_id = new_lot
+
+            # 5. Sync with Move Lines
+            # This ensures the 'Finished Product' move lines also get the same lot
+            for move in mo.move_finished_ids.filtered(lambda m: m.product_id == mo.product_id):
+                if not move.move_line_ids:
+                    move._generate_serial_numbers()
+
+                move.move_line_ids.write({
                     'lot_id': new_lot.id,
-                    'quantity': self.product_qty  # Optional: sets produce qty to demand
+                    'quantity': mo.product_qty  # Optional: sets produce qty to demand
                 })
-                _logger.info(">>> Updated Move Line ID %s with Lot ID %s", line.id, new_lot.id)
 
-        return True
\ No newline at end of file
+        return True
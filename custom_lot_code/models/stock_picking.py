@@ -58,7 +58,7 @@ class StockMove(models.Model):
 
 
 import logging
-import re  # Important: This must be here for the incrementing to work
+from collections import defaultdict
 from datetime import datetime
 from odoo import models, fields, api
 
@@ -71,79 +71,144 @@ class ProductTemplate(models.Model):
     manuf_lot_code = fields.Char(string="Manufacturing Lot Code")
 
 
+class StockPicking(models.Model):
+    _inherit = 'stock.picking'
+
+    def action_auto_generate_lots(self):
+        """Generate lots for every tracked move of the selected transfers at once"""
+        self.move_ids._assign_custom_lot_names()
+        return True
+
+
 class StockMove(models.Model):
     _inherit = 'stock.move'
 
+    def _is_custom_mfg_move(self):
+        self.ensure_one()
+        return bool(self.production_id or self.raw_material_production_id or self.env.context.get(
+            'active_model') == 'mrp.production')
+
+    def _get_custom_lot_names(self, counts):
+        """Return {move id: [lot names]} for ``counts`` ({move: number of names}).
+
+        Manufacturing moves of the same product/prefix share a single counter
+        reservation; receipts get their vendor/date name.
+        """
+        names = {}
+        mfg_groups = defaultdict(list)
+        for move, count in counts.items():
+            # --- MANUFACTURING LOGIC: PRODUCT_CODE-0001 ---
+            if move._is_custom_mfg_move():
+                prefix = move.product_id.manuf_lot_code or "MFG"
+                mfg_groups[(move.product_id, prefix)].append((move, count))
+
+            # --- PURCHASE/RECEIPT LOGIC: VENDOR_CODE-MM-DD-YY ---
+            else:
+                vendor = move.picking_id.partner_id
+                prefix = vendor.lot_code if vendor and vendor.lot_code else "LOT"
+                date_str = datetime.now().strftime('%m-%d-%y')
+                names[move.id] = [f"{prefix}-{date_str}"] * count
+
+        Counter = self.env['stock.lot.counter']
+        for (product, prefix), move_counts in mfg_groups.items():
+            reserved = Counter._next_lot_names(product, prefix, count=sum(count for _move, count in move_counts))
+            for move, count in move_counts:
+                names[move.id], reserved = reserved[:count], reserved[count:]
+        return names
+
     def _get_custom_lot_name(self):
         """Logic to split Manufacturing (Sequence) and Purchasing (Date)"""
-        # --- MANUFACTURING LOGIC: PRODUCT_CODE-0001 ---
-        if self.production_id or self.raw_material_production_id or self.env.context.get(
-                'active_model') == 'mrp.production':
-            prefix = self.product_id.manuf_lot_code or "MFG"
-
-            # Search existing lots for this specific product and prefix
-            domain = [
-                ('product_id', '=', self.product_id.id),
-                ('name', '=like', f'{prefix}-%')
-            ]
-            last_lot = self.env['stock.lot'].search(domain, order='id desc', limit=1)
-
-            last_number = 0
-            if last_lot:
-                # Use regex to find the digits after the last hyphen
-                # e.g., from "PROD-0004" it finds "0004"
-                numbers = re.findall(r'-(\d+)$', last_lot.name)
-                if numbers:
-                    last_number = int(numbers[-1])
-
-            new_number = str(last_number + 1).zfill(4)
-            return f"{prefix}-{new_number}"
-
-        # --- PURCHASE/RECEIPT LOGIC: VENDOR_CODE-MM-DD-YY ---
+        self.ensure_one()
+        return self._get_custom_lot_names({self: 1})[self.id][0]
+
+    def _assign_custom_lot_names(self, create_lots=False):
+        """Fill the Lot/Serial Number of all pending move lines of ``self``.
+
+        Missing move lines are created in one create, lot numbers are reserved
+        with one counter update per product/prefix (one number per line for
+        serials, one per move for lots) and lines sharing a name are written
+        together, whatever their product.  With ``create_lots`` the stock.lot
+        records are created up front in one create and set as lot_id instead
+        of lot_name, one write per lot.
+        """
+        moves = self.filtered(lambda m: m.has_tracking != 'none')
+        missing = moves.filtered(lambda m: not m.move_line_ids)
+        if missing:
+            # Create a default line where none exists
+            self.env['stock.move.line'].create([{
+                'move_id': move.id,
+                'picking_id': move.picking_id.id,
+                'product_id': move.product_id.id,
+                'product_uom_id': move.product_uom.id,
+                'location_id': move.location_id.id,
+                'location_dest_id': move.location_dest_id.id,
+                'quantity': move.product_uom_qty,
+            } for move in missing])
+            moves.invalidate_recordset(['move_line_ids'])
+
+        pending = {}
+        for move in moves:
+            lines = move.move_line_ids.filtered(lambda l: not l.lot_name and not l.lot_id)
+            if lines:
+                pending[move] = lines
+        if not pending:
+            return self.env['stock.move.line']
+
+        names = moves._get_custom_lot_names({
+            move: len(lines) if move.has_tracking == 'serial' else 1
+            for move, lines in pending.items()
+        })
+        # lot_name is plain text: group by name only; a stock.lot also
+        # belongs to a product and company
+        lines_by_key = defaultdict(lambda: self.env['stock.move.line'])
+        for move, lines in pending.items():
+            move_names = names[move.id]
+            for index, line in enumerate(lines):
+                name = move_names[index] if move.has_tracking == 'serial' else move_names[0]
+                key = (name, move.product_id.id, move.company_id.id) if create_lots else name
+                lines_by_key[key] |= line
+
+        if create_lots:
+            StockLot = self.env['stock.lot']
+            existing = StockLot.search([
+                ('name', 'in', list({key[0] for key in lines_by_key})),
+                ('product_id', 'in', list({key[1] for key in lines_by_key})),
+            ])
+            lots = {(lot.name, lot.product_id.id, lot.company_id.id): lot for lot in existing}
+            to_create = [key for key in lines_by_key if key not in lots]
+            created = StockLot.create([
+                {'name': name, 'product_id': product_id, 'company_id': company_id}
+                for name, product_id, company_id in to_create
+            ])
+            lots.update(zip(to_create, created))
+            for key, lines in lines_by_key.items():
+                lines.write({'lot_id': lots[key].id})
         else:
-            vendor = self.picking_id.partner_id
-            prefix = vendor.lot_code if vendor and vendor.lot_code else "LOT"
-            date_str = datetime.now().strftime('%m-%d-%y')
-            return f"{prefix}-{date_str}"
+            for name, lines in lines_by_key.items():
+                lines.write({'lot_name': name})
+
+        _logger.info(">>> Assigned lots to %s move lines of %s moves",
+                     sum(len(lines) for lines in pending.values()), len(pending))
+        return self.env['stock.move.line'].union(*pending.values())
 
     def action_generate_serial(self):
         """Force the '+' button in Manufacturing to use our custom logic"""
         self.ensure_one()
         if self.has_tracking != 'none':
-            new_name = self._get_custom_lot_name()
-            # This sets the value for the Odoo widget
-            self.next_lot_not_instanciated = new_name
-
             # For Odoo 18 Manufacturing, we also apply it to the move lines immediately
             if not self.move_line_ids:
                 self.action_show_details()  # Ensure lines are initialized
 
-            for line in self.move_line_ids:
-                if not line.lot_name and not line.lot_id:
-                    line.lot_name = new_name
+            lines = self._assign_custom_lot_names()
+            # This sets the value for the Odoo widget
+            self.next_lot_not_instanciated = lines[:1].lot_name or self.next_lot_not_instanciated
             return True
         return super().action_generate_serial()
 
     def action_open_auto_generate_lots(self):
         """Your custom button logic"""
         self.ensure_one()
-        generated_name = self._get_custom_lot_name()
-
-        if not self.move_line_ids:
-            # Create a default line if none exists
-            self.env['stock.move.line'].create({
-                'move_id': self.id,
-                'picking_id': self.picking_id.id,
-                'product_id': self.product_id.id,
-                'product_uom_id': self.product_uom.id,
-                'location_id': self.location_id.id,
-                'location_dest_id': self.location_dest_id.id,
-                'quantity': self.product_uom_qty,
-            })
-
-        self.invalidate_recordset(['move_line_ids'])
-        for line in self.move_line_ids.filtered(lambda l: not l.lot_name and not l.lot_id):
-            line.write({'lot_name': generated_name})
+        self._assign_custom_lot_names()
 
         return {
             'type': 'ir.actions.act_window',
@@ -1,3 +1,6 @@
+from bisect import bisect_right
+from collections import defaultdict
+
 from odoo import models, fields, api
 
 
@@ -29,22 +32,77 @@ class AccountMove(models.Model):
         compute='_compute_amount_total_words_pkr'
     )
 
-    @api.depends('amount_untaxed', 'amount_tax', 'amount_total', 'amount_residual', 'currency_id', 'invoice_date')
+    @api.depends('amount_untaxed', 'amount_tax', 'amount_total', 'amount_residual',
+                 'currency_id', 'company_id', 'date', 'invoice_date')
     def _compute_pkr_totals(self):
+        # Rates are resolved once per (currency, company, date) for the whole
+        # recordset instead of once per amount and move
+        rates = self._get_pkr_conversion_rates()
+        today = fields.Date.today()
         for move in self:
             company_currency = move.company_id.currency_id
-            date = move.date or fields.Date.today()
-
-            # Helper function to reduce repetitive code
-            def convert_to_pkr(amount):
-                return move.currency_id._convert(
-                    amount, company_currency, move.company_id, date
-                )
-
-            move.amount_untaxed_pkr = convert_to_pkr(move.amount_untaxed)
-            move.amount_tax_pkr = convert_to_pkr(move.amount_tax)
-            move.amount_total_pkr = convert_to_pkr(move.amount_total)
-            move.amount_residual_pkr = convert_to_pkr(move.amount_residual)
+            rate = rates.get((move.currency_id.id, move.company_id.id, move.date or today), 1.0)
+
+            move.amount_untaxed_pkr = company_currency.round(move.amount_untaxed * rate)
+            move.amount_tax_pkr = company_currency.round(move.amount_tax * rate)
+            move.amount_total_pkr = company_currency.round(move.amount_total * rate)
+            move.amount_residual_pkr = company_currency.round(move.amount_residual * rate)
+
+    def _get_pkr_conversion_rates(self):
+        """Return {(currency_id, company_id, date): rate to the company currency}.
+
+        Same rates as ``res.currency._get_rates``: every rate of the involved
+        currencies is read with a single query and the date of each move is
+        resolved in Python.
+        """
+        today = fields.Date.today()
+        keys = {
+            (move.currency_id, move.company_id, move.date or today)
+            for move in self if move.currency_id and move.company_id
+        }
+        if not keys:
+            return {}
+
+        currency_ids = {currency.id for currency, company, date in keys}
+        currency_ids |= {company.currency_id.id for currency, company, date in keys}
+        root_ids = {company.root_id.id for currency, company, date in keys}
+        self.env['res.currency.rate'].flush_model(['currency_id', 'company_id', 'name', 'rate'])
+        self.env.cr.execute("""
+            SELECT currency_id, company_id, name, rate
+              FROM res_currency_rate
+             WHERE currency_id IN %s
+               AND (company_id IS NULL OR company_id IN %s)
+          ORDER BY currency_id, company_id, name
+        """, [tuple(currency_ids), tuple(root_ids)])
+        # {(currency_id, company_id or False): ([dates], [rates])}, by date
+        history = defaultdict(lambda: ([], []))
+        for currency_id, company_id, date, rate in self.env.cr.fetchall():
+            dates, values = history[(currency_id, company_id or False)]
+            dates.append(date)
+            values.append(rate)
+
+        def get_rate(currency_id, root_id, date):
+            # Company rates win over shared ones; the oldest rate is used for
+            # dates before the first one, 1.0 when the currency has none
+            candidates = [history[key] for key in ((currency_id, root_id), (currency_id, False)) if key in history]
+            for dates, values in candidates:
+                index = bisect_right(dates, date)
+                if index:
+                    return values[index - 1]
+            for dates, values in candidates:
+                return values[0]
+            return 1.0
+
+        rates = {}
+        for currency, company, date in keys:
+            company_currency = company.currency_id
+            if currency == company_currency:
+                rate = 1.0
+            else:
+                root_id = company.root_id.id
+                rate = get_rate(company_currency.id, root_id, date) / get_rate(currency.id, root_id, date)
+            rates[(currency.id, company.id, date)] = rate
+        return rates
 
     @api.depends('amount_total_pkr')
     def _compute_amount_total_words_pkr(self):
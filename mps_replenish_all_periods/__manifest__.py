@@ -17,7 +17,9 @@
 #
 # What this module does NOT do:
 #   - Add new models                  ✗
-#   - Add new database fields         ✗
+#   - Add new database tables         ✗
+#     (one stored Json field, mps_input_fingerprints, is added on
+#      mrp.production.schedule for incremental replenishment)
 #   - Create duplicate MPS screens    ✗
 #   - Override scheduler behavior     ✗
 #   - Modify procurement rules        ✗
@@ -66,7 +68,9 @@ The single ``procurement.group.run()`` call ensures:
 
 Technical Notes
 ---------------
-* Only ``mrp.production.schedule`` is inherited (``_inherit``)
+* Only ``mrp.production.schedule`` is inherited (``_inherit``); it gains one
+  stored Json field, ``mps_input_fingerprints``, used by incremental
+  replenishment to skip schedules whose planning inputs did not change
 * ``mrp.production.schedule.state`` is read-only (no field additions)
 * Uses ``procurement.group.Procurement`` namedtuple (stable Odoo API)
 * Fully dynamic: works for monthly, weekly, or custom horizon configs
@@ -102,6 +106,7 @@ Technical Notes
     'application': False,
 
     # ── Technical info ────────────────────────────────────────────────────
-    # This module has NO database migrations: zero new fields or tables.
-    # It is safe to install/uninstall without affecting existing MPS data.
+    # No new tables; the only new column is the Json field
+    # mrp.production.schedule.mps_input_fingerprints, which is created on
+    # install and simply dropped on uninstall. Existing MPS data is untouched.
 }
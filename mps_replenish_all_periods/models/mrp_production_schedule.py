@@ -37,6 +37,11 @@
 #              − security_lead      (company.po_lead)
 #              − days_to_purchase   (product.days_to_purchase, if set)
 #
+# The lead time is counted in working days of the company resource calendar
+# (calendar days when the company has none).  Seller, total lead and order
+# dates are resolved once per run for every distinct (product, company, uom,
+# seller quantity bracket) in _mps_build_lead_time_table.
+#
 # If the computed order_date is in the past, today's date is used instead.
 # date_planned on each order line is always the original date_needed.
 #
@@ -68,6 +73,24 @@
 # same year-month raises a UserError listing all conflicts so the planner
 # can review before re-running.
 #
+# INCREMENTAL REPLANNING
+# ----------------------
+# Every run stores, per schedule and period, a fingerprint of the planning
+# inputs (forecast qty, safety target, on-hand, confirmed PO, open MO, BOM
+# version, MOQ / safety stock) in mps_input_fingerprints.  When the run is
+# started with context mps_incremental=True (action_replenish_incremental),
+# schedules whose fingerprints are unchanged since the last run are skipped,
+# so nightly full-warehouse runs only replan products whose demand or supply
+# moved.
+#
+# PARALLEL PLANNING
+# -----------------
+# action_replenish is split into a read-only planning phase
+# (_mps_plan_replenishment) and a single-writer phase
+# (_mps_apply_replenishment_plan).  action_replenish_parallel plans each
+# (company, warehouse) partition in its own worker/cursor and merges the
+# resulting RFQ specs before the single write.
+#
 # BUGS FIXED (carried over from previous version)
 # ------------------------------------------------
 # BUG 1  — replenish_trigger='never' silently dropped the whole schedule
@@ -83,21 +106,38 @@
 #           instead of being merged into a single line (quantities now summed)
 # =============================================================================
 
+import hashlib
 import logging
 import math
 import calendar
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date as date_type, datetime, timedelta
 
+import pytz
+
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
+from odoo.tools import config
 
 _logger = logging.getLogger(__name__)
 
+# Parallel planning workers when no system parameter is set; each one holds
+# its own database connection
+MPS_DEFAULT_MAX_WORKERS = 2
+
 
 class MrpProductionScheduleAllPeriods(models.Model):
     _inherit = 'mrp.production.schedule'
 
+    # Per-period input fingerprints of the last replenishment run:
+    #   { 'YYYY-MM-DD' (period date_start): sha1 hex digest }
+    mps_input_fingerprints = fields.Json(
+        string='MPS Input Fingerprints',
+        copy=False,
+        readonly=True,
+    )
+
     # =========================================================================
     # Override: get_production_schedule_view_state
     # Fix on-hand always showing 0 after a completed MO
@@ -115,6 +155,14 @@ class MrpProductionScheduleAllPeriods(models.Model):
 
         schedule_by_id = {rec.id: rec for rec in self}
 
+        # One grouped query for every (product, stock location, company) on
+        # screen instead of one stock.quant search per schedule.
+        on_hand_by_key = self._mps_get_on_hand_qty_bulk({
+            (rec.product_id.id, rec.warehouse_id.lot_stock_id.id, rec.company_id.id)
+            for rec in self
+            if rec.warehouse_id.lot_stock_id
+        })
+
         for mps_state in result:
             schedule = schedule_by_id.get(mps_state.get('id'))
             if not schedule:
@@ -126,13 +174,8 @@ class MrpProductionScheduleAllPeriods(models.Model):
             location  = warehouse.lot_stock_id if warehouse else False
 
             if location:
-                quants = self.env['stock.quant'].search([
-                    ('product_id',  '=', product.id),
-                    ('location_id', 'child_of', location.id),
-                    ('company_id',  '=', company.id),
-                ])
-                real_on_hand = sum(
-                    max(0.0, q.quantity - q.reserved_quantity) for q in quants
+                real_on_hand = on_hand_by_key.get(
+                    (product.id, location.id, company.id), 0.0
                 )
             else:
                 real_on_hand = product.with_context(
@@ -218,14 +261,16 @@ class MrpProductionScheduleAllPeriods(models.Model):
         Return the best res.partner vendor for ``product``.
 
         Resolution order:
-          1. product._select_seller() — considers quantity breaks and date.
+          1. product._select_seller() in ``company`` — considers quantity
+             breaks and date, and only sees that company's suppliers.
           2. First entry in product.seller_ids filtered by company.
           3. First entry in product.seller_ids (any company).
 
         Returns a product.supplierinfo record (may be empty recordset if none
         found, in which case the caller should handle gracefully).
         """
-        seller = product._select_seller(
+        # _select_seller filters the sellers on env.company
+        seller = product.with_company(company)._select_seller(
             quantity=quantity,
             date=datetime.now().date(),
             uom_id=uom,
@@ -249,11 +294,17 @@ class MrpProductionScheduleAllPeriods(models.Model):
     # Helper: compute RFQ order date from period date + product lead time
     # =========================================================================
 
-    def _mps_compute_order_date(self, date_needed, product, company, seller=None):
+    def _mps_compute_order_date(
+        self, date_needed, product, company, seller=None, working_dates=None
+    ):
         """
         Return (order_date, realistic_date_planned) so that goods arrive
         by ``date_needed``.
 
+        When ``working_dates`` (a set of dates of the company resource
+        calendar, see _mps_get_working_dates) is given, the lead time is
+        counted in working days; otherwise in calendar days.
+
         If order_date would be in the past, it is clamped to today and
         date_planned is recalculated as today + total_lead so the RFQ
         reflects when the goods will actually arrive.
@@ -263,12 +314,8 @@ class MrpProductionScheduleAllPeriods(models.Model):
         else:
             base = date_needed.date() if isinstance(date_needed, datetime) else date_type.today()
 
-        vendor_lead = float(seller.delay if seller and seller.delay else 0.0)
-        days_to_purchase = float(getattr(product, 'days_to_purchase', 0.0) or 0.0)
-        security_lead = float(getattr(company, 'po_lead', 0.0) or 0.0)
-
-        total_lead = vendor_lead + days_to_purchase + security_lead
-        order_date = base - timedelta(days=total_lead)
+        total_lead = self._mps_get_total_lead_days(product, company, seller)
+        order_date = self._mps_shift_days(base, -total_lead, working_dates)
 
         today = date_type.today()
         was_clamped = order_date < today
@@ -277,19 +324,156 @@ class MrpProductionScheduleAllPeriods(models.Model):
 
         # If clamped, realistic arrival = today + total_lead, not the original date_needed
         realistic_date_planned = (
-            today + timedelta(days=total_lead) if was_clamped else base
+            self._mps_shift_days(today, total_lead, working_dates)
+            if was_clamped else base
         )
 
-        _logger.info(
-            "[MPS RFQ] Lead time for %s: vendor=%.0fd  days_to_purchase=%.0fd  "
-            "security=%.0fd  total=%.0fd  date_needed=%s → order_date=%s  "
-            "date_planned=%s%s",
-            product.display_name, vendor_lead, days_to_purchase, security_lead,
-            total_lead, base, order_date, realistic_date_planned,
+        _logger.debug(
+            "[MPS RFQ] Lead time for %s: total=%.0fd (%s)  date_needed=%s → "
+            "order_date=%s  date_planned=%s%s",
+            product.display_name, total_lead,
+            'working days' if working_dates else 'calendar days',
+            base, order_date, realistic_date_planned,
             "  [LATE — clamped]" if was_clamped else "",
         )
         return order_date, realistic_date_planned
 
+    def _mps_get_total_lead_days(self, product, company, seller=None):
+        """vendor delay + product.days_to_purchase + company.po_lead."""
+        vendor_lead = float(seller.delay if seller and seller.delay else 0.0)
+        days_to_purchase = float(getattr(product, 'days_to_purchase', 0.0) or 0.0)
+        security_lead = float(getattr(company, 'po_lead', 0.0) or 0.0)
+        return vendor_lead + days_to_purchase + security_lead
+
+    @staticmethod
+    def _mps_shift_days(base, days, working_dates=None):
+        """
+        Move ``base`` by ``days``: calendar days when ``working_dates`` is
+        empty/None, otherwise ceil(|days|) working days (dates in working_dates).
+        """
+        if not working_dates:
+            return base + timedelta(days=days)
+        remaining = math.ceil(abs(days))
+        step      = timedelta(days=1 if days > 0 else -1)
+        result    = base
+        # Guard against an empty/short calendar: never walk more than a year
+        # beyond the requested number of days.
+        for _i in range(remaining + 366):
+            if remaining <= 0:
+                break
+            result += step
+            if result in working_dates:
+                remaining -= 1
+        return result
+
+    def _mps_get_working_dates(self, resource_calendar, date_from, date_to):
+        """
+        Return the set of dates in [date_from, date_to] on which
+        ``resource_calendar`` has working intervals (one call per range).
+        """
+        tz = pytz.timezone(resource_calendar.tz or 'UTC')
+        start_dt = tz.localize(datetime.combine(date_from, datetime.min.time()))
+        end_dt   = tz.localize(datetime.combine(date_to,   datetime.max.time()))
+        intervals = resource_calendar._work_intervals_batch(start_dt, end_dt)[False]
+        return {start.date() for start, _stop, _meta in intervals}
+
+    # =========================================================================
+    # Helper: per-run lead-time table (seller + lead days + order dates)
+    # =========================================================================
+
+    def _mps_get_seller_bracket(self, product, company, quantity, uom=None):
+        """
+        Return the ids of the sellers of ``product`` whose min_qty is met by
+        ``quantity``.  Two quantities with the same bracket resolve to the
+        same seller, so the bracket is a safe cache key for _select_seller.
+        """
+        bracket = []
+        for seller in product.seller_ids:
+            if seller.company_id and seller.company_id != company:
+                continue
+            qty = quantity
+            if uom and seller.product_uom and uom != seller.product_uom:
+                qty = uom._compute_quantity(quantity, seller.product_uom)
+            if qty >= (seller.min_qty or 0.0):
+                bracket.append(seller.id)
+        return tuple(bracket)
+
+    def _mps_build_lead_time_table(self, rfq_lines):
+        """
+        Resolve seller, total lead days and order dates for every spec in one
+        pass before RFQ grouping.
+
+        Returns ``(table, spec_keys)``:
+            table      { (product_id, company_id, uom_id, bracket): {
+                             'seller':    product.supplierinfo,
+                             'lead_days': float,
+                             'dates':     { date_needed: (order_date, date_planned) },
+                         } }
+            spec_keys  list of table keys, aligned with ``rfq_lines``
+
+        Order dates honour the company's resource calendar (working days);
+        companies without a calendar fall back to calendar days.
+        """
+        table     = {}
+        spec_keys = []
+        for spec in rfq_lines:
+            product = spec['product']
+            company = spec['company']
+            uom     = spec.get('uom')
+            key = (
+                product.id, company.id, uom.id if uom else False,
+                self._mps_get_seller_bracket(product, company, spec['qty'], uom),
+            )
+            if key not in table:
+                seller = self._mps_get_vendor(
+                    product, company, quantity=spec['qty'], uom=uom,
+                )
+                table[key] = {
+                    'product':   product,
+                    'company':   company,
+                    'seller':    seller,
+                    'lead_days': self._mps_get_total_lead_days(product, company, seller),
+                    'dates':     {},
+                }
+            table[key]['dates'][spec['date_needed']] = None
+            spec_keys.append(key)
+
+        if not table:
+            return table, spec_keys
+
+        # ── Working dates: one calendar read per company for the whole run ───
+        today     = date_type.today()
+        max_lead  = max(e['lead_days'] for e in table.values())
+        all_dates = [d for e in table.values() for d in e['dates']]
+        # Generous padding so weekends/holidays never run the walk off the set.
+        pad       = timedelta(days=math.ceil(max_lead) * 2 + 31)
+        date_from = min(all_dates + [today]) - pad
+        date_to   = max(all_dates + [today]) + pad
+
+        working_dates_by_company = {}
+        for entry in table.values():
+            company = entry['company']
+            if company.id not in working_dates_by_company:
+                resource_calendar = company.resource_calendar_id
+                working_dates_by_company[company.id] = (
+                    self._mps_get_working_dates(resource_calendar, date_from, date_to)
+                    if resource_calendar else None
+                )
+
+        for entry in table.values():
+            working_dates = working_dates_by_company[entry['company'].id]
+            for date_needed in entry['dates']:
+                entry['dates'][date_needed] = self._mps_compute_order_date(
+                    date_needed, entry['product'], entry['company'],
+                    seller=entry['seller'], working_dates=working_dates,
+                )
+
+        _logger.info(
+            "[MPS RFQ] Lead-time table: %d spec(s) → %d seller resolution(s).",
+            len(rfq_lines), len(table),
+        )
+        return table, spec_keys
+
     # =========================================================================
     # Helper: build a human-readable origin string
     # =========================================================================
@@ -312,12 +496,8 @@ class MrpProductionScheduleAllPeriods(models.Model):
         """Return unreserved on-hand quantity at warehouse.lot_stock_id."""
         location = warehouse.lot_stock_id if warehouse else False
         if location:
-            quants  = self.env['stock.quant'].search([
-                ('product_id',  '=',  product.id),
-                ('location_id', 'child_of', location.id),
-                ('company_id',  '=',  company.id),
-            ])
-            on_hand = sum(max(0.0, q.quantity - q.reserved_quantity) for q in quants)
+            key     = (product.id, location.id, company.id)
+            on_hand = self._mps_get_on_hand_qty_bulk({key}).get(key, 0.0)
         else:
             on_hand = product.with_context(force_company=company.id).qty_available
 
@@ -329,6 +509,49 @@ class MrpProductionScheduleAllPeriods(models.Model):
         )
         return on_hand
 
+    def _mps_get_on_hand_qty_bulk(self, keys):
+        """
+        Return { (product_id, location_id, company_id): on_hand } for every
+        key, where on_hand is the unreserved quantity of the product in the
+        location and its children (same semantics as a stock.quant
+        ``child_of`` search summing max(0, quantity - reserved_quantity)).
+
+        All keys are resolved with a single query grouped over
+        stock_location.parent_path.  Keys without quants are omitted.
+        """
+        if not keys:
+            return {}
+
+        self.env['stock.quant'].flush_model([
+            'product_id', 'location_id', 'company_id',
+            'quantity', 'reserved_quantity',
+        ])
+        self.env['stock.location'].flush_model(['parent_path'])
+
+        product_ids  = tuple({k[0] for k in keys})
+        location_ids = tuple({k[1] for k in keys})
+        company_ids  = tuple({k[2] for k in keys})
+
+        self.env.cr.execute("""
+            SELECT quant.product_id,
+                   root.id,
+                   quant.company_id,
+                   SUM(GREATEST(quant.quantity - quant.reserved_quantity, 0.0))
+              FROM stock_quant quant
+              JOIN stock_location loc  ON loc.id = quant.location_id
+              JOIN stock_location root ON loc.parent_path LIKE root.parent_path || '%%'
+             WHERE root.id           IN %s
+               AND quant.product_id  IN %s
+               AND quant.company_id  IN %s
+          GROUP BY quant.product_id, root.id, quant.company_id
+        """, (location_ids, product_ids, company_ids))
+
+        return {
+            (product_id, location_id, company_id): qty or 0.0
+            for product_id, location_id, company_id, qty in self.env.cr.fetchall()
+            if (product_id, location_id, company_id) in keys
+        }
+
     # =========================================================================
     # Helper: confirmed PO incoming quantities by (year, month)
     # =========================================================================
@@ -410,6 +633,88 @@ class MrpProductionScheduleAllPeriods(models.Model):
             )
         return by_month
 
+    # =========================================================================
+    # Helper: planning-input fingerprints (incremental replenishment)
+    # =========================================================================
+
+    def _mps_compute_input_fingerprints(self, schedule_state):
+        """
+        Return { 'YYYY-MM-DD': sha1 } for every period of ``schedule_state``.
+
+        Each digest covers the inputs that drive the replenishment of that
+        period: forecast qty and safety target of the period, unreserved
+        on-hand, confirmed PO and open MO supply of the period's month, the
+        BOM version (BOM + line write_date) and the MOQ / safety stock of the
+        product template.  Derived MPS values (replenish_qty, incoming_qty)
+        are deliberately left out: they move as soon as our own RFQs exist.
+        """
+        self.ensure_one()
+        product   = self.product_id
+        company   = self.company_id
+        warehouse = self.warehouse_id
+        tmpl      = product.product_tmpl_id
+
+        bom = self.env['mrp.bom']._bom_find(
+            product, company_id=company.id,
+        )[product]
+        bom_version = (
+            bom.id,
+            str(bom.write_date),
+            tuple(
+                (l.product_id.id, round(l.product_qty, 4), str(l.write_date))
+                for l in bom.bom_line_ids
+            ),
+        ) if bom else None
+
+        on_hand      = self._mps_get_on_hand_qty(product, company, warehouse)
+        po_by_month  = self._mps_get_open_po_qty_by_month(product, company, warehouse)
+        mo_by_month  = self._mps_get_open_mo_qty_by_month(product, company, warehouse)
+
+        schedule_inputs = (
+            round(on_hand, 4),
+            bom_version,
+            self.route_id.id,
+            self.replenish_trigger,
+            round(tmpl._get_minimum_order_qty(), 4),
+            round(tmpl._get_safety_stock(), 4),
+        )
+
+        fingerprints = {}
+        for forecast_dict in schedule_state.get('forecast_ids', []):
+            date_start = forecast_dict.get('date_start')
+            if isinstance(date_start, str):
+                date_start = date_type.fromisoformat(date_start)
+            if not date_start:
+                continue
+            period_key = (date_start.year, date_start.month)
+            period_inputs = (
+                round(forecast_dict.get('forecast_qty', 0.0) or 0.0, 4),
+                round(forecast_dict.get('forecast_target_qty', 0.0) or 0.0, 4),
+                round(po_by_month.get(period_key, 0.0), 4),
+                round(mo_by_month.get(period_key, 0.0), 4),
+            )
+            fingerprints[date_start.isoformat()] = hashlib.sha1(
+                repr((schedule_inputs, period_inputs)).encode()
+            ).hexdigest()
+        return fingerprints
+
+    def _mps_store_input_fingerprints(self, fingerprints_by_id):
+        """Persist the fingerprints of a completed run (one write per schedule)."""
+        for schedule in self:
+            fingerprints = fingerprints_by_id.get(schedule.id)
+            if fingerprints is not None and fingerprints != schedule.mps_input_fingerprints:
+                schedule.mps_input_fingerprints = fingerprints
+
+    def action_replenish_incremental(self, based_on_lead_time=False):
+        """
+        Replenish only the schedules whose planning inputs changed since the
+        last run (see _mps_compute_input_fingerprints).  Intended for nightly
+        full-warehouse runs.
+        """
+        return self.with_context(mps_incremental=True).action_replenish(
+            based_on_lead_time=based_on_lead_time,
+        )
+
     # =========================================================================
     # Helper: detect manufacture route
     # =========================================================================
@@ -595,19 +900,17 @@ class MrpProductionScheduleAllPeriods(models.Model):
         # so that the same product arriving on the same date is merged into a
         # single RFQ line (quantities summed) rather than creating duplicates.
         groups = {}
+        lead_table, spec_keys = self._mps_build_lead_time_table(filtered_lines)
 
-        for spec in filtered_lines:
+        for spec, lead_key in zip(filtered_lines, spec_keys):
             product   = spec['product']
             company   = spec['company']
             warehouse = spec['warehouse']
             year      = spec['year']
             month     = spec['month']
 
-            seller = self._mps_get_vendor(
-                product, company,
-                quantity=spec['qty'],
-                uom=spec.get('uom'),
-            )
+            lead_entry = lead_table[lead_key]
+            seller     = lead_entry['seller']
             # product.supplierinfo.partner_id is the res.partner (vendor).
             partner = seller.partner_id if seller else False
 
@@ -618,9 +921,7 @@ class MrpProductionScheduleAllPeriods(models.Model):
                 )
                 continue
 
-            order_date, date_planned = self._mps_compute_order_date(
-                spec['date_needed'], product, company, seller=seller,
-            )
+            order_date, date_planned = lead_entry['dates'][spec['date_needed']]
 
             group_key = (
                 partner.id,
@@ -1059,14 +1360,60 @@ class MrpProductionScheduleAllPeriods(models.Model):
             self.ids, based_on_lead_time,
         )
 
-        production_schedules = self
-        if not production_schedules:
+        if not self:
             _logger.info("[MPS All-Periods] No schedules selected. Returning.")
             return False
 
+        plan = self._mps_plan_replenishment()
+        if not plan:
+            return False
+        return self._mps_apply_replenishment_plan(plan)
+
+    # =========================================================================
+    # Planning phase (read-only): schedules → RFQ line specs
+    # =========================================================================
+
+    def _mps_plan_replenishment(self):
+        """
+        Compute the replenishment plan for ``self`` without writing anything.
+
+        Returns a dict consumed by _mps_apply_replenishment_plan():
+            schedules                     schedules actually planned
+            rfq_line_specs                list of specs for _mps_create_rfqs()
+            forecasts_to_set_as_launched  mrp.product.forecast recordset
+            forecasts_values              vals_list of forecasts to create
+            fingerprints                  { schedule_id: input fingerprints }
+
+        Returns an empty dict when an incremental run finds nothing changed.
+        """
+        production_schedules = self
+
         production_schedule_states = production_schedules.get_production_schedule_view_state()
         state_by_id = {mps['id']: mps for mps in production_schedule_states}
 
+        # ── Incremental replanning: skip schedules with unchanged inputs ─────
+        fingerprints_by_id = {
+            schedule.id: schedule._mps_compute_input_fingerprints(
+                state_by_id.get(schedule.id, {})
+            )
+            for schedule in production_schedules
+        }
+        if self.env.context.get('mps_incremental'):
+            unchanged = production_schedules.filtered(
+                lambda s: s.mps_input_fingerprints
+                and s.mps_input_fingerprints == fingerprints_by_id[s.id]
+            )
+            if unchanged:
+                _logger.info(
+                    "[MPS All-Periods] Incremental run: %d of %d schedule(s) "
+                    "unchanged since last run — skipped: %s",
+                    len(unchanged), len(production_schedules), unchanged.ids,
+                )
+            production_schedules -= unchanged
+            if not production_schedules:
+                _logger.info("[MPS All-Periods] Nothing changed. Returning.")
+                return {}
+
         # Accumulator for buy-route finished goods (PATH D) and phantom BOMs
         # (PATH C).  Manufacture-route products (PATH A) and trigger='never'
         # with a BOM (PATH B) are handled inline and emit rfq_line_specs directly.
@@ -1670,12 +2017,33 @@ class MrpProductionScheduleAllPeriods(models.Model):
                     'production_schedule_id': sched.id,
                 })
 
+        return {
+            'schedules':                    production_schedules,
+            'rfq_line_specs':               all_rfq_line_specs,
+            'forecasts_to_set_as_launched': forecasts_to_set_as_launched,
+            'forecasts_values':             forecasts_values,
+            'fingerprints':                 fingerprints_by_id,
+        }
+
+    # =========================================================================
+    # Write phase (single writer): plan → RFQs + forecast flags
+    # =========================================================================
+
+    def _mps_apply_replenishment_plan(self, plan):
+        """Create the RFQs of ``plan`` and flag its forecasts as launched."""
+        production_schedules         = plan['schedules']
+        all_rfq_line_specs           = plan['rfq_line_specs']
+        forecasts_to_set_as_launched = plan['forecasts_to_set_as_launched']
+        forecasts_values             = plan['forecasts_values']
+        fingerprints_by_id           = plan['fingerprints']
+
         # ── Nothing to do? ────────────────────────────────────────────────────
         if not all_rfq_line_specs:
             _logger.info("[MPS All-Periods] No outstanding lines to order.")
             forecasts_to_set_as_launched.write({'procurement_launched': True})
             if forecasts_values:
                 self.env['mrp.product.forecast'].create(forecasts_values)
+            production_schedules._mps_store_input_fingerprints(fingerprints_by_id)
             return False
 
         # ── Create RFQs ───────────────────────────────────────────────────────
@@ -1690,3 +2058,126 @@ class MrpProductionScheduleAllPeriods(models.Model):
         forecasts_to_set_as_launched.write({'procurement_launched': True})
         if forecasts_values:
             self.env['mrp.product.forecast'].create(forecasts_values)
+        production_schedules._mps_store_input_fingerprints(fingerprints_by_id)
+
+    # =========================================================================
+    # Parallel planning: one worker per (company, warehouse) partition
+    # =========================================================================
+
+    def action_replenish_parallel(self, based_on_lead_time=False):
+        """
+        Same result as action_replenish(), but the planning phase runs once
+        per (company, warehouse) partition in a pool of workers, each on its
+        own database cursor.  Partitions are independent: coverage balances
+        and accumulator keys are already scoped per warehouse.
+
+        Workers only read; their plans are serialised to plain ids, merged,
+        and written by this (single) caller through
+        _mps_apply_replenishment_plan(), so duplicate detection and RFQ
+        grouping see every spec at once.
+
+        Workers open fresh cursors and therefore only see committed data —
+        this is meant for scheduled full-warehouse runs, not for schedules
+        edited in the current transaction.
+        """
+        partitions = defaultdict(list)
+        for schedule in self:
+            partitions[(schedule.company_id.id, schedule.warehouse_id.id)].append(
+                schedule.id
+            )
+        if len(partitions) <= 1:
+            return self.action_replenish(based_on_lead_time=based_on_lead_time)
+
+        max_workers = min(len(partitions), self._mps_get_max_planning_workers())
+        _logger.info(
+            "[MPS Parallel] Planning %d schedule(s) in %d partition(s) "
+            "with %d worker(s).",
+            len(self), len(partitions), max_workers,
+        )
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            payloads = list(executor.map(
+                self._mps_plan_partition_in_worker, partitions.values(),
+            ))
+
+        plan = self._mps_merge_plan_payloads(payloads)
+        if not plan['schedules']:
+            return False
+        return self._mps_apply_replenishment_plan(plan)
+
+    def _mps_get_max_planning_workers(self):
+        """Worker count: ir.config_parameter override, else MPS_DEFAULT_MAX_WORKERS.
+
+        Capped at half of ``db_maxconn`` so a single run never exhausts the
+        connection pool shared with the rest of the server.
+        """
+        param = self.env['ir.config_parameter'].sudo().get_param(
+            'mps_replenish_all_periods.max_workers'
+        )
+        try:
+            workers = max(1, int(param)) if param else MPS_DEFAULT_MAX_WORKERS
+        except ValueError:
+            workers = MPS_DEFAULT_MAX_WORKERS
+        return max(1, min(workers, int(config['db_maxconn']) // 2))
+
+    def _mps_plan_partition_in_worker(self, schedule_ids):
+        """Plan one partition on a dedicated cursor; return a plain payload."""
+        with self.pool.cursor() as cr:
+            env = api.Environment(cr, self.env.uid, self.env.context)
+            schedules = env['mrp.production.schedule'].browse(schedule_ids)
+            plan      = schedules._mps_plan_replenishment()
+            payload   = schedules._mps_serialize_plan(plan) if plan else {}
+            # Planning is read-only; never let the worker cursor commit.
+            cr.rollback()
+        return payload
+
+    def _mps_serialize_plan(self, plan):
+        """Convert a plan's records to ids so it can leave its cursor."""
+        return {
+            'schedule_ids': plan['schedules'].ids,
+            'rfq_line_specs': [
+                dict(
+                    spec,
+                    product=spec['product'].id,
+                    uom=spec['uom'].id if spec.get('uom') else False,
+                    company=spec['company'].id,
+                    warehouse=spec['warehouse'].id if spec['warehouse'] else False,
+                )
+                for spec in plan['rfq_line_specs']
+            ],
+            'forecast_ids':     plan['forecasts_to_set_as_launched'].ids,
+            'forecasts_values': plan['forecasts_values'],
+            'fingerprints':     plan['fingerprints'],
+        }
+
+    def _mps_merge_plan_payloads(self, payloads):
+        """Merge worker payloads back into one plan bound to ``self.env``."""
+        Product   = self.env['product.product']
+        Uom       = self.env['uom.uom']
+        Company   = self.env['res.company']
+        Warehouse = self.env['stock.warehouse']
+
+        plan = {
+            'schedules':                    self.browse(),
+            'rfq_line_specs':               [],
+            'forecasts_to_set_as_launched': self.env['mrp.product.forecast'],
+            'forecasts_values':             [],
+            'fingerprints':                 {},
+        }
+        for payload in payloads:
+            if not payload:
+                continue
+            plan['schedules'] |= self.browse(payload['schedule_ids'])
+            plan['forecasts_to_set_as_launched'] |= self.env[
+                'mrp.product.forecast'
+            ].browse(payload['forecast_ids'])
+            plan['forecasts_values'].extend(payload['forecasts_values'])
+            plan['fingerprints'].update(payload['fingerprints'])
+            for spec in payload['rfq_line_specs']:
+                plan['rfq_line_specs'].append(dict(
+                    spec,
+                    product=Product.browse(spec['product']),
+                    uom=Uom.browse(spec['uom']),
+                    company=Company.browse(spec['company']),
+                    warehouse=Warehouse.browse(spec['warehouse']),
+                ))
+        return plan
@@ -1,2 +1,3 @@
 # -*- coding: utf-8 -*-
 from . import test_mps_replenish_all_periods
+from . import test_mps_replenish_benchmark
@@ -14,6 +14,7 @@ from unittest.mock import patch, MagicMock
 from datetime import date, datetime, timedelta
 
 from odoo.tests import TransactionCase, tagged
+from odoo.tools import config
 
 
 @tagged('post_install', '-at_install', 'mps_all_periods')
@@ -383,6 +384,105 @@ class TestMpsReplenishAllPeriods(TransactionCase):
         self.assertEqual(values['company_id'].id, schedule.company_id.id)
 
 
+    # =========================================================================
+    # Test 7: bulk on-hand matches the per-schedule child_of search
+    # =========================================================================
+
+    def test_on_hand_bulk_matches_child_of_search(self):
+        """
+        _mps_get_on_hand_qty_bulk must return the same unreserved quantity as
+        a stock.quant child_of search, including quants in child locations.
+        """
+        stock = self.warehouse.lot_stock_id
+        child = self.env['stock.location'].create({
+            'name': 'MPS Bulk Child',
+            'location_id': stock.id,
+        })
+        Quant = self.env['stock.quant']
+        Quant._update_available_quantity(self.product_buy, stock, 7.0)
+        Quant._update_available_quantity(self.product_buy, child, 5.0)
+
+        key = (self.product_buy.id, stock.id, self.company.id)
+        bulk = self.env['mrp.production.schedule']._mps_get_on_hand_qty_bulk({key})
+
+        quants = Quant.search([
+            ('product_id',  '=', self.product_buy.id),
+            ('location_id', 'child_of', stock.id),
+            ('company_id',  '=', self.company.id),
+        ])
+        expected = sum(max(0.0, q.quantity - q.reserved_quantity) for q in quants)
+        self.assertAlmostEqual(bulk[key], expected)
+        self.assertAlmostEqual(bulk[key], 12.0)
+
+
+    # =========================================================================
+    # Test 8: lead-time table
+    # =========================================================================
+
+    def test_shift_days_skips_non_working_days(self):
+        """Two working days before a Monday is the previous Thursday."""
+        Schedule = self.env['mrp.production.schedule']
+        monday   = date(2030, 1, 7)
+        weekdays = {
+            monday - timedelta(days=i) for i in range(14)
+            if (monday - timedelta(days=i)).weekday() < 5
+        }
+        self.assertEqual(
+            Schedule._mps_shift_days(monday, -2, weekdays), date(2030, 1, 3)
+        )
+        self.assertEqual(
+            Schedule._mps_shift_days(monday, -2), date(2030, 1, 5)
+        )
+
+    def test_lead_time_table_resolves_seller_once_per_bracket(self):
+        """Specs sharing product/company/bracket share one table entry."""
+        vendor = self.env['res.partner'].create({'name': 'Lead Table Vendor'})
+        self.env['product.supplierinfo'].create({
+            'partner_id':      vendor.id,
+            'product_tmpl_id': self.product_buy.product_tmpl_id.id,
+            'delay':           4,
+        })
+        specs = [{
+            'product':     self.product_buy,
+            'qty':         qty,
+            'uom':         self.product_buy.uom_id,
+            'company':     self.company,
+            'warehouse':   self.warehouse,
+            'date_needed': date(2030, month, 1),
+            'year':        2030,
+            'month':       month,
+        } for qty, month in ((10.0, 3), (20.0, 4))]
+
+        Schedule = self.env['mrp.production.schedule']
+        with patch.object(
+            type(Schedule), '_mps_get_vendor', autospec=True,
+            side_effect=lambda self_, product, *a, **kw: product.seller_ids[:1],
+        ) as mock_vendor:
+            table, keys = Schedule._mps_build_lead_time_table(specs)
+
+        self.assertEqual(mock_vendor.call_count, 1)
+        self.assertEqual(keys[0], keys[1])
+        entry = table[keys[0]]
+        self.assertEqual(entry['seller'].partner_id, vendor)
+        self.assertEqual(set(entry['dates']), {date(2030, 3, 1), date(2030, 4, 1)})
+
+    # =========================================================================
+    # Test 9: parallel planning workers
+    # =========================================================================
+
+    def test_max_planning_workers_default_and_cap(self):
+        """Small fixed default, parameter override, capped by db_maxconn."""
+        Schedule = self.env['mrp.production.schedule']
+        ICP = self.env['ir.config_parameter'].sudo()
+        ICP.set_param('mps_replenish_all_periods.max_workers', False)
+        with patch.dict(config.options, {'db_maxconn': 64}):
+            self.assertEqual(Schedule._mps_get_max_planning_workers(), 2)
+            ICP.set_param('mps_replenish_all_periods.max_workers', '8')
+            self.assertEqual(Schedule._mps_get_max_planning_workers(), 8)
+            ICP.set_param('mps_replenish_all_periods.max_workers', '500')
+            self.assertEqual(Schedule._mps_get_max_planning_workers(), 32)
+
+
 # =============================================================================
 # Test suite for Minimum Order Qty and Safety Stock (v2 features)
 # =============================================================================
@@ -575,4 +675,97 @@ class TestProcurementQtyRules(TransactionCase):
         self.assertEqual(
             schedule._mps_adjust_procurement_qty(self.product, 999.0, 0.0),
             999.0,
-        )
\ No newline at end of file
+        )
+
+# =============================================================================
+# Test suite for incremental replenishment (input fingerprints)
+# =============================================================================
+
+@tagged('post_install', '-at_install', 'mps_all_periods', 'mps_incremental')
+class TestMpsIncrementalReplenish(TransactionCase):
+    """
+    Tests for _mps_compute_input_fingerprints and the incremental skip in
+    action_replenish (context mps_incremental=True).
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company   = cls.env.company
+        cls.warehouse = cls.env.ref('stock.warehouse0')
+        cls.product = cls.env['product.product'].create({
+            'name': 'Test Incremental MPS Product',
+            'type': 'consu',
+        })
+        cls.schedule = cls.env['mrp.production.schedule'].create({
+            'product_id': cls.product.id,
+            'warehouse_id': cls.warehouse.id,
+            'company_id': cls.company.id,
+        })
+
+    def _state(self, forecast_qty):
+        return {'forecast_ids': [{
+            'date_start': date(2030, 1, 1),
+            'forecast_qty': forecast_qty,
+            'forecast_target_qty': 0.0,
+        }]}
+
+    def test_fingerprint_stable_for_same_inputs(self):
+        """Two computations over identical inputs yield identical digests."""
+        self.assertEqual(
+            self.schedule._mps_compute_input_fingerprints(self._state(10.0)),
+            self.schedule._mps_compute_input_fingerprints(self._state(10.0)),
+        )
+
+    def test_fingerprint_changes_with_forecast_and_moq(self):
+        """Forecast qty and MOQ changes both invalidate the period digest."""
+        base = self.schedule._mps_compute_input_fingerprints(self._state(10.0))
+        self.assertNotEqual(
+            base, self.schedule._mps_compute_input_fingerprints(self._state(20.0))
+        )
+        self.product.product_tmpl_id.minimum_order_qty = 50.0
+        self.assertNotEqual(
+            base, self.schedule._mps_compute_input_fingerprints(self._state(10.0))
+        )
+
+    def test_incremental_run_skips_unchanged_schedule(self):
+        """An unchanged schedule is not replanned by an incremental run."""
+        state = self._state(10.0)
+        with patch.object(
+            type(self.schedule), 'get_production_schedule_view_state',
+            return_value=[dict(state, id=self.schedule.id)],
+        ):
+            self.schedule.action_replenish()
+            self.assertTrue(self.schedule.mps_input_fingerprints)
+            with patch.object(
+                type(self.schedule), '_mps_create_rfqs',
+            ) as mock_create:
+                result = self.schedule.action_replenish_incremental()
+        self.assertFalse(result)
+        mock_create.assert_not_called()
+
+    def test_plan_serialisation_round_trip(self):
+        """A serialised worker plan merges back into an equivalent plan."""
+        spec = {
+            'product':     self.product,
+            'qty':         12.0,
+            'uom':         self.product.uom_id,
+            'company':     self.company,
+            'warehouse':   self.warehouse,
+            'date_needed': date(2030, 1, 1),
+            'year':        2030,
+            'month':       1,
+        }
+        plan = {
+            'schedules':                    self.schedule,
+            'rfq_line_specs':               [spec],
+            'forecasts_to_set_as_launched': self.env['mrp.product.forecast'],
+            'forecasts_values':             [],
+            'fingerprints':                 {self.schedule.id: {'2030-01-01': 'x'}},
+        }
+        payload = self.schedule._mps_serialize_plan(plan)
+        merged  = self.schedule._mps_merge_plan_payloads([payload, {}])
+
+        self.assertEqual(merged['schedules'], self.schedule)
+        self.assertEqual(merged['rfq_line_specs'], [spec])
+        self.assertEqual(merged['fingerprints'], plan['fingerprints'])
@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+# =============================================================================
+# tests/test_mps_replenish_benchmark.py
+#
+# Performance benchmark harness for action_replenish().
+# Excluded from the standard test run; execute explicitly with:
+#
+#   python odoo-bin -d <db> -i mps_replenish_all_periods --test-enable \
+#       --test-tags /mps_replenish_all_periods:mps_benchmark
+#
+# For every scale (number of MPS schedules) the harness builds synthetic data:
+#
+#   • N finished goods with a Manufacture route
+#   • an M-level BOM tree per finished good (SFG levels, then buy leaves
+#     drawn from a shared component pool)
+#   • K vendors, attached to the leaves via seller_ids with varying delays
+#     and minimum quantities, plus a minimum_order_qty on each leaf
+#   • 12–24 monthly periods with a positive replenish_qty
+#
+# and measures action_replenish() wall time, SQL query count and the number
+# of RFQs created.  The test fails when queries per schedule exceed the
+# threshold, which catches per-schedule query regressions.
+#
+# Environment overrides:
+#   MPS_BENCH_SCALES                    comma-separated, default 10,50,200,500,1000,2000
+#   MPS_BENCH_PERIODS                   default 12 (clamped to 12..24)
+#   MPS_BENCH_BOM_LEVELS                default 2
+#   MPS_BENCH_VENDORS                   default 10
+#   MPS_BENCH_MAX_QUERIES_PER_SCHEDULE  default 80
+# =============================================================================
+
+import logging
+import os
+import random
+import time
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from odoo.tests import TransactionCase, tagged
+
+_logger = logging.getLogger(__name__)
+
+
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+@tagged('post_install', '-at_install', '-standard', 'mps_benchmark')
+class TestMpsReplenishBenchmark(TransactionCase):
+    """
+    Benchmark action_replenish() from 10 to 2,000 schedules.
+
+    The MPS engine itself is not part of the measurement: the period states
+    normally returned by get_production_schedule_view_state() are generated
+    synthetically so every scale plans the same shape of demand.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company   = cls.env.company
+        cls.warehouse = cls.env.ref('stock.warehouse0')
+        cls.rng       = random.Random(42)
+
+        cls.scales = [
+            int(s) for s in os.environ.get(
+                'MPS_BENCH_SCALES', '10,50,200,500,1000,2000'
+            ).split(',') if s.strip()
+        ]
+        cls.num_periods = min(24, max(12, _env_int('MPS_BENCH_PERIODS', 12)))
+        cls.bom_levels  = max(1, _env_int('MPS_BENCH_BOM_LEVELS', 2))
+        cls.num_vendors = max(1, _env_int('MPS_BENCH_VENDORS', 10))
+        cls.max_queries_per_schedule = _env_int(
+            'MPS_BENCH_MAX_QUERIES_PER_SCHEDULE', 80
+        )
+
+        cls.manufacture_route = cls.env.ref(
+            'mrp.route_warehouse0_manufacture', raise_if_not_found=False
+        )
+        cls.vendors = cls.env['res.partner'].create([
+            {'name': 'MPS Bench Vendor %d' % i}
+            for i in range(cls.num_vendors)
+        ])
+
+    # =========================================================================
+    # Synthetic data
+    # =========================================================================
+
+    def _create_leaf_pool(self, size, tag):
+        """Buy-route components with seller_ids delays and MOQs."""
+        Product = self.env['product.product']
+        leaves = Product.create([{
+            'name': 'MPS Bench %s Leaf %d' % (tag, i),
+            'type': 'consu',
+        } for i in range(size)])
+
+        seller_vals = []
+        for leaf in leaves:
+            vendor = self.vendors[self.rng.randrange(len(self.vendors))]
+            seller_vals.append({
+                'partner_id':      vendor.id,
+                'product_tmpl_id': leaf.product_tmpl_id.id,
+                'delay':           self.rng.randint(1, 30),
+                'min_qty':         self.rng.choice([0.0, 10.0, 50.0]),
+                'price':           self.rng.uniform(1.0, 100.0),
+            })
+            leaf.product_tmpl_id.minimum_order_qty = self.rng.choice([0.0, 25.0, 100.0])
+        self.env['product.supplierinfo'].create(seller_vals)
+        return leaves
+
+    def _create_manufactured(self, name):
+        vals = {'name': name, 'type': 'consu'}
+        if self.manufacture_route:
+            vals['route_ids'] = [(4, self.manufacture_route.id)]
+        return self.env['product.product'].create(vals)
+
+    def _create_bom_tree(self, product, level, leaves):
+        """Give ``product`` a normal BOM ``level`` levels deep."""
+        lines = [
+            (0, 0, {'product_id': leaf.id, 'product_qty': self.rng.randint(1, 4)})
+            for leaf in self.rng.sample(list(leaves), min(3, len(leaves)))
+        ]
+        if level > 1:
+            sfg = self._create_manufactured('%s / SFG L%d' % (product.name, level))
+            self._create_bom_tree(sfg, level - 1, leaves)
+            lines.append((0, 0, {'product_id': sfg.id, 'product_qty': 1}))
+        self.env['mrp.bom'].create({
+            'product_tmpl_id': product.product_tmpl_id.id,
+            'product_qty':     1,
+            'type':            'normal',
+            'bom_line_ids':    lines,
+        })
+
+    def _create_schedules(self, count):
+        tag    = 'S%d' % count
+        leaves = self._create_leaf_pool(max(20, count // 5), tag)
+        schedules = self.env['mrp.production.schedule']
+        for i in range(count):
+            fg = self._create_manufactured('MPS Bench %s FG %d' % (tag, i))
+            self._create_bom_tree(fg, self.bom_levels, leaves)
+            schedules |= self.env['mrp.production.schedule'].create({
+                'product_id':   fg.id,
+                'warehouse_id': self.warehouse.id,
+                'company_id':   self.company.id,
+            })
+        return schedules
+
+    def _synthetic_states(self, schedules):
+        """Period states as returned by get_production_schedule_view_state."""
+        first = (date.today().replace(day=1) + timedelta(days=32)).replace(day=1)
+        periods = []
+        ds = first
+        for _i in range(self.num_periods):
+            nxt = (ds + timedelta(days=32)).replace(day=1)
+            periods.append((ds, nxt - timedelta(days=1)))
+            ds = nxt
+
+        states = []
+        for schedule in schedules:
+            forecast_ids = []
+            for ds, de in periods:
+                qty = float(self.rng.randint(5, 200))
+                forecast_ids.append({
+                    'date_start':          ds,
+                    'date_stop':           de,
+                    'forecast_qty':        qty,
+                    'forecast_target_qty': 0.0,
+                    'replenish_qty':       qty,
+                    'incoming_qty':        0.0,
+                    'forecasted_qty_0':    0.0,
+                })
+            states.append({'id': schedule.id, 'forecast_ids': forecast_ids})
+        return states
+
+    # =========================================================================
+    # Measurement
+    # =========================================================================
+
+    def _measure(self, schedules):
+        PurchaseOrder = self.env['purchase.order']
+        states        = self._synthetic_states(schedules)
+        rfqs_before   = PurchaseOrder.search_count([('state', '=', 'draft')])
+
+        self.env.flush_all()
+        self.env.invalidate_all()
+        queries_before = self.env.cr.sql_log_count
+        started        = time.perf_counter()
+
+        with patch.object(
+            type(schedules), 'get_production_schedule_view_state',
+            return_value=states,
+        ):
+            schedules.action_replenish()
+        self.env.flush_all()
+
+        elapsed = time.perf_counter() - started
+        queries = self.env.cr.sql_log_count - queries_before
+        rfqs    = PurchaseOrder.search_count([('state', '=', 'draft')]) - rfqs_before
+        return elapsed, queries, rfqs
+
+    def test_benchmark_action_replenish(self):
+        """
+        Measure action_replenish() for every configured scale and fail when
+        SQL queries per schedule exceed the configured threshold.
+        """
+        results = []
+        for scale in self.scales:
+            with self.subTest(schedules=scale):
+                schedules = self._create_schedules(scale)
+                elapsed, queries, rfqs = self._measure(schedules)
+                per_schedule = queries / float(scale)
+                results.append((scale, elapsed, queries, per_schedule, rfqs))
+
+                _logger.info(
+                    "[MPS Benchmark] schedules=%d  periods=%d  bom_levels=%d  "
+                    "vendors=%d : wall=%.2fs  queries=%d  queries/schedule=%.1f  "
+                    "rfqs=%d",
+                    scale, self.num_periods, self.bom_levels,
+                    self.num_vendors, elapsed, queries, per_schedule, rfqs,
+                )
+
+                self.assertGreater(rfqs, 0, "Benchmark run created no RFQs")
+                self.assertLessEqual(
+                    per_schedule, self.max_queries_per_schedule,
+                    "action_replenish issued %.1f queries per schedule at "
+                    "scale %d (threshold %d)" % (
+                        per_schedule, scale, self.max_queries_per_schedule,
+                    ),
+                )
+
+        _logger.info(
+            "[MPS Benchmark] Summary\n%s",
+            "\n".join(
+                "  %5d schedules  %8.2fs  %8d queries  %6.1f q/schedule  %5d RFQs"
+                % row for row in results
+            ),
+        )
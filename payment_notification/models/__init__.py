@@ -1,2 +1,3 @@
 from . import account_move
-from . import payment_notification_config
\ No newline at end of file
+from . import payment_notification_config
+from . import payment_notification_run
@@ -1,6 +1,10 @@
 from odoo import models, fields, api
+from odoo.tools import sql
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta, datetime
 import logging
+import threading
+import time
 
 _logger = logging.getLogger(__name__)
 
@@ -19,138 +23,219 @@ class AccountMove(models.Model):
         help='Last time this invoice was checked for notification'
     )
 
-    def _cron_check_payment_due_dates(self):
+    # Moves the notification cron can pick up.  Kept in sync with the partial
+    # index below so the due-window query is answered from the index alone.
+    _PAYMENT_DUE_INDEX = 'account_move_payment_due_company_idx'
+    _PAYMENT_DUE_PREDICATE = """
+        move_type IN ('out_invoice', 'in_invoice')
+        AND state = 'posted'
+        AND payment_state IN ('not_paid', 'partial')
+        AND notification_sent IS NOT TRUE
+        AND invoice_date_due IS NOT NULL
+    """
+    _PAYMENT_DUE_CHUNK_SIZE = 200
+
+    def init(self):
+        super().init()
+        # Superseded by the per-company index
+        sql.drop_index(self.env.cr, 'account_move_payment_due_notification_idx', self._table)
+        if not sql.index_exists(self.env.cr, self._PAYMENT_DUE_INDEX):
+            sql.create_index(
+                self.env.cr, self._PAYMENT_DUE_INDEX, self._table,
+                ['company_id', 'invoice_date_due', 'id'], where=self._PAYMENT_DUE_PREDICATE,
+            )
+
+    @api.model
+    def _get_payment_due_window(self, config, now=None):
+        """Return the (date_from, date_to) range of invoice_date_due to notify.
+
+        invoice_date_due is a DATE, so minute/hour thresholds are rounded
+        down to whole days and include everything already due (date_from is
+        None); a day threshold targets exactly one due date.
         """
-        Scheduled action to check for payments due based on configuration
+        now = now or datetime.now()
+        if config.notification_unit == 'minutes':
+            days_threshold = config.notification_value // 1440  # 1440 min = 1 day
+        elif config.notification_unit == 'hours':
+            days_threshold = config.notification_value // 24
+        else:  # days
+            notification_date = (now + timedelta(days=config.notification_value)).date()
+            return notification_date, notification_date
+        return None, now.date() + timedelta(days=days_threshold)
+
+    @api.model
+    def _search_payment_due_move_ids(self, company, date_from, date_to):
+        """Ids of the company's moves due in the window, read through the partial index."""
+        self.flush_model(['company_id', 'move_type', 'state', 'payment_state', 'notification_sent', 'invoice_date_due'])
+        query = (f"SELECT id FROM account_move WHERE {self._PAYMENT_DUE_PREDICATE}"
+                 f" AND company_id = %s AND invoice_date_due <= %s")
+        params = [company.id, date_to]
+        if date_from:
+            query += " AND invoice_date_due >= %s"
+            params.append(date_from)
+        self.env.cr.execute(query + " ORDER BY invoice_date_due, id", params)
+        return [row[0] for row in self.env.cr.fetchall()]
+
+    def _cron_check_payment_due_dates(self):
         """
-        _logger.info('=' * 80)
-        _logger.info('PAYMENT NOTIFICATION CRON STARTED')
-        _logger.info('=' * 80)
+        Scheduled action to check for payments due based on configuration.
 
+        Every company with an active configuration whose check frequency has
+        elapsed is processed independently, in parallel when
+        ``payment_notification.max_workers`` is greater than 1.
+        """
+        Config = self.env['payment.notification.config']
         try:
-            config = self.env['payment.notification.config'].get_config()
-            _logger.info(f'Config loaded: {config.notification_value} {config.notification_unit}')
+            configs = Config._get_configs_to_run()
         except Exception as e:
             _logger.error(f'Failed to load config: {str(e)}')
             return False
 
-        now = datetime.now()
-        _logger.info(f'Current time: {now}')
-
-        # Calculate the notification threshold based on config
-        if config.notification_unit == 'minutes':
-            threshold = timedelta(minutes=config.notification_value)
-        elif config.notification_unit == 'hours':
-            threshold = timedelta(hours=config.notification_value)
-        else:  # days
-            threshold = timedelta(days=config.notification_value)
-
-        notification_datetime = now + threshold
-
-        _logger.info(f'Looking for payments due around: {notification_datetime}')
-        _logger.info(f'Threshold: {config.notification_value} {config.notification_unit}')
-
-        # Find all unpaid invoices/bills
-        moves = self.search([
-            ('move_type', 'in', ['out_invoice', 'in_invoice']),
-            ('state', '=', 'posted'),
-            ('payment_state', 'in', ['not_paid', 'partial']),
-            ('notification_sent', '=', False),
-            ('invoice_date_due', '!=', False),
-        ])
+        workers = min(Config._get_max_workers(), len(configs))
+        testing = getattr(threading.current_thread(), 'testing', False)
+        if workers > 1 and not testing:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(self._run_payment_due_check_in_worker, config.id)
+                           for config in configs]
+                for done, future in enumerate(futures, start=1):
+                    future.result()
+                    self.env['ir.cron']._notify_progress(done=done, remaining=len(configs) - done)
+        else:
+            for done, config in enumerate(configs, start=1):
+                self.with_company(config.company_id)._run_payment_due_check(config)
+                self.env['ir.cron']._notify_progress(done=done, remaining=len(configs) - done)
+        return True
 
-        _logger.info(f'Found {len(moves)} unpaid invoices/bills to check')
+    def _run_payment_due_check_in_worker(self, config_id):
+        """Run one company's check on a dedicated cursor (worker thread)."""
+        with self.pool.cursor() as cr:
+            context = {k: v for k, v in self.env.context.items() if k != 'ir_cron_progress_id'}
+            env = api.Environment(cr, self.env.uid, context)
+            config = env['payment.notification.config'].browse(config_id)
+            try:
+                env['account.move'].with_company(config.company_id)._run_payment_due_check(config)
+            except Exception:
+                _logger.exception(f'Payment notification check failed for company {config.company_id.name}')
+                raise
+
+    def _run_payment_due_check(self, config):
+        """Notify the company's moves due in the config window and record a run."""
+        started = time.monotonic()
+        testing = getattr(threading.current_thread(), 'testing', False)
+        company = config.company_id
+        now = datetime.now()
+        date_from, date_to = self._get_payment_due_window(config, now)
+        move_ids = self._search_payment_due_move_ids(company, date_from, date_to)
+        _logger.info(
+            f'Payment notification check for {company.name}: {len(move_ids)} moves due between '
+            f'{date_from or "-"} and {date_to} '
+            f'({config.notification_value} {config.notification_unit})'
+        )
 
         notified_count = 0
-
-        for move in moves:
-            # Convert due date to datetime for comparison
-            # Important: invoice_date_due is a DATE field, we need to consider it as end of day
-            due_date = move.invoice_date_due
-
-            # For minute/hour testing, we need to be more flexible
-            # Calculate days until due
-            days_until_due = (due_date - now.date()).days
-
-            _logger.info(f'Checking {move.name}: Due date {due_date}, Days until due: {days_until_due}')
-
-            # Check if we should notify based on the configured threshold
-            should_notify = False
-
-            if config.notification_unit == 'minutes':
-                # For minutes: if due date is today or tomorrow, we should notify
-                # This is because invoice_date_due is just a DATE, not DATETIME
-                total_minutes = config.notification_value
-                days_threshold = 0 if total_minutes < 1440 else total_minutes // 1440  # 1440 min = 1 day
-
-                should_notify = (days_until_due <= days_threshold)
-                _logger.info(
-                    f'  Minutes check: due in {days_until_due} days, threshold {days_threshold} days, notify: {should_notify}')
-
-            elif config.notification_unit == 'hours':
-                # For hours: similar logic
-                total_hours = config.notification_value
-                days_threshold = 0 if total_hours < 24 else total_hours // 24
-
-                should_notify = (days_until_due <= days_threshold)
-                _logger.info(
-                    f'  Hours check: due in {days_until_due} days, threshold {days_threshold} days, notify: {should_notify}')
-
-            else:  # days
-                # For days, check if due date matches the notification date
-                notification_date = (now + threshold).date()
-                should_notify = (due_date == notification_date)
-                _logger.info(
-                    f'  Days check: {should_notify} (notification date: {notification_date}, due date: {due_date})')
-
-            if should_notify:
-                _logger.info(f'  ✓ SENDING NOTIFICATION for {move.name}')
-                try:
-                    move._send_payment_due_notification(config)
-                    move.notification_sent = True
-                    move.last_notification_check = now
-                    notified_count += 1
-                except Exception as e:
-                    _logger.error(f'  ✗ Failed to send notification for {move.name}: {str(e)}')
-            else:
-                _logger.info(f'  ✗ Not in notification window')
-
-        _logger.info(f'CRON COMPLETED: Sent {notified_count} payment notifications')
-        _logger.info('=' * 80)
-
-        return True
+        # Digest mode: collect each user's moves over the whole run and only
+        # flag them once their digest has gone out
+        digest = {} if config.notification_mode == 'digest' else None
+        digest_moves = self.browse()
+        chunk_size = self._PAYMENT_DUE_CHUNK_SIZE
+        for start in range(0, len(move_ids), chunk_size):
+            moves = self.browse(move_ids[start:start + chunk_size])
+            try:
+                with self.env.cr.savepoint():
+                    notified = moves._send_payment_due_notifications_batch(config, digest=digest)
+            except Exception as e:
+                _logger.error(f'Failed to send notifications for {", ".join(moves.mapped("name"))}: {str(e)}')
+                notified = self.browse()
+            if digest is not None:
+                digest_moves |= notified
+                notified = self.browse()
+            notified.write({
+                'notification_sent': True,
+                'last_notification_check': now,
+            })
+            notified_count += len(notified)
+            # Keep finished chunks when a later one fails or the worker is killed
+            if not testing:
+                self.env.cr.commit()
+
+        if digest:
+            try:
+                with self.env.cr.savepoint():
+                    self._send_payment_due_digests(digest, config)
+            except Exception as e:
+                _logger.error(f'Failed to send payment due digests for {company.name}: {str(e)}')
+                digest_moves = self.browse()
+            digest_moves.write({
+                'notification_sent': True,
+                'last_notification_check': now,
+            })
+            notified_count += len(digest_moves)
+
+        self.env['payment.notification.run'].sudo().create({
+            'config_id': config.id,
+            'company_id': company.id,
+            'run_date': now,
+            'moves_scanned': len(move_ids),
+            'moves_notified': notified_count,
+            'duration': time.monotonic() - started,
+        })
+        config.sudo().last_run = now
+        if not testing:
+            self.env.cr.commit()
+
+        _logger.info(f'Payment notification check for {company.name} completed: '
+                     f'sent {notified_count} notifications')
+        return notified_count
 
     def _send_payment_due_notification(self, config=None):
         """Send notification for payment due"""
         self.ensure_one()
+        return self._send_payment_due_notifications_batch(config)
 
-        if not config:
-            config = self.env['payment.notification.config'].get_config()
+    def _send_payment_due_notifications_batch(self, config=None, digest=None):
+        """Notify the responsible users of every move in ``self`` at once.
 
-        # Determine the document type
-        doc_type = 'Customer Invoice' if self.move_type == 'out_invoice' else 'Vendor Bill'
+        Recipients are resolved in bulk, activities are created with one
+        mail.activity create, emails are rendered per batch and each user
+        gets one summary popup instead of one per document.  Returns the
+        moves that were handled.
 
-        # Get users to notify based on document type
-        users_to_notify = self._get_users_to_notify()
-
-        if not users_to_notify:
-            _logger.warning(f'No users found to notify for {self.name}')
-            return
+        In digest mode the per-document activities, messages, emails and
+        popups are replaced by one digest per user; when a ``digest`` dict is
+        given the moves are added to it and the caller sends the digests.
+        """
+        if not self:
+            return self
+        if not config:
+            config = self.env['payment.notification.config'].get_config()
 
-        # Calculate time until due
-        time_desc = self._get_time_until_due_description(config)
+        users_by_move = self._get_users_to_notify_batch()
+        time_desc_by_move = {move.id: move._get_time_until_due_description(config) for move in self}
 
-        # Send inbox notification to each user
-        for user in users_to_notify:
-            self._send_inbox_notification(user, doc_type, time_desc)
+        moves_by_user = {}
+        for move in self:
+            for user in users_by_move[move.id]:
+                moves_by_user.setdefault(user, self.browse())
+                moves_by_user[user] |= move
 
-        # Create activity for tracking
-        self._create_payment_activity(users_to_notify[0], time_desc)
+        if config.notification_mode == 'digest':
+            if digest is None:
+                self._send_payment_due_digests(moves_by_user, config)
+            else:
+                for user, moves in moves_by_user.items():
+                    digest[user] = digest.get(user, self.browse()) | moves
+        else:
+            self._create_payment_activities(users_by_move, time_desc_by_move)
+            self._post_payment_due_messages(users_by_move, time_desc_by_move)
+            self._send_payment_due_emails(time_desc_by_move)
+            self._send_payment_due_bus_digest(moves_by_user, time_desc_by_move)
 
-        # Send email notification (optional)
-        self._send_payment_due_email(time_desc)
+        _logger.info(f'Payment notifications sent for {len(self)} moves to {len(moves_by_user)} users')
+        return self
 
-        _logger.info(f'Payment notification sent for {self.name} to {len(users_to_notify)} users')
+    def _get_payment_due_doc_type(self):
+        self.ensure_one()
+        return 'Customer Invoice' if self.move_type == 'out_invoice' else 'Vendor Bill'
 
     def _get_time_until_due_description(self, config):
         """Get human-readable description of time until due"""
@@ -182,61 +267,52 @@ class AccountMove(models.Model):
             else:
                 return f"in {days_diff} days"
 
-    def _get_users_to_notify(self):
-        """Get list of users to notify based on invoice type"""
-        users_to_notify = []
-
-        if self.move_type == 'out_invoice':
-            # For customer invoices, notify the salesperson/invoice user
-            if self.invoice_user_id:
-                users_to_notify.append(self.invoice_user_id)
-            elif self.invoice_origin:
-                # Try to find the salesperson from the sale order
-                sale_order = self.env['sale.order'].search([
-                    ('name', '=', self.invoice_origin)
-                ], limit=1)
-                if sale_order and sale_order.user_id:
-                    users_to_notify.append(sale_order.user_id)
-        else:
-            # For vendor bills, notify accounting users
-            if self.invoice_user_id:
-                users_to_notify.append(self.invoice_user_id)
+    def _get_users_to_notify_batch(self):
+        """Map each move id to the users to notify, with one sale order lookup."""
+        origins = {
+            move.invoice_origin for move in self
+            if move.move_type == 'out_invoice' and not move.invoice_user_id and move.invoice_origin
+        }
+        salesman_by_origin = {}
+        if origins and 'sale.order' in self.env:
+            for order in self.env['sale.order'].search([('name', 'in', list(origins))]):
+                if order.user_id:
+                    salesman_by_origin.setdefault(order.name, order.user_id)
+
+        accounting_users = self.env['res.users']
+        if any(move.move_type != 'out_invoice' and not move.invoice_user_id for move in self):
+            group = self.env.ref('account.group_account_invoice', raise_if_not_found=False)
+            if group:
+                accounting_users = group.users[:2]
+
+        users_by_move = {}
+        for move in self:
+            if move.invoice_user_id:
+                users = move.invoice_user_id
+            elif move.move_type == 'out_invoice':
+                # For customer invoices, fall back to the sale order's salesperson
+                users = salesman_by_origin.get(move.invoice_origin, self.env['res.users'])
             else:
-                # Notify accounting manager or users with billing rights
-                accounting_users = self.env.ref('account.group_account_invoice',
-                                                raise_if_not_found=False)
-                if accounting_users:
-                    users_to_notify.extend(accounting_users.users[:2])
-
-        # Remove duplicates
-        users_to_notify = list(set(users_to_notify))
-
-        # Fallback to current user if no one found
-        if not users_to_notify:
-            users_to_notify = [self.env.user]
+                # For vendor bills, notify users with billing rights
+                users = accounting_users
+            # Fallback to current user if no one found
+            users_by_move[move.id] = users or self.env.user
+        return users_by_move
 
-        return users_to_notify
-
-    def _send_inbox_notification(self, user, doc_type, time_desc):
-        """Send notification to user's inbox (bell icon)"""
+    def _get_users_to_notify(self):
+        """Get list of users to notify based on invoice type"""
         self.ensure_one()
+        return list(self._get_users_to_notify_batch()[self.id])
 
-        # Get or create the notification subtype
-        subtype = self.env.ref('payment_due_notifications.mt_payment_due_reminder',
-                               raise_if_not_found=False)
-
-        if not subtype:
-            # Fallback to default comment subtype
-            subtype = self.env.ref('mail.mt_comment')
-
-        # Create notification message
-        body = f"""
+    def _get_payment_due_message_body(self, time_desc):
+        self.ensure_one()
+        return f"""
             <div style="padding: 10px; background-color: #fff3e0; border-left: 4px solid #FF9800; margin: 10px 0;">
                 <p style="margin: 0 0 10px 0;">
                     <strong style="color: #FF9800;">⚠️ Payment Due {time_desc}</strong>
                 </p>
                 <p style="margin: 5px 0;">
-                    <strong>{doc_type}:</strong> {self.name}
+                    <strong>{self._get_payment_due_doc_type()}:</strong> {self.name}
                 </p>
                 <p style="margin: 5px 0;">
                     <strong>Customer:</strong> {self.partner_id.name}
@@ -253,39 +329,29 @@ class AccountMove(models.Model):
             </div>
         """
 
-        # Post message with notification
-        self.message_post(
-            body=body,
-            subject=f'Payment Due Reminder: {self.name}',
-            message_type='notification',
-            subtype_id=subtype.id,
-            partner_ids=[user.partner_id.id],
-        )
-
-        # Send bus notification for real-time popup
-        self.env['bus.bus']._sendone(
-            user.partner_id,
-            'simple_notification',
-            {
-                'title': '⚠️ Payment Due Reminder',
-                'message': f'{doc_type} {self.name} is due {time_desc} ({self.invoice_date_due})',
-                'type': 'warning',
-                'sticky': True,
-            }
-        )
-
-    def _create_payment_activity(self, user, time_desc):
-        """Create activity for payment tracking"""
+    def _post_payment_due_messages(self, users_by_move, time_desc_by_move):
+        """Post the reminder in each move's chatter (inbox/bell notification)"""
+        subtype = self.env.ref('payment_due_notifications.mt_payment_due_reminder',
+                               raise_if_not_found=False) or self.env.ref('mail.mt_comment')
+        for move in self:
+            move.message_post(
+                body=move._get_payment_due_message_body(time_desc_by_move[move.id]),
+                subject=f'Payment Due Reminder: {move.name}',
+                message_type='notification',
+                subtype_id=subtype.id,
+                partner_ids=users_by_move[move.id].partner_id.ids,
+            )
+
+    def _prepare_payment_activity_vals(self, user, time_desc, activity_type, res_model_id):
         self.ensure_one()
-
-        doc_type = 'Customer Invoice' if self.move_type == 'out_invoice' else 'Vendor Bill'
-
-        self.activity_schedule(
-            'mail.mail_activity_data_warning',
-            summary=f'Payment Due: {self.name}',
-            note=f"""
+        return {
+            'res_model_id': res_model_id,
+            'res_id': self.id,
+            'activity_type_id': activity_type.id,
+            'summary': f'Payment Due: {self.name}',
+            'note': f"""
                 <p><strong>Payment Due Reminder</strong></p>
-                <p>{doc_type} <strong>{self.name}</strong> is due {time_desc}!</p>
+                <p>{self._get_payment_due_doc_type()} <strong>{self.name}</strong> is due {time_desc}!</p>
                 <ul>
                     <li>Partner: {self.partner_id.name}</li>
                     <li>Amount Due: {self.amount_residual} {self.currency_id.name}</li>
@@ -293,24 +359,132 @@ class AccountMove(models.Model):
                 </ul>
                 <p>Please ensure payment is processed on time.</p>
             """,
-            user_id=user.id,
-            date_deadline=self.invoice_date_due,
-        )
-
-    def _send_payment_due_email(self, time_desc):
-        """Send email notification for payment due"""
-        self.ensure_one()
+            'user_id': user.id,
+            'date_deadline': self.invoice_date_due,
+        }
+
+    def _create_payment_activities(self, users_by_move, time_desc_by_move):
+        """Create the tracking activities of all moves in one create"""
+        activity_type = self.env.ref('mail.mail_activity_data_warning')
+        res_model_id = self.env['ir.model']._get_id(self._name)
+        self.env['mail.activity'].create([
+            move._prepare_payment_activity_vals(
+                users_by_move[move.id][:1], time_desc_by_move[move.id], activity_type, res_model_id)
+            for move in self
+        ])
 
+    def _send_payment_due_emails(self, time_desc_by_move):
+        """Queue the reminder emails, rendering the template once per time description"""
         template = self.env.ref('payment_due_notifications.email_template_payment_due',
                                 raise_if_not_found=False)
-
-        if template:
+        if not template:
+            return
+        ids_by_time_desc = {}
+        for move_id, time_desc in time_desc_by_move.items():
+            ids_by_time_desc.setdefault(time_desc, []).append(move_id)
+        for time_desc, move_ids in ids_by_time_desc.items():
             try:
-                # Pass time description to template context
-                ctx = dict(self.env.context, time_desc=time_desc)
-                template.with_context(ctx).send_mail(self.id, force_send=False)
+                template.with_context(time_desc=time_desc).send_mail_batch(move_ids, force_send=False)
             except Exception as e:
-                _logger.error(f'Failed to send payment due email for {self.name}: {str(e)}')
+                _logger.error(f'Failed to send payment due emails for {len(move_ids)} moves: {str(e)}')
+
+    def _send_payment_due_bus_digest(self, moves_by_user, time_desc_by_move):
+        """One popup per user summarising all their due documents"""
+        notifications = []
+        for user, moves in moves_by_user.items():
+            if len(moves) == 1:
+                message = (f'{moves._get_payment_due_doc_type()} {moves.name} is due '
+                           f'{time_desc_by_move[moves.id]} ({moves.invoice_date_due})')
+            else:
+                message = (f'{len(moves)} invoices/bills are due soon: '
+                           f'{", ".join(moves[:5].mapped("name"))}{" ..." if len(moves) > 5 else ""}')
+            notifications.append((user.partner_id, 'simple_notification', {
+                'title': '⚠️ Payment Due Reminder',
+                'message': message,
+                'type': 'warning',
+                'sticky': True,
+            }))
+        if notifications:
+            self.env['bus.bus']._sendmany(notifications)
+
+    def _get_payment_due_digest_body(self, config):
+        """HTML summary of the due moves in ``self`` for one user"""
+        totals = {}
+        for move in self:
+            totals[move.currency_id] = totals.get(move.currency_id, 0.0) + move.amount_residual
+        totals_html = ''.join(
+            f'<li>{currency.format(amount)}</li>'
+            for currency, amount in sorted(totals.items(), key=lambda item: item[0].name)
+        )
+        top_moves = self.sorted(lambda m: abs(m.amount_residual_signed), reverse=True)[:config.digest_top_count]
+        rows_html = ''.join(
+            f"""<tr>
+                    <td style="padding: 4px 8px;">{move.name}</td>
+                    <td style="padding: 4px 8px;">{move.partner_id.name or ''}</td>
+                    <td style="padding: 4px 8px;">{move.invoice_date_due}</td>
+                    <td style="padding: 4px 8px; text-align: right;">{move.currency_id.format(move.amount_residual)}</td>
+                </tr>"""
+            for move in top_moves
+        )
+        action = self.env.ref('payment_notification.action_payment_due_digest_moves',
+                              raise_if_not_found=False)
+        link_html = ''
+        if action:
+            url = f"{self.get_base_url()}/odoo/action-{action.id}"
+            link_html = f'<p><a href="{url}">View all due invoices/bills</a></p>'
+        return f"""
+            <div style="padding: 10px; background-color: #fff3e0; border-left: 4px solid #FF9800; margin: 10px 0;">
+                <p style="margin: 0 0 10px 0;">
+                    <strong style="color: #FF9800;">⚠️ {len(self)} invoices/bills are due</strong>
+                </p>
+                <p style="margin: 5px 0;"><strong>Total Amount Due:</strong></p>
+                <ul>{totals_html}</ul>
+                <p style="margin: 5px 0;"><strong>Largest amounts due:</strong></p>
+                <table style="border-collapse: collapse;">
+                    <tr>
+                        <th style="padding: 4px 8px; text-align: left;">Document</th>
+                        <th style="padding: 4px 8px; text-align: left;">Partner</th>
+                        <th style="padding: 4px 8px; text-align: left;">Due Date</th>
+                        <th style="padding: 4px 8px; text-align: right;">Amount Due</th>
+                    </tr>
+                    {rows_html}
+                </table>
+                {link_html}
+            </div>
+        """
+
+    @api.model
+    def _send_payment_due_digests(self, moves_by_user, config):
+        """Deliver one digest per user: inbox message, email and popup"""
+        mail_vals_list = []
+        notifications = []
+        for user, moves in moves_by_user.items():
+            subject = f'Payment Due Reminder: {len(moves)} invoices/bills'
+            body = moves._get_payment_due_digest_body(config)
+            self.env['mail.thread'].message_notify(
+                partner_ids=user.partner_id.ids,
+                subject=subject,
+                body=body,
+            )
+            if user.partner_id.email:
+                mail_vals_list.append({
+                    'subject': subject,
+                    'body_html': body,
+                    'email_from': moves[0].company_id.email or self.env.user.email_formatted,
+                    'email_to': user.partner_id.email_formatted,
+                    'auto_delete': True,
+                })
+            notifications.append((user.partner_id, 'simple_notification', {
+                'title': '⚠️ Payment Due Reminder',
+                'message': f'{len(moves)} invoices/bills are due soon, see your inbox for the summary',
+                'type': 'warning',
+                'sticky': False,
+            }))
+        if mail_vals_list:
+            self.env['mail.mail'].sudo().create(mail_vals_list)
+        if notifications:
+            self.env['bus.bus']._sendmany(notifications)
+        _logger.info(f'Payment due digests sent to {len(moves_by_user)} users')
 
     def action_post(self):
         """Reset notification flag when invoice is posted"""
@@ -1,4 +1,5 @@
 from odoo import models, fields, api
+from datetime import timedelta
 import logging
 _logger = logging.getLogger(__name__)
 class PaymentNotificationConfig(models.Model):
@@ -19,6 +20,19 @@ class PaymentNotificationConfig(models.Model):
         ('days', 'Days'),
     ], string='Time Unit', default='days', required=True)
 
+    notification_mode = fields.Selection([
+        ('document', 'One notification per document'),
+        ('digest', 'Digest per user'),
+    ], string='Delivery Mode', default='document', required=True,
+        help='Digest sends every user a single summary per check instead of '
+             'one activity, message, email and popup per invoice/bill.')
+
+    digest_top_count = fields.Integer(
+        string='Documents Listed in Digest',
+        default=10,
+        help='Number of largest due documents listed in the digest'
+    )
+
     active = fields.Boolean(default=True)
 
     company_id = fields.Many2one(
@@ -34,6 +48,14 @@ class PaymentNotificationConfig(models.Model):
         help='How often the system checks for payments (in minutes). Lower values for testing.'
     )
 
+    last_run = fields.Datetime(string='Last Check', readonly=True)
+
+    run_ids = fields.One2many(
+        'payment.notification.run',
+        'config_id',
+        string='Runs'
+    )
+
     @api.model
     def get_config(self):
         """Get the active configuration"""
@@ -52,10 +74,38 @@ class PaymentNotificationConfig(models.Model):
 
         return config
 
+    @api.model
+    def _get_configs_to_run(self):
+        """Active configurations, one per company, whose check frequency elapsed"""
+        configs = self.sudo().search([('active', '=', True)], order='company_id, id')
+        if not configs:
+            return self.get_config()
+        now = fields.Datetime.now()
+        to_run = self.browse()
+        seen_companies = set()
+        for config in configs:
+            if config.company_id.id in seen_companies:
+                continue
+            seen_companies.add(config.company_id.id)
+            # One minute of slack so a cron started slightly early still runs
+            interval = timedelta(minutes=max((config.cron_interval or 0) - 1, 0))
+            if not config.last_run or config.last_run + interval <= now:
+                to_run |= config
+        return to_run
+
+    @api.model
+    def _get_max_workers(self):
+        """Companies checked in parallel (system parameter, 1 = sequential)"""
+        value = self.env['ir.config_parameter'].sudo().get_param('payment_notification.max_workers', '1')
+        try:
+            return max(1, int(value))
+        except ValueError:
+            return 1
+
     def write(self, vals):
         """Update cron job when configuration changes"""
         res = super(PaymentNotificationConfig, self).write(vals)
-        if 'cron_interval' in vals:
+        if {'cron_interval', 'active'} & set(vals):
             self._update_cron_interval()
         return res
 
@@ -67,27 +117,32 @@ class PaymentNotificationConfig(models.Model):
         return configs
 
     def _update_cron_interval(self):
-        """Update the cron job interval"""
-        cron = self.env.ref('payment_due_notifications.ir_cron_check_payment_due',
+        """Run the shared cron at the shortest check frequency of all companies;
+        each company then skips the runs before its own frequency elapsed."""
+        cron = self.env.ref('payment_notification.ir_cron_check_payment_due',
                             raise_if_not_found=False)
-        if cron and self.cron_interval:
-            cron.write({
-                'interval_number': self.cron_interval,
+        intervals = self.sudo().search([('active', '=', True), ('cron_interval', '>', 0)]).mapped('cron_interval')
+        if cron and intervals:
+            cron.sudo().write({
+                'interval_number': min(intervals),
                 'interval_type': 'minutes'
             })
-            _logger.info(f'Cron interval updated to {self.cron_interval} minutes')
+            _logger.info(f'Cron interval updated to {min(intervals)} minutes')
 
     def action_run_cron_now(self):
         """Manually trigger the cron job"""
         self.ensure_one()
         try:
-            self.env['account.move']._cron_check_payment_due_dates()
+            cron = self.env.ref('payment_notification.ir_cron_check_payment_due')
+            # Clearing last_run makes the triggered run include this company
+            self.sudo().last_run = False
+            cron.sudo()._trigger()
             return {
                 'type': 'ir.actions.client',
                 'tag': 'display_notification',
                 'params': {
-                    'title': 'Manual Check Complete',
-                    'message': 'Payment notification check has been executed. Check the logs for details.',
+                    'title': 'Manual Check Scheduled',
+                    'message': 'Payment notification check will run in the background shortly. Check the logs for details.',
                     'type': 'success',
                     'sticky': False,
                 }
@@ -0,0 +1,31 @@
+from odoo import models, fields
+
+
+class PaymentNotificationRun(models.Model):
+    _name = 'payment.notification.run'
+    _description = 'Payment Notification Run'
+    _order = 'run_date desc, id desc'
+
+    config_id = fields.Many2one(
+        'payment.notification.config',
+        string='Configuration',
+        ondelete='cascade',
+        index=True
+    )
+
+    company_id = fields.Many2one(
+        'res.company',
+        string='Company',
+        required=True
+    )
+
+    run_date = fields.Datetime(string='Run Date', required=True)
+
+    moves_scanned = fields.Integer(
+        string='Moves Scanned',
+        help='Invoices/bills found in the notification window'
+    )
+
+    moves_notified = fields.Integer(string='Moves Notified')
+
+    duration = fields.Float(string='Duration (s)', digits=(16, 2))
@@ -0,0 +1 @@
+from . import test_payment_notification_config
@@ -0,0 +1,33 @@
+from odoo import fields
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestPaymentNotificationConfig(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.cron = cls.env.ref('payment_notification.ir_cron_check_payment_due')
+        cls.config = cls.env['payment.notification.config'].get_config()
+
+    def test_run_check_now_triggers_cron(self):
+        """The button schedules the shared cron instead of running the check."""
+        self.config.last_run = fields.Datetime.now()
+        Trigger = self.env['ir.cron.trigger']
+        triggers_before = Trigger.search([('cron_id', '=', self.cron.id)])
+
+        action = self.config.action_run_cron_now()
+
+        self.assertEqual(action['params']['type'], 'success')
+        self.assertTrue(Trigger.search([('cron_id', '=', self.cron.id)]) - triggers_before)
+        # The triggered run must include this company
+        self.assertFalse(self.config.last_run)
+        self.assertIn(self.config, self.config._get_configs_to_run())
+
+    def test_cron_interval_follows_configs(self):
+        """The shared cron runs at the shortest check frequency."""
+        self.config.cron_interval = 1
+        self.config._update_cron_interval()
+        self.assertEqual(self.cron.interval_number, 1)
+        self.assertEqual(self.cron.interval_type, 'minutes')
@@ -26,12 +26,14 @@ Sales person Commission""",
     "data":  [
         'security/ir.model.access.csv',
         'data/data.xml',
+        'data/ir_cron_data.xml',
         'views/views.xml',
         'views/show_commission_view.xml',
         'views/res_user_view.xml',
         'views/hr_employee_view.xml',
         'views/product_template_view.xml',
         'views/pos_commission_view.xml',
+        'views/commission_ledger_view.xml',
         'views/wizard_message_view.xml',
         'wizard/commission_report.xml',
         'wizard/invoice_partner.xml',
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+import csv
+import io
+
+from odoo import api, http
+from odoo.http import request
+from odoo.tools.misc import xlsxwriter
+
+
+class CommissionReportExport(http.Controller):
+
+    @http.route('/pos_sales_commission/report/export/<int:wizard_id>/<string:file_format>',
+                type='http', auth='user')
+    def export_commission_report(self, wizard_id, file_format, **kwargs):
+        wizard = request.env['commission.report'].browse(wizard_id).exists()
+        if not wizard or file_format not in ('csv', 'xlsx'):
+            return request.not_found()
+
+        filename = 'commission_report_%s_%s.%s' % (
+            wizard.start_date.date(), wizard.end_date.date(), file_format)
+
+        if file_format == 'csv':
+            # The response body is consumed after the request cursor is
+            # closed, so the generator reads the rows with its own cursor.
+            registry = request.env.registry
+            uid, context = request.env.uid, dict(request.env.context)
+
+            def generate():
+                with registry.cursor() as cr:
+                    env = api.Environment(cr, uid, context)
+                    buffer = io.StringIO()
+                    writer = csv.writer(buffer)
+                    for row in env['commission.report'].browse(wizard_id)._get_export_rows():
+                        writer.writerow(row)
+                        yield buffer.getvalue().encode('utf-8')
+                        buffer.seek(0)
+                        buffer.truncate(0)
+            headers = [
+                ('Content-Type', 'text/csv; charset=utf-8'),
+                ('Content-Disposition', http.content_disposition(filename)),
+            ]
+            return request.make_response(generate(), headers=headers)
+
+        rows = wizard._get_export_rows()
+        output = io.BytesIO()
+        workbook = xlsxwriter.Workbook(output, {'in_memory': True})
+        worksheet = workbook.add_worksheet('Commissions')
+        bold = workbook.add_format({'bold': True})
+        for row_index, row in enumerate(rows):
+            worksheet.write_row(row_index, 0, row, bold if row_index == 0 else None)
+        workbook.close()
+        headers = [
+            ('Content-Type', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+            ('Content-Disposition', http.content_disposition(filename)),
+        ]
+        return request.make_response(output.getvalue(), headers=headers)
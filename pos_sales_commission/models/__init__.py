@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-from . import (account_move, commission_report, hr_employee, invoice_data,
+from . import (account_move, commission_ledger, commission_report, hr_employee, invoice_data,
                invoice_partner, models, pos_commission, pos_config, pos_order,
                pos_session, product, res_config, res_user, wizard_message)
 
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+from collections import defaultdict
+
+from odoo import api, fields, models
+from odoo.tools import sql
+
+# pos.commission state -> ledger column; every non cancelled commission is
+# also counted in accrued_amount.
+LEDGER_STATE_FIELDS = {
+    'confirm': 'confirmed_amount',
+    'invoice': 'invoiced_amount',
+    'paid': 'paid_amount',
+}
+LEDGER_AMOUNT_FIELDS = ['accrued_amount'] + list(LEDGER_STATE_FIELDS.values())
+
+
+class PosCommissionLedger(models.Model):
+    _name = 'pos.commission.ledger'
+    _description = "Pos Commission Ledger"
+    _order = 'period desc, id'
+
+    employee_id = fields.Many2one('hr.employee', string="Employee", index=True, readonly=True)
+    user_id = fields.Many2one('res.users', string="User", index=True, readonly=True)
+    name = fields.Char('Name', compute='_get_name')
+    period = fields.Date(string='Period', required=True, index=True, readonly=True,
+                         help='First day of the month the commissions were created in (UTC).')
+    currency_id = fields.Many2one(
+        'res.currency', string='Currency', default=lambda self: self.env.company.currency_id, readonly=True)
+    accrued_amount = fields.Monetary(string='Accrued', readonly=True)
+    confirmed_amount = fields.Monetary(string='Confirmed', readonly=True)
+    invoiced_amount = fields.Monetary(string='Invoiced', readonly=True)
+    paid_amount = fields.Monetary(string='Paid', readonly=True)
+
+    def init(self):
+        # employee_id and user_id are nullable (one of them is always empty),
+        # so a plain UNIQUE(employee_id, user_id, period) would never fire:
+        # the key is enforced on the coalesced columns instead.
+        sql.create_unique_index(
+            self.env.cr, 'pos_commission_ledger_key_uniq', self._table,
+            ['COALESCE(employee_id, 0)', 'COALESCE(user_id, 0)', 'period'])
+
+    @api.depends('employee_id', 'user_id')
+    def _get_name(self):
+        for data in self:
+            if(data.employee_id):
+                data.name = data.employee_id.name
+            else:
+                data.name = data.user_id.name
+
+    @api.model
+    def _get_ledger_key(self, commission):
+        """(employee_id, user_id, period) a commission is booked under."""
+        create_date = commission.create_date or fields.Datetime.now()
+        period = create_date.date().replace(day=1)
+        if(commission.employee_id):
+            return (commission.employee_id.id, False, period)
+        return (False, commission.user_id.id, period)
+
+    @api.model
+    def _get_ledger_contributions(self, commissions):
+        """Amounts ``commissions`` add to each ledger line, keyed by ledger key."""
+        contributions = defaultdict(lambda: dict.fromkeys(LEDGER_AMOUNT_FIELDS, 0.0))
+        for commission in commissions:
+            if(commission.state == 'cancel' or not (commission.employee_id or commission.user_id)):
+                continue
+            values = contributions[self._get_ledger_key(commission)]
+            values['accrued_amount'] += commission.commission_amount
+            state_field = LEDGER_STATE_FIELDS.get(commission.state)
+            if(state_field):
+                values[state_field] += commission.commission_amount
+        return contributions
+
+    @api.model
+    def _apply_ledger_delta(self, before, after):
+        """Add ``after - before`` to the ledger lines, creating missing ones.
+
+        Applied with one INSERT ... ON CONFLICT DO UPDATE SET f = f + delta,
+        so concurrent transactions neither duplicate a line nor lose an
+        increment.
+        """
+        delta = {}
+        for key in set(before) | set(after):
+            values = {
+                fname: after.get(key, {}).get(fname, 0.0) - before.get(key, {}).get(fname, 0.0)
+                for fname in LEDGER_AMOUNT_FIELDS
+            }
+            if(any(values.values())):
+                delta[key] = values
+        if(not delta):
+            return
+
+        self.flush_model()
+        now = self.env.cr.now()
+        uid = self.env.uid
+        currency_id = self.env.company.currency_id.id
+        rows, params = [], []
+        for (employee_id, user_id, period), values in delta.items():
+            rows.append('(%s)' % ', '.join(['%s'] * (len(LEDGER_AMOUNT_FIELDS) + 8)))
+            params.extend([employee_id or None, user_id or None, period, currency_id])
+            params.extend(values[fname] for fname in LEDGER_AMOUNT_FIELDS)
+            params.extend([uid, now, uid, now])
+        self.env.cr.execute("""
+            INSERT INTO pos_commission_ledger
+                (employee_id, user_id, period, currency_id, {columns},
+                 create_uid, create_date, write_uid, write_date)
+            VALUES {rows}
+            ON CONFLICT (COALESCE(employee_id, 0), COALESCE(user_id, 0), period)
+            DO UPDATE SET {updates},
+                          write_uid = EXCLUDED.write_uid,
+                          write_date = EXCLUDED.write_date
+        """.format(
+            columns=', '.join(LEDGER_AMOUNT_FIELDS),
+            rows=', '.join(rows),
+            updates=', '.join(
+                '%s = pos_commission_ledger.%s + EXCLUDED.%s' % (fname, fname, fname)
+                for fname in LEDGER_AMOUNT_FIELDS),
+        ), params)
+        self.invalidate_model(LEDGER_AMOUNT_FIELDS + ['write_uid', 'write_date'])
+
+    @api.model
+    def get_commission_totals(self, employee_id=False, user_id=False, period=False):
+        """Accrued/confirmed/invoiced/paid totals of one employee or user.
+
+        Reads the ledger lines only; ``period`` restricts the totals to the
+        month containing that date.
+        """
+        domain = [('employee_id', '=', employee_id)] if employee_id else [
+            ('employee_id', '=', False), ('user_id', '=', user_id)]
+        if(period):
+            domain.append(('period', '=', fields.Date.to_date(period).replace(day=1)))
+        [totals] = self._read_group(domain, [], ['%s:sum' % fname for fname in LEDGER_AMOUNT_FIELDS])
+        return {fname: amount or 0.0 for fname, amount in zip(LEDGER_AMOUNT_FIELDS, totals)}
+
+    @api.model
+    def _rebuild(self):
+        """Recompute the whole ledger from pos.commission (back-fills, repairs)."""
+        ledger = self.sudo()
+        ledger.search([]).unlink()
+        groups = self.env['pos.commission'].with_context(tz='UTC')._read_group(
+            [('state', '!=', 'cancel'), '|', ('employee_id', '!=', False), ('user_id', '!=', False)],
+            groupby=['employee_id', 'user_id', 'create_date:month', 'state'],
+            aggregates=['commission_amount:sum'],
+        )
+        rows = defaultdict(lambda: dict.fromkeys(LEDGER_AMOUNT_FIELDS, 0.0))
+        for employee, user, month, state, amount in groups:
+            month = fields.Date.to_date(month)
+            key = (employee.id, False, month) if employee else (False, user.id, month)
+            rows[key]['accrued_amount'] += amount or 0.0
+            state_field = LEDGER_STATE_FIELDS.get(state)
+            if(state_field):
+                rows[key][state_field] += amount or 0.0
+        ledger.create([
+            dict(values, employee_id=key[0], user_id=key[1], period=key[2])
+            for key, values in rows.items()
+        ])
+        return True
+
+    def action_rebuild_ledger(self):
+        self._rebuild()
+        return {'type': 'ir.actions.client', 'tag': 'reload'}
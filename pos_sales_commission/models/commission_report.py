@@ -34,8 +34,13 @@ class CommissionReport(models.TransientModel):
         ('employee', 'Employee'),
         ('user', 'User'),
     ], string='Report of', default='employee', required=True)
-    employee_id = fields.Many2one('hr.employee', string="Employee")
-    user_id = fields.Many2one('res.users', string="User")
+    employee_id = fields.Many2one('hr.employee', string="Employee", help="Leave empty to report on all employees.")
+    user_id = fields.Many2one('res.users', string="User", help="Leave empty to report on all users.")
+    group_by_period = fields.Selection([
+        ('day', 'Day'),
+        ('month', 'Month'),
+    ], string='Group by', default='day', required=True)
+    include_details = fields.Boolean(string='Include Commission Lines', default=True)
 
     @api.constrains('start_date', 'end_date')
     def check_dates(self):
@@ -44,74 +49,111 @@ class CommissionReport(models.TransientModel):
                 raise ValidationError(
                     'Start Date should be smaller than End Date')
 
-    def generate_commission_report(self):
+    def _get_report_bounds(self):
         end_date = self._wk_get_utc_time_(str(self.end_date))
         start_date = self._wk_get_utc_time_(str(self.start_date))
         if(start_date > end_date):
             raise ValidationError('End Date Cannot be smaller the Start Date')
+        return start_date, end_date
+
+    def _get_report_domain(self, start_date, end_date):
+        domain = [('create_date', '<=', end_date), ('create_date', '>=', start_date)]
         if(self.report_of == 'employee'):
-            pos_commission_ids = self.env['pos.commission'].search(
-                [('create_date', '<=', end_date), ('create_date', '>=', start_date), ('employee_id', '=', self.employee_id.id)])
-            if(not len(pos_commission_ids)):
-                raise ValidationError(
-                    'Cannot Find Records from particular dates')
-            commission_lines = []
-            name = None
-            total = 0
-            for pos_commission_id in pos_commission_ids:
-                name = pos_commission_id.employee_id.name
-                data = {}
-                data['name'] = pos_commission_id.employee_id.name
-                data['order'] = pos_commission_id.order_id.name
-                data['date'] = pos_commission_id.create_date.date()
-                if(pos_commission_id.state == 'draft'):
-                    data['state'] = 'Draft'
-                elif(pos_commission_id.state == 'confirm'):
-                    data['state'] = 'Confirm'
-                elif(pos_commission_id.state == 'cancel'):
-                    data['state'] = 'Cancel'
-                elif(pos_commission_id.state == 'invoice'):
-                    data['state'] = 'Invoice'
-                elif(pos_commission_id.state == 'paid'):
-                    data['state'] = 'Paid'
-                data['commission'] = "{0:.2f}".format(
-                    pos_commission_id.commission_amount)
-                total = total + pos_commission_id.commission_amount
-                commission_lines.append(data)
-
-            data = {'start_date': start_date, 'end_date': end_date, 'title': name,
-                    'commission_lines': commission_lines, 'total': "{0:.2f}".format(total), 'currency_id': self.currency_id}
+            domain.append(('employee_id', '!=', False))
+            if(self.employee_id):
+                domain.append(('employee_id', '=', self.employee_id.id))
         else:
-            pos_commission_ids = self.env['pos.commission'].search([('create_date', '<=', end_date), (
-                'create_date', '>=', start_date), ('user_id', '=', self.user_id.id), ('employee_id', '=', False)])
-            if(not len(pos_commission_ids)):
-                raise ValidationError(
-                    'Cannot Find Records from particular dates')
-            commission_lines = []
-            name = None
-            total = 0
-            for pos_commission_id in pos_commission_ids:
-                name = pos_commission_id.user_id.name
-                data = {}
-                data['name'] = pos_commission_id.user_id.name
-                data['order'] = pos_commission_id.order_id.name
-                data['date'] = pos_commission_id.create_date.date()
-                if(pos_commission_id.state == 'draft'):
-                    data['state'] = 'Draft'
-                elif(pos_commission_id.state == 'confirm'):
-                    data['state'] = 'Confirm'
-                elif(pos_commission_id.state == 'cancel'):
-                    data['state'] = 'Cancel'
-                elif(pos_commission_id.state == 'invoice'):
-                    data['state'] = 'Invoice'
-                elif(pos_commission_id.state == 'paid'):
-                    data['state'] = 'Paid'
-                data['commission'] = "{0:.2f}".format(
-                    pos_commission_id.commission_amount)
-                total = total + pos_commission_id.commission_amount
-                commission_lines.append(data)
-
-            data = {'start_date': start_date, 'end_date': end_date, 'title': name,
-                    'commission_lines': commission_lines, 'total': "{0:.2f}".format(total), 'currency_id': self.currency_id}
+            domain.append(('employee_id', '=', False))
+            if(self.user_id):
+                domain.append(('user_id', '=', self.user_id.id))
+        return domain
 
+    def _get_state_labels(self):
+        return dict(self.env['pos.commission']._fields['state']._description_selection(self.env))
+
+    def _get_report_rollups(self, domain):
+        """Per person / period / state totals computed by one grouped query."""
+        person_field = 'employee_id' if self.report_of == 'employee' else 'user_id'
+        period_format = '%Y-%m' if self.group_by_period == 'month' else '%Y-%m-%d'
+        state_labels = self._get_state_labels()
+        groups = self.env['pos.commission']._read_group(
+            domain,
+            groupby=[person_field, 'create_date:%s' % self.group_by_period, 'state'],
+            aggregates=['__count', 'commission_amount:sum'],
+            order='%s, create_date:%s, state' % (person_field, self.group_by_period),
+        )
+        return [{
+            'name': person.display_name,
+            'period': period.strftime(period_format) if period else '',
+            'state': state_labels.get(state, state),
+            'count': count,
+            'commission': amount or 0.0,
+        } for person, period, state, count, amount in groups]
+
+    def _get_report_detail_lines(self, domain):
+        """Optional per-commission lines, read in one search_read."""
+        person_field = 'employee_id' if self.report_of == 'employee' else 'user_id'
+        state_labels = self._get_state_labels()
+        records = self.env['pos.commission'].search_read(
+            domain, [person_field, 'order_id', 'create_date', 'state', 'commission_amount'],
+            order='create_date, id')
+        return [{
+            'name': record[person_field] and record[person_field][1],
+            'order': record['order_id'] and record['order_id'][1],
+            'date': record['create_date'].date(),
+            'state': state_labels.get(record['state'], record['state']),
+            'commission': record['commission_amount'],
+        } for record in records]
+
+    def generate_commission_report(self):
+        start_date, end_date = self._get_report_bounds()
+        domain = self._get_report_domain(start_date, end_date)
+        rollups = self._get_report_rollups(domain)
+        if(not rollups):
+            raise ValidationError(
+                'Cannot Find Records from particular dates')
+
+        commission_lines = []
+        if(self.include_details):
+            commission_lines = [
+                dict(line, commission="{0:.2f}".format(line['commission']))
+                for line in self._get_report_detail_lines(domain)
+            ]
+        names = {rollup['name'] for rollup in rollups}
+        title = names.pop() if len(names) == 1 else (
+            'All Employees' if self.report_of == 'employee' else 'All Users')
+        total = sum(rollup['commission'] for rollup in rollups)
+
+        data = {'start_date': start_date, 'end_date': end_date, 'title': title,
+                'commission_lines': commission_lines,
+                'rollups': [dict(rollup, commission="{0:.2f}".format(rollup['commission'])) for rollup in rollups],
+                'total': "{0:.2f}".format(total), 'currency_id': self.currency_id}
         return self.env.ref('pos_sales_commission.action_pos_sales_commission_summary').report_action([], data)
+
+    def _get_export_rows(self):
+        """Yield the report as rows (header first): rollups, or detail lines
+        when include_details is set."""
+        start_date, end_date = self._get_report_bounds()
+        domain = self._get_report_domain(start_date, end_date)
+        if(self.include_details):
+            yield ['Name', 'Order', 'Date', 'State', 'Commission']
+            for line in self._get_report_detail_lines(domain):
+                yield [line['name'], line['order'], str(line['date']), line['state'], line['commission']]
+        else:
+            yield ['Name', 'Period', 'State', 'Count', 'Commission']
+            for rollup in self._get_report_rollups(domain):
+                yield [rollup['name'], rollup['period'], rollup['state'], rollup['count'], rollup['commission']]
+
+    def action_export_csv(self):
+        return self._action_export('csv')
+
+    def action_export_xlsx(self):
+        return self._action_export('xlsx')
+
+    def _action_export(self, file_format):
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_url',
+            'url': '/pos_sales_commission/report/export/%s/%s' % (self.id, file_format),
+            'target': 'self',
+        }
@@ -27,6 +27,25 @@ class HrEmployeePrivate(models.Model):
         help='Total number of commissions for this employee'
     )
 
+    @api.model
+    def _get_commission_employee_domain(self, company):
+        return [
+            ('is_commission_applicable', '=', True),
+            ('is_veterinarian', '=', True),
+            ('company_id', '=', company.id),
+        ]
+
+    @api.model
+    def _get_commission_employees_version(self, company):
+        """Cache key of the commission employee list of ``company``.
+
+        Any create, edit, archive or unlink of an eligible employee changes
+        either the count or the latest write_date.
+        """
+        [(count, last_write)] = self._read_group(
+            self._get_commission_employee_domain(company), [], ['__count', 'write_date:max'])
+        return '%s-%s-%s' % (company.id, count, last_write and fields.Datetime.to_string(last_write) or '')
+
     def action_view_commissions(self):
         """Open commissions for this employee"""
         self.ensure_one()
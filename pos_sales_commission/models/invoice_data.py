@@ -23,3 +23,19 @@ class InvoiceData(models.TransientModel):
         if(self.start_date and self.end_date):
             if(self.end_date < self.end_date):
                 raise ValidationError('Start Date Cannot be smaller than End Date')
+
+    def create_invoice(self):
+        """Invoice all confirmed commissions of the period in bulk."""
+        domain = [('state', '=', 'confirm'),
+                  ('create_date', '>=', self.start_date),
+                  ('create_date', '<=', self.end_date)]
+        if(self.report_of == 'employee'):
+            domain.append(('employee_id', '!=', False))
+            if(self.employee_id):
+                domain.append(('employee_id', '=', self.employee_id.id))
+        else:
+            domain.append(('employee_id', '=', False))
+            if(self.user_id):
+                domain.append(('user_id', '=', self.user_id.id))
+        commissions = self.env['pos.commission'].search(domain)
+        return commissions.action_invoice_all_confirmed()
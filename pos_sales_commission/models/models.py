@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
+import bisect
+from collections import defaultdict
 from datetime import date
 
-from odoo import _, api, fields, models
+from odoo import _, api, fields, models, tools
 from odoo.exceptions import ValidationError
 from odoo.tools import float_repr
 
@@ -31,86 +33,156 @@ class PosSaleCommission(models.Model):
             if(self.end_date < self.end_date):
                 raise ValidationError('Start Date Cannot be smaller than End Date')
 
-        if(self.commission_rule == 'amount'):
-            if(len(self.cart_amount_commission_ids) > 1):
-                for line1 in self.cart_amount_commission_ids:
-                    for line2 in self.cart_amount_commission_ids:
-                        if(line1.id != line2.id):
-                            flag = 0
-                            if(line2.cart_amount_from < line1.cart_amount_from and line2.cart_amount_from < line1.cart_amount_to and line2.cart_amount_to < line1.cart_amount_to and line2.cart_amount_to < line1.cart_amount_from):
-                                flag+=1
-                            elif(line2.cart_amount_from > line1.cart_amount_from and line2.cart_amount_from > line1.cart_amount_to and line2.cart_amount_to > line1.cart_amount_to and line2.cart_amount_to > line1.cart_amount_from):
-                                flag+=1
-                            
-                            if(not flag):
-                                raise ValidationError('There is some overlapping in the Rule. Please Check and re-assign the Rules.')
+        for commission in self.filtered(lambda c: c.commission_rule == 'amount'):
+            intervals = sorted(
+                (rule.cart_amount_from, rule.cart_amount_to)
+                for rule in commission.cart_amount_commission_ids
+            )
+            # Sorted by start, rules are disjoint iff each one ends strictly
+            # before the next one starts.
+            for (prev_from, prev_to), (next_from, next_to) in zip(intervals, intervals[1:]):
+                if prev_to >= next_from:
+                    raise ValidationError('There is some overlapping in the Rule. Please Check and re-assign the Rules.')
 
     def compute_commission(self, product, price_unit, qty,commission_id):
         if(product and price_unit and qty and commission_id):
-            commission = self.search([('id', '=', commission_id)])
-            product = self.env['product.product'].search([('id', '=', product)])
-
-            if(commission and commission.active):
-                is_commission_applicable = True
-                if(commission.start_date and commission.end_date):
-                    current_date = date.today()
-                    if(current_date >= commission.start_date and current_date <= commission.end_date):
-                        is_commission_applicable = True
-                    else:
-                        is_commission_applicable = False
-
-                if (is_commission_applicable):
-                    apply_commission_line_id = None
-                    if(commission.commission_rule == 'rule'):
-                        if(commission.commission_line_ids):
-                            for line in commission.commission_line_ids:
-                                if(line.apply_on == '3_all'):
-                                    apply_commission_line_id = line.id
-                                elif(line.apply_on == '2_categories'):
-                                    if (product.categ_id.parent_id):
-                                        parent_path_list = list(map(int, list(value for value in list(product.categ_id.parent_path.split("/")) if value)))
-                                        if line.categ_id.id in parent_path_list:
-                                            apply_commission_line_id = line.id
-                                    else:
-                                        if(product.categ_id == line.categ_id):
-                                            apply_commission_line_id = line.id
-                                elif(line.apply_on == '1_products'):
-                                    if(product.id == line.product_id.id):
-                                        apply_commission_line_id = line.id
-                        
-                                if(apply_commission_line_id):
-                                    commission_detail = self.env['pos.sale.commission.line'].search([('id', '=', apply_commission_line_id)])
-                                    if(commission_detail):
-                                        if(qty >= commission_detail.min_qty):
-                                            if(commission_detail.compute_commision == 'percentage'):
-                                                commission_amount = ((price_unit*qty)*commission_detail.percent_commission)/100 
-                                                return commission_amount
-                                            else:
-                                                commission_amount = (int(qty)*commission_detail.fixed_commission)
-                                                return commission_amount
+            commission = self.browse(commission_id).exists()
+            if not commission:
+                return 0
+            product = self.env['product.product'].browse(product)
+            return commission._compute_commission_for_product(product, price_unit, qty)
+
+    def write(self, vals):
+        res = super().write(vals)
+        self._touch_compiled_rules()
+        return res
+
+    def _touch_compiled_rules(self):
+        """Give the commissions a fresh write_date, the key of their compiled rules.
+
+        Line and cart amount rule changes do not touch the commission itself,
+        and the ORM write_date is the transaction start time, so the statement
+        clock is used: every change gets a distinct key and stale cache
+        entries are simply never looked up again.
+        """
+        if not self.ids:
+            return
+        self.env.flush_all()
+        self.env.cr.execute(
+            "UPDATE pos_sale_commission SET write_date = clock_timestamp() AT TIME ZONE 'UTC' WHERE id IN %s",
+            [tuple(self.ids)],
+        )
+        self.invalidate_recordset(['write_date'])
+
+    def _is_commission_applicable_today(self, compiled):
+        if not compiled['active']:
+            return False
+        if compiled['start_date'] and compiled['end_date']:
+            return compiled['start_date'] <= date.today() <= compiled['end_date']
+        return True
+
+    @tools.ormcache('commission_id', 'write_date')
+    def _get_compiled_commission_rules(self, commission_id, write_date):
+        """Compile the product rules of a commission into lookup maps.
+
+        Rules keep the order of pos.sale.commission.line (products, then
+        categories, then all products); each rule is
+        (index, min_qty, compute_commision, percent_commission, fixed_commission).
+        Cart amount rules are kept sorted by cart_amount_from for bisection;
+        each is (from, to, compute_commision, percent_commission, fixed_commission).
+        """
+        commission = self.browse(commission_id).exists()
+        if not commission:
+            return None
+        by_product = defaultdict(list)
+        by_categ = defaultdict(list)
+        catch_all = []
+        for index, line in enumerate(commission.commission_line_ids):
+            rule = (index, line.min_qty, line.compute_commision,
+                    line.percent_commission, line.fixed_commission)
+            if line.apply_on == '1_products':
+                by_product[line.product_id.id].append(rule)
+            elif line.apply_on == '2_categories':
+                by_categ[line.categ_id.id].append(rule)
+            else:
+                catch_all.append(rule)
+        amount_rules = tuple(sorted(
+            (rule.cart_amount_from, rule.cart_amount_to, rule.compute_commision,
+             rule.percent_commission, rule.fixed_commission)
+            for rule in commission.cart_amount_commission_ids
+        ))
+        return {
+            'active': commission.active,
+            'start_date': commission.start_date,
+            'end_date': commission.end_date,
+            'commission_rule': commission.commission_rule,
+            'by_product': {k: tuple(v) for k, v in by_product.items()},
+            'by_categ': {k: tuple(v) for k, v in by_categ.items()},
+            'catch_all': tuple(catch_all),
+            'amount_starts': [rule[0] for rule in amount_rules],
+            'amount_rules': amount_rules,
+        }
+
+    def _get_compiled_commission(self):
+        self.ensure_one()
+        return self._get_compiled_commission_rules(self.id, str(self.write_date))
+
+    def _compute_commission_for_product(self, product, price_unit, qty, compiled=None):
+        """Commission of one sold line, resolved from the compiled rules.
+
+        Same result as the historical line scan: the first rule (in
+        commission line order) matching the product, one of its category
+        ancestors or all products, whose min_qty is reached.
+        """
+        if not (product and price_unit and qty):
+            return 0.0
+        compiled = compiled or self._get_compiled_commission()
+        if not compiled or compiled['commission_rule'] != 'rule':
+            return 0.0
+        if not self._is_commission_applicable_today(compiled):
+            return 0.0
+
+        categ_ids = [int(c) for c in (product.categ_id.parent_path or '').split('/') if c]
+        candidates = list(compiled['by_product'].get(product.id, ()))
+        for categ_id in categ_ids:
+            candidates.extend(compiled['by_categ'].get(categ_id, ()))
+        candidates.extend(compiled['catch_all'])
+
+        for _index, min_qty, compute, percent, fixed in sorted(candidates):
+            if qty >= min_qty:
+                if compute == 'percentage':
+                    return ((price_unit * qty) * percent) / 100
+                return int(qty) * fixed
+        return 0.0
 
     def compute_commission_based_on_amount(self, amount_total, commission_id):
         if(amount_total and commission_id):
-            commission = self.search([('id', '=', commission_id)])
-            if(commission and commission.active and (commission.commission_rule == 'amount')): 
-                is_commission_applicable = True
-                if(commission.start_date and commission.end_date):
-                    current_date = date.today()
-                    if(current_date >= commission.start_date and current_date <= commission.end_date):
-                        is_commission_applicable = True
-                    else:
-                        is_commission_applicable = False
-                if(is_commission_applicable):      
-                    cart_rules = self.env['cart.amount.rule'].search([('pos_commission_id', '=', commission_id)])
-                    for rule in cart_rules:
-                        if(amount_total >= rule.cart_amount_from and amount_total <= rule.cart_amount_to):
-                            if(rule.compute_commision == 'percentage'):
-                                commission_amount = (amount_total*rule.percent_commission)/100 
-                                return commission_amount
-                            else:
-                                commission_amount = (rule.fixed_commission)
-                                return commission_amount
-                    
+            commission = self.browse(commission_id).exists()
+            if not commission:
+                return 0
+            return commission._compute_commission_for_amount(amount_total)
+
+    def _compute_commission_for_amount(self, amount_total, compiled=None):
+        """Commission of a cart total, looked up by bisection in the
+        compiled (sorted, disjoint) cart amount intervals."""
+        if not amount_total:
+            return 0.0
+        compiled = compiled or self._get_compiled_commission()
+        if not compiled or compiled['commission_rule'] != 'amount':
+            return 0.0
+        if not self._is_commission_applicable_today(compiled):
+            return 0.0
+
+        position = bisect.bisect_right(compiled['amount_starts'], amount_total) - 1
+        if position < 0:
+            return 0.0
+        amount_from, amount_to, compute, percent, fixed = compiled['amount_rules'][position]
+        if amount_total > amount_to:
+            return 0.0
+        if compute == 'percentage':
+            return (amount_total * percent) / 100
+        return fixed
+
 class CartAmountRuleList(models.Model):
     _name = 'cart.amount.rule'
     _description = "Cart Amount Rule List"
@@ -129,6 +201,24 @@ class CartAmountRuleList(models.Model):
     percent_commission = fields.Float('Percentage Commission')
     commission = fields.Char('Commissions', compute='_get_cart_amount_rule_commission')
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records.pos_commission_id._touch_compiled_rules()
+        return records
+
+    def write(self, vals):
+        commissions = self.pos_commission_id
+        res = super().write(vals)
+        (commissions | self.pos_commission_id)._touch_compiled_rules()
+        return res
+
+    def unlink(self):
+        commissions = self.pos_commission_id
+        res = super().unlink()
+        commissions.exists()._touch_compiled_rules()
+        return res
+
     @api.constrains('cart_amount_from', 'cart_amount_to')
     def check_constrains(self):
         for data in self:
@@ -237,3 +327,21 @@ class PosSaleCommissionLine(models.Model):
             self.percent_commission = 0.0
 
     commission_id =  fields.Many2one('pos.sale.commission', string='Commission')
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records.commission_id._touch_compiled_rules()
+        return records
+
+    def write(self, vals):
+        commissions = self.commission_id
+        res = super().write(vals)
+        (commissions | self.commission_id)._touch_compiled_rules()
+        return res
+
+    def unlink(self):
+        commissions = self.commission_id
+        res = super().unlink()
+        commissions.exists()._touch_compiled_rules()
+        return res
@@ -51,6 +51,22 @@ class PosCommission(models.Model):
             else:
                 commission.product_id = False
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        Ledger = self.env['pos.commission.ledger']
+        Ledger._apply_ledger_delta({}, Ledger._get_ledger_contributions(records))
+        return records
+
+    def write(self, vals):
+        if(not set(vals) & {'state', 'commission_amount', 'employee_id', 'user_id'}):
+            return super().write(vals)
+        Ledger = self.env['pos.commission.ledger']
+        before = Ledger._get_ledger_contributions(self)
+        result = super().write(vals)
+        Ledger._apply_ledger_delta(before, Ledger._get_ledger_contributions(self))
+        return result
+
     def action_confirm(self):
         self.state = 'confirm'
         return True
@@ -237,7 +253,72 @@ class PosCommission(models.Model):
                         self.state = 'invoice'
                         self.move_id = invoice.id
 
+    def _get_invoice_partner(self):
+        """Partner to invoice: the employee's work contact, else the user's partner."""
+        self.ensure_one()
+        if(self.employee_id):
+            return self.employee_id.work_contact_id or self.employee_id.user_id.partner_id
+        return self.user_id.partner_id
+
+    def action_invoice_all_confirmed(self):
+        """Invoice every confirmed commission of ``self`` in bulk.
+
+        Commissions are grouped per employee (or per user for user-only
+        commissions); all invoices are created with a single
+        account.move.create(vals_list) and each group is linked with one write.
+        """
+        commissions = self.filtered(lambda c: c.state == 'confirm')
+        if(not commissions):
+            raise ValidationError('There are no confirmed commissions to invoice.')
+
+        groups = {}
+        for commission in commissions:
+            key = ('employee', commission.employee_id.id) if commission.employee_id else ('user', commission.user_id.id)
+            groups.setdefault(key, self.browse())
+            groups[key] |= commission
+
+        move_vals_list = []
+        group_records = []
+        skipped = []
+        today = fields.Datetime.now().date()
+        for group in groups.values():
+            partner = group[0]._get_invoice_partner()
+            if(not partner):
+                skipped.append(group[0].name)
+                continue
+            move_vals_list.append({
+                'move_type': 'out_invoice',
+                'partner_id': partner.id,
+                'invoice_date': today,
+                'invoice_line_ids': [[0, 0, {
+                    'name': 'Commission',
+                    'quantity': 1,
+                    'price_unit': commission.commission_amount,
+                    'product_id': commission.order_id.config_id.commission_product_id.id,
+                    'pos_commission_id': commission.id,
+                }] for commission in group],
+            })
+            group_records.append(group)
+        if(skipped):
+            raise ValidationError(
+                'No partner found to invoice the commissions of: %s' % ', '.join(skipped))
+
+        invoices = self.env['account.move'].with_context(
+            default_move_type='out_invoice').create(move_vals_list)
+        for group, invoice in zip(group_records, invoices):
+            group.write({'state': 'invoice', 'move_id': invoice.id})
+
+        return {
+            'name': 'Commission Invoices',
+            'type': 'ir.actions.act_window',
+            'res_model': 'account.move',
+            'view_mode': 'list,form',
+            'domain': [('id', 'in', invoices.ids)],
+        }
+
     def unlink(self):
+        Ledger = self.env['pos.commission.ledger']
+        Ledger._apply_ledger_delta(Ledger._get_ledger_contributions(self), {})
         if(len(self) != 1):
             for record in self:
                 if(record.state == 'invoice' or record.state == 'paid'):
@@ -1,5 +1,4 @@
 # -*- coding: utf-8 -*-
-import json
 import logging
 
 from odoo import api, fields, models
@@ -28,6 +27,9 @@ class PosOrder(models.Model):
     commission_employee_name = fields.Char(string='Commission Employee Name', readonly=True)
     
     is_commission = fields.Boolean(string='Is Commission')
+    commission_pending = fields.Boolean(
+        string='Commission Pending', index=True, copy=False, readonly=True,
+        help='Set at order sync; commissions are generated in batches by a scheduled action.')
     is_multiple_invoice_enable = fields.Boolean(
         string='Use Hr Employee Config', compute='_compute_is_multiple_invoice_enable')
     commission_count = fields.Integer(
@@ -41,38 +43,29 @@ class PosOrder(models.Model):
 
     @api.model
     def _process_order(self, order, draft, *args, **kwargs):
-        """Override to add commission processing"""
-        _logger.info("=" * 80)
-        _logger.info("=== COMMISSION PROCESSING START ===")
-        _logger.info("=" * 80)
-        
+        """Override to record the commission intent of the synced order.
+
+        Commissions themselves are generated later, in batches, by
+        _cron_process_pending_commissions so the POS sync request stays
+        light when terminals upload offline backlogs.
+        """
         # Clean invalid relational fields
         if isinstance(order, dict):
             invalid_keys = [key for key in list(order.keys()) if key.startswith('<-')]
             if invalid_keys:
-                _logger.info(f"Removing invalid relational keys: {invalid_keys}")
+                _logger.debug("Removing invalid relational keys: %s", invalid_keys)
                 for key in invalid_keys:
                     order.pop(key, None)
-        
+
         # Extract commission data before parent processes the order
         commission_data = self._extract_commission_data(order)
-        
-        # Call parent to create the order
-        _logger.info("Calling super()._process_order()...")
+
         order_id = super()._process_order(order, draft, *args, **kwargs)
-        _logger.info(f"✓ Order created with ID: {order_id}")
-        
         if not order_id:
-            _logger.error("✗ Order creation failed")
-            _logger.info("=" * 80)
+            _logger.error("POS order creation failed, no commission recorded")
             return order_id
-        
-        # Process commission if applicable
-        self._process_commission(order_id, commission_data, order)
-        
-        _logger.info("=" * 80)
-        _logger.info("=== COMMISSION PROCESSING END ===")
-        _logger.info("=" * 80)
+
+        self._record_commission_intent(order_id, commission_data)
         return order_id
 
     def _extract_commission_data(self, order):
@@ -100,254 +93,202 @@ class PosOrder(models.Model):
             except (ValueError, TypeError):
                 commission_employee_id = None
         
-        result = {
+        return {
             'is_commission': is_commission,
             'commission_employee_id': commission_employee_id,
             'commission_employee_name': commission_employee_name,
         }
-        
-        _logger.info(f"Extracted commission data: {result}")
-        return result
 
-    def _process_commission(self, order_id, commission_data, order):
-        """Process commission for an order"""
-        pos_order = self.browse(order_id)
-        
-        is_commission = commission_data.get('is_commission', False)
+    def _record_commission_intent(self, order_id, commission_data):
+        """Store the commission employee on the order and flag it as pending."""
         commission_employee_id = commission_data.get('commission_employee_id')
-        commission_employee_name = commission_data.get('commission_employee_name')
-        
-        # Save commission employee info to order
-        if commission_employee_id:
-            try:
-                pos_order.write({
-                    'commission_employee_id': commission_employee_id,
-                    'commission_employee_name': commission_employee_name,
-                    'is_commission': is_commission,
-                })
-                _logger.info(f"✓ Saved commission employee: {commission_employee_name} (ID: {commission_employee_id})")
-            except Exception as e:
-                _logger.error(f"✗ Error saving commission employee: {e}", exc_info=True)
-        
-        # Check if we should create commission
-        if not is_commission:
-            _logger.info("⚠ is_commission is False - skipping")
-            return
-        
         if not commission_employee_id:
-            _logger.warning("⚠ No commission_employee_id - skipping")
-            return
-        
-        # Verify employee
-        employee = self.env['hr.employee'].browse(commission_employee_id)
-        if not employee.exists():
-            _logger.error(f"✗ Employee {commission_employee_id} does not exist")
-            return
-        
-        if not employee.is_commission_applicable:
-            _logger.warning(f"⚠ Employee {employee.name} not commission applicable")
             return
-        
-        if not employee.is_veterinarian:
-            _logger.warning(f"⚠ Employee {employee.name} is not a veterinarian")
-            return
-        
-        _logger.info(f"✓ Creating commission for employee: {employee.name}")
-        
-        # Get commission configuration
-        commission_id = self.get_commission_config(order)
-        if not commission_id:
-            _logger.error("✗ No commission configuration found")
-            return
-        
-        commission_vals = self.env['pos.sale.commission'].browse([commission_id])
-        _logger.info(f"✓ Commission config: {commission_vals.name}, rule: {commission_vals.commission_rule}")
-        
-        # Get commission product
-        product = self.env['product.product'].search([('is_commission_product', '=', True)], limit=1)
-        if not product:
-            _logger.error("✗ No commission product found (is_commission_product = True)")
+        is_commission = bool(commission_data.get('is_commission'))
+        self.browse(order_id).write({
+            'commission_employee_id': commission_employee_id,
+            'commission_employee_name': commission_data.get('commission_employee_name'),
+            'is_commission': is_commission,
+            'commission_pending': is_commission,
+        })
+        if is_commission:
+            cron = self.env.ref(
+                'pos_sales_commission.ir_cron_process_pending_commissions',
+                raise_if_not_found=False)
+            if cron:
+                cron._trigger()
+
+    @api.model
+    def _cron_process_pending_commissions(self, batch_size=500):
+        """Generate the commissions of pending orders, one batch per run.
+
+        Orders of companies without a commission product stay pending and are
+        left out of the batch, so they neither block the queue nor lose their
+        commission; they are processed once the product is configured.
+        """
+        domain = [('commission_pending', '=', True)]
+        unconfigured = self.env['res.company'].search([]).filtered(
+            lambda company: not self._get_commission_settings(company)['commission_product'])
+        if unconfigured:
+            domain.append(('company_id', 'not in', unconfigured.ids))
+        orders = self.search(domain, limit=batch_size, order='id')
+        if not orders:
             return
-        
-        _logger.info(f"✓ Commission product: {product.name} (ID: {product.id})")
-        
-        # Get settings
-        auto_confirm = self.env['ir.default'].sudo()._get(
-            'res.config.settings', 'auto_confirm_at_order_validation')
-        
-        order_data = order.get('data', order)
-        partner = order_data.get('user_id')
-        
-        # Create commission
-        try:
-            if commission_vals.commission_rule == 'amount':
-                self._create_amount_based_commission(
-                    pos_order, employee, commission_vals, 
-                    product, partner, auto_confirm
-                )
-            else:
-                self._create_product_based_commission(
-                    pos_order, employee, commission_vals,
-                    product, partner, auto_confirm
-                )
-            _logger.info("✓ Commission created successfully")
-        except Exception as e:
-            _logger.error(f"✗ Error creating commission: {e}", exc_info=True)
+        orders._process_pending_commissions()
+        remaining = self.search_count(domain)
+        self.env['ir.cron']._notify_progress(done=len(orders), remaining=remaining)
 
-    def get_commission_config(self, order):
-        """Get commission configuration from POS session"""
-        order_data = order.get('data', order)
-        
-        if not order_data:
-            return None
-        
-        pos_session_id = order_data.get('session_id') or order_data.get('pos_session_id')
-        
-        if not pos_session_id:
-            _logger.warning(f"No session_id found in order")
-            return None
-        
-        session = self.env['pos.session'].search([('id', '=', pos_session_id)], limit=1)
-        
-        if not session:
-            _logger.warning(f"POS session {pos_session_id} not found")
-            return None
-        
-        if session and session.config_id and session.config_id.sale_commission_id:
-            _logger.info(f"✓ Commission config: {session.config_id.sale_commission_id.name}")
-            return session.config_id.sale_commission_id.id
-        
-        return None
+    def _process_pending_commissions(self):
+        """Create the commissions of ``self`` in bulk.
 
-    def _create_amount_based_commission(self, pos_order, employee, 
-                                       commission_config, commission_product, 
-                                       partner, auto_confirm):
-        """Create commission based on order amount"""
-        amount_total = pos_order.amount_total
-        commission_amount = commission_config.compute_commission_based_on_amount(
-            amount_total, commission_config.id)
-        
-        _logger.info(f"Amount-based commission: {commission_amount}")
-        
-        if commission_amount > 0:
-            # For amount-based, we don't have a specific product, use commission product
-            self._create_commission_record(
-                commission_product, commission_amount, partner, 
-                employee.id, pos_order.id, auto_confirm,
-                sold_product_id=commission_product.id  # Use commission product as sold product
-            )
+        Orders are grouped per company (settings and commission product are
+        read in that company, as at order sync) and then per session (one
+        commission config each). Every session is created with a single
+        create(vals_list) inside a savepoint; when it fails its orders are
+        retried one by one, and orders that still fail are logged and no
+        longer pending, so one bad order cannot block the queue. Orders of a
+        company without a commission product stay pending.
+        """
+        commissions = self.env['pos.commission']
+        failed = self.browse()
+        skipped = self.browse()
+        for company, company_orders in self.grouped(
+                lambda o: o.session_id.config_id.company_id).items():
+            settings = self._get_commission_settings(company)
+            if not settings['commission_product']:
+                _logger.error(
+                    "No commission product found (is_commission_product = True) for company %s",
+                    company.name)
+                skipped |= company_orders
+                continue
+            for session, orders in company_orders.grouped('session_id').items():
+                orders = orders.with_company(company)
+                try:
+                    with self.env.cr.savepoint():
+                        commissions |= orders._create_session_commissions(session, settings)
+                    continue
+                except Exception:
+                    _logger.warning(
+                        "Commission batch of session %s failed, retrying per order",
+                        session.name, exc_info=True)
+                for pos_order in orders:
+                    try:
+                        with self.env.cr.savepoint():
+                            commissions |= pos_order._create_session_commissions(session, settings)
+                    except Exception:
+                        _logger.exception(
+                            "Could not create the commission of POS order %s", pos_order.name)
+                        failed |= pos_order
 
-    def _create_product_based_commission(self, pos_order, employee,
-                                        commission_config, commission_product,
-                                        partner, auto_confirm):
-        """Create commission based on products"""
-        create_commission_mode = self.env['ir.default'].sudo()._get(
-            'res.config.settings', 'create_commission')
-        
-        lines = pos_order.lines
-        if not lines:
-            _logger.warning("⚠ No order lines found")
-            return
-        
-        _logger.info(f"Processing {len(lines)} lines, mode: {create_commission_mode}")
-        
-        if create_commission_mode == 'multiple':
-            # Separate commission for each line
-            for line in lines:
-                commission_amount = commission_config.compute_commission(
-                    line.product_id.id, line.price_unit, line.qty, commission_config.id
-                )
-                
-                if commission_amount > 0:
-                    self._create_commission_record(
-                        commission_product, commission_amount, partner,
-                        employee.id, pos_order.id, auto_confirm,
-                        sold_product_id=line.product_id.id  # Pass the actual sold product
-                    )
-        else:
-            # Single commission for all lines
-            self._create_single_commission(
-                lines, pos_order.id, employee.id, partner, 
-                commission_config, auto_confirm
-            )
+        (self - skipped).write({'commission_pending': False})
+        _logger.info(
+            "Processed %d pending POS order(s): %d commission(s) created, %d failed, %d left pending",
+            len(self - skipped), len(commissions), len(failed), len(skipped))
+        return commissions
 
-    def _create_single_commission(self, lines, order_id, employee_id,
-                                  partner, commission_config, auto_confirm):
-        """Create a single commission record for all lines"""
-        val_line = []
-        total_commission_amount = 0.0
-        
-        for line in lines:
-            commission_amount = commission_config.compute_commission(
-                line.product_id.id, line.price_unit, line.qty, commission_config.id
+    @api.model
+    def _get_commission_settings(self, company):
+        """Commission settings and product of ``company``"""
+        IrDefault = self.env['ir.default'].sudo()
+        return {
+            'auto_confirm': IrDefault._get(
+                'res.config.settings', 'auto_confirm_at_order_validation',
+                company_id=company.id),
+            'create_commission_mode': IrDefault._get(
+                'res.config.settings', 'create_commission', company_id=company.id),
+            'commission_product': self.env['product.product'].with_company(company).search(
+                [('is_commission_product', '=', True),
+                 ('company_id', 'in', [False, company.id])], limit=1),
+        }
+
+    def _create_session_commissions(self, session, settings):
+        """Create the commissions of the orders ``self`` of ``session``"""
+        commission_config = session.config_id.sale_commission_id
+        if not commission_config:
+            return self.env['pos.commission']
+        compiled = commission_config._get_compiled_commission()
+        vals_list = []
+        for pos_order in self:
+            employee = pos_order.commission_employee_id
+            if not (pos_order.is_commission and employee
+                    and employee.is_commission_applicable
+                    and employee.is_veterinarian):
+                continue
+            vals_list.extend(pos_order._prepare_commission_vals_list(
+                commission_config, compiled, settings['commission_product'],
+                settings['create_commission_mode']))
+        if settings['auto_confirm']:
+            for vals in vals_list:
+                vals['state'] = 'confirm'
+        return self.env['pos.commission'].create(vals_list)
+
+    def _prepare_commission_vals_list(self, commission_config, compiled,
+                                      commission_product, create_commission_mode):
+        """Return the pos.commission vals for this order"""
+        self.ensure_one()
+        employee_id = self.commission_employee_id.id
+        partner = self.user_id.id
+
+        if commission_config.commission_rule == 'amount':
+            commission_amount = commission_config._compute_commission_for_amount(
+                self.amount_total, compiled=compiled)
+            if commission_amount > 0:
+                # For amount-based, we don't have a specific product, use commission product
+                return [self._prepare_single_line_commission_vals(
+                    commission_product.id, commission_amount, partner, employee_id)]
+            return []
+
+        line_amounts = []
+        for line in self.lines:
+            commission_amount = commission_config._compute_commission_for_product(
+                line.product_id, line.price_unit, line.qty, compiled=compiled
             )
-            
             if commission_amount > 0:
-                total_commission_amount += commission_amount
-                val_line.append([0, 0, {
-                    'product_id': line.product_id.id,  # This is the SOLD product
-                    'commission_amount': commission_amount,
-                    'user_id': partner,
-                    'employee_id': employee_id,
-                    'order_id': order_id,
-                    'qty': line.qty,
-                    'price_unit': line.price_unit,
-                }])
-        
-        if total_commission_amount > 0:
-            vals = {
-                'user_id': partner,
-                'employee_id': employee_id,
-                'order_id': order_id,
-                'pos_commission_line_ids': val_line,
-                'commission_amount': total_commission_amount,
-            }
-            self._create_and_confirm_commission(vals, auto_confirm)
+                line_amounts.append((line, commission_amount))
 
-    def _create_commission_record(self, commission_product, commission_amount, partner,
-                                  employee_id, order_id, auto_confirm, sold_product_id=None):
-        """Create a single commission record
-        
-        Args:
-            commission_product: The product used for commission accounting
-            commission_amount: Amount of commission
-            sold_product_id: The actual product that was sold (for display)
-        """
-        # Use sold_product_id if provided, otherwise use commission_product
-        display_product_id = sold_product_id if sold_product_id else commission_product.id
-        
-        val_line = [[0, 0, {
-            'product_id': display_product_id,  # Use the SOLD product for display
-            'commission_amount': commission_amount,
+        if create_commission_mode == 'multiple':
+            # Separate commission for each line, showing the sold product
+            return [
+                self._prepare_single_line_commission_vals(
+                    line.product_id.id, commission_amount, partner, employee_id)
+                for line, commission_amount in line_amounts
+            ]
+
+        # Single commission for all lines
+        total_commission_amount = sum(amount for _line, amount in line_amounts)
+        if total_commission_amount <= 0:
+            return []
+        return [{
             'user_id': partner,
             'employee_id': employee_id,
-            'order_id': order_id,
-            'qty': 1,
-            'price_unit': commission_amount,
-        }]]
-        
-        vals = {
+            'order_id': self.id,
+            'pos_commission_line_ids': [[0, 0, {
+                'product_id': line.product_id.id,  # This is the SOLD product
+                'commission_amount': commission_amount,
+                'user_id': partner,
+                'employee_id': employee_id,
+                'order_id': self.id,
+                'qty': line.qty,
+                'price_unit': line.price_unit,
+            }] for line, commission_amount in line_amounts],
+            'commission_amount': total_commission_amount,
+        }]
+
+    def _prepare_single_line_commission_vals(self, display_product_id,
+                                             commission_amount, partner, employee_id):
+        """Vals of a commission with one line for ``display_product_id``"""
+        return {
             'user_id': partner,
             'employee_id': employee_id,
-            'order_id': order_id,
-            'pos_commission_line_ids': val_line,
+            'order_id': self.id,
+            'pos_commission_line_ids': [[0, 0, {
+                'product_id': display_product_id,
+                'commission_amount': commission_amount,
+                'user_id': partner,
+                'employee_id': employee_id,
+                'order_id': self.id,
+                'qty': 1,
+                'price_unit': commission_amount,
+            }]],
             'commission_amount': commission_amount,
         }
-        
-        self._create_and_confirm_commission(vals, auto_confirm)
-
-    def _create_and_confirm_commission(self, vals, auto_confirm):
-        """Create and optionally confirm commission"""
-        try:
-            commission = self.env['pos.commission'].create([vals])
-            
-            if commission:
-                _logger.info(f"✓✓✓ Commission created: ID {commission.id}")
-                
-                if auto_confirm:
-                    commission.state = "confirm"
-                    _logger.info("✓ Commission auto-confirmed")
-            else:
-                _logger.error("✗ Failed to create commission")
-        except Exception as e:
-            _logger.error(f"✗ Exception creating commission: {e}", exc_info=True)
@@ -10,39 +10,40 @@ class PosSession(models.Model):
         return result
 
     def _loader_params_hr_employee(self):
+        # Keep the standard domain (same company / configured employees);
+        # commission employees are served separately by get_commission_employees.
         result = super()._loader_params_hr_employee()
-        # Add is_veterinarian field
         result["search_params"]["fields"].extend([
-            "is_commission_applicable", 
+            "is_commission_applicable",
             "job_title",
             "is_veterinarian",
             "company_id"
         ])
-        # Remove domain filter to load ALL employees, we'll filter in frontend
-        if "domain" in result["search_params"]:
-            result["search_params"]["domain"] = []
         return result
-    
-    def _pos_data_process(self, loaded_data):
-        """Add commission employees to POS data"""
-        super()._pos_data_process(loaded_data)
-        
-        # Get current session's company
-        current_company_id = self.config_id.company_id.id if self.config_id else self.env.company.id
-        
-        # Load commission-applicable veterinarian employees from same company
-        commission_employees = self.env['hr.employee'].search_read(
-            domain=[
-                ('is_commission_applicable', '=', True),
-                ('is_veterinarian', '=', True),
-                ('company_id', '=', current_company_id)
-            ],
+
+    def _get_commission_company(self):
+        return self.config_id.company_id if self.config_id else self.env.company
+
+    def get_commission_employees(self, known_version=None):
+        """Return the commission-eligible employees of the session company.
+
+        Called by the employee selection popup with the version of its
+        browser cache. When ``known_version`` matches the current version the
+        list is omitted, so a terminal reopening with an up to date cache
+        downloads nothing.
+        """
+        self.ensure_one()
+        Employee = self.env['hr.employee']
+        company = self._get_commission_company()
+        version = Employee._get_commission_employees_version(company)
+        if(known_version == version):
+            return {'version': version, 'employees': None}
+        employees = Employee.search_read(
+            domain=Employee._get_commission_employee_domain(company),
             fields=['name', 'id', 'is_commission_applicable', 'job_title', 'is_veterinarian', 'company_id']
         )
-        
-        # Add to loaded data
-        loaded_data['commission_employees'] = commission_employees
-        
+        return {'version': version, 'employees': employees}
+
     def _pos_ui_models_to_load(self):
         """Ensure hr.employee is in the models to load"""
         result = super()._pos_ui_models_to_load()
@@ -4,6 +4,26 @@ import { usePos } from "@point_of_sale/app/store/pos_hook";
 import { Component, useState, onWillStart } from "@odoo/owl";
 import { useService } from "@web/core/utils/hooks";
 
+// The commission employee list is cached per company in the browser and only
+// downloaded again when the server reports a different version.
+const EMPLOYEES_CACHE_KEY = "pos_sales_commission.commission_employees";
+
+function readEmployeesCache(companyId) {
+  try {
+    return JSON.parse(localStorage.getItem(`${EMPLOYEES_CACHE_KEY}.${companyId}`));
+  } catch {
+    return null;
+  }
+}
+
+function writeEmployeesCache(companyId, cache) {
+  try {
+    localStorage.setItem(`${EMPLOYEES_CACHE_KEY}.${companyId}`, JSON.stringify(cache));
+  } catch (error) {
+    console.warn("Could not cache commission employees:", error);
+  }
+}
+
 export class EmployeeSelectionPopup extends Component {
   static template = "pos_sales_commission.EmployeeSelectionPopup";
   static components = { Dialog };
@@ -26,36 +46,32 @@ export class EmployeeSelectionPopup extends Component {
   }
 
   async loadEmployees() {
+    const companyId = this.pos.company.id;
+    const cache = readEmployeesCache(companyId);
     try {
-      console.log("Loading employees via RPC...");
-      console.log("Current company ID:", this.pos.company.id);
-
-      // Fetch commission-applicable veterinarian employees from same company
-      const employees = await this.orm.searchRead(
-        "hr.employee",
-        [
-          ["is_commission_applicable", "=", true],
-          ["is_veterinarian", "=", true],
-          ["company_id", "=", this.pos.company.id],
-        ],
-        [
-          "id",
-          "name",
-          "is_commission_applicable",
-          "is_veterinarian",
-          "job_title",
-          "company_id",
-        ],
+      // Commission-applicable veterinarian employees of the session company;
+      // the server omits the list when our cached version is still current
+      const result = await this.orm.call(
+        "pos.session",
+        "get_commission_employees",
+        [[this.pos.session.id], cache?.version || null],
       );
 
-      console.log("Loaded employees:", employees);
+      let employees;
+      if (result.employees === null && cache) {
+        employees = cache.employees;
+      } else {
+        employees = result.employees || [];
+        writeEmployeesCache(companyId, { version: result.version, employees });
+      }
+
       console.log("Total eligible employees:", employees.length);
 
       this.state.employees = employees;
       this.state.loading = false;
     } catch (error) {
       console.error("Error loading employees:", error);
-      this.state.employees = [];
+      this.state.employees = cache?.employees || [];
       this.state.loading = false;
     }
   }
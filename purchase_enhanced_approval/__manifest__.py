@@ -28,10 +28,13 @@
         'security/security_rules.xml',
         'security/ir.model.access.csv',
         'data/approval_sequence.xml',
+        'data/ir_cron_data.xml',
         'views/purchase_requisition_views.xml',
         'views/purchase_order_views.xml',
         'views/product_category_views.xml',
         'views/pr_export_import_wizard_views.xml',
+        'views/pr_import_result_views.xml',
+        'views/approval_inbox_views.xml',
     ],
     'demo': [],
     'installable': True,
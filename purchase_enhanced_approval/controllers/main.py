@@ -0,0 +1,51 @@
+import csv
+import io
+import tempfile
+
+from werkzeug.wsgi import wrap_file
+
+from odoo import api, http
+from odoo.http import request
+
+from ..models.pr_export_import_wizard import EXPORT_MIMETYPES
+
+
+class PurchaseApprovalExport(http.Controller):
+
+    @http.route('/purchase_enhanced_approval/export/<int:wizard_id>/<string:file_format>',
+                type='http', auth='user')
+    def export_requisitions(self, wizard_id, file_format, **kwargs):
+        wizard = request.env['purchase.approval.export.wizard'].browse(wizard_id).exists()
+        if not wizard or not wizard.approval_ids or file_format not in EXPORT_MIMETYPES:
+            return request.not_found()
+
+        filename = 'purchase_requisitions.%s' % file_format
+        headers = [
+            ('Content-Type', EXPORT_MIMETYPES[file_format]),
+            ('Content-Disposition', http.content_disposition(filename)),
+        ]
+
+        if file_format == 'csv':
+            # The response body is consumed after the request cursor is
+            # closed, so the generator reads the rows with its own cursor.
+            registry = request.env.registry
+            uid, context = request.env.uid, dict(request.env.context)
+
+            def generate():
+                with registry.cursor() as cr:
+                    env = api.Environment(cr, uid, context)
+                    buffer = io.StringIO()
+                    writer = csv.writer(buffer)
+                    for row in env['purchase.approval.export.wizard'].browse(wizard_id)._iter_export_rows():
+                        writer.writerow(row)
+                        yield buffer.getvalue().encode('utf-8')
+                        buffer.seek(0)
+                        buffer.truncate(0)
+            return request.make_response(generate(), headers=headers)
+
+        # XLSX needs the complete workbook before it can be sent: build it in
+        # a temporary file and stream that file back.
+        tmp = tempfile.TemporaryFile()
+        wizard._write_export_file(tmp, file_format)
+        tmp.seek(0)
+        return request.make_response(wrap_file(request.httprequest.environ, tmp), headers=headers)
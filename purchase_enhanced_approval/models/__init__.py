@@ -3,4 +3,6 @@ from . import purchase_order
 from . import product_category
 from . import approval_config
 from . import approval_history
-from . import pr_export_import_wizard
\ No newline at end of file
+from . import pr_export_import_wizard
+from . import pr_import_result
+from . import approval_inbox
\ No newline at end of file
@@ -0,0 +1,90 @@
+from odoo import models, fields, tools
+
+
+class PurchaseApprovalInbox(models.Model):
+    """
+    Read-only "approval inbox": every Purchase Order and Purchase Requisition
+    waiting for an approver, gathered by one SQL view so an approver's pending
+    items (and the counts per approver) come from a single query.
+
+    Ids are made unique across both sources: POs get even ids, PRs odd ones.
+    """
+    _name = 'purchase.approval.inbox'
+    _description = 'Approval Inbox'
+    _auto = False
+    _order = 'date desc, id desc'
+
+    approver_id = fields.Many2one('res.users', string='Approver', readonly=True)
+    document_type = fields.Selection([
+        ('purchase_order', 'Purchase Order'),
+        ('purchase_approval', 'Purchase Requisition'),
+    ], string='Document Type', readonly=True)
+    name = fields.Char(string='Reference', readonly=True)
+    purchase_order_id = fields.Many2one('purchase.order', string='Purchase Order', readonly=True)
+    purchase_approval_id = fields.Many2one('purchase.approval', string='Purchase Requisition', readonly=True)
+    approval_level = fields.Integer(string='Approval Level', readonly=True)
+    department_id = fields.Many2one('hr.department', string='Department', readonly=True)
+    partner_id = fields.Many2one('res.partner', string='Vendor', readonly=True)
+    company_id = fields.Many2one('res.company', string='Company', readonly=True)
+    currency_id = fields.Many2one('res.currency', string='Currency', readonly=True)
+    amount_total = fields.Monetary(string='Total Amount', readonly=True)
+    date = fields.Datetime(string='Date', readonly=True)
+
+    def init(self):
+        tools.drop_view_if_exists(self.env.cr, self._table)
+        self.env.cr.execute("""
+            CREATE OR REPLACE VIEW %s AS (
+                SELECT po.id * 2                AS id,
+                       'purchase_order'         AS document_type,
+                       po.current_approver_id   AS approver_id,
+                       po.name                  AS name,
+                       po.id                    AS purchase_order_id,
+                       NULL::integer            AS purchase_approval_id,
+                       po.approval_level        AS approval_level,
+                       po.department_id         AS department_id,
+                       po.partner_id            AS partner_id,
+                       po.company_id            AS company_id,
+                       po.currency_id           AS currency_id,
+                       po.amount_total          AS amount_total,
+                       po.date_order            AS date
+                  FROM purchase_order po
+                 WHERE po.current_approver_id IS NOT NULL
+                   AND po.approval_level > 0
+                   AND po.state NOT IN ('purchase', 'done', 'cancel')
+                UNION ALL
+                SELECT pa.id * 2 + 1            AS id,
+                       'purchase_approval'      AS document_type,
+                       pa.approver_id           AS approver_id,
+                       pa.name                  AS name,
+                       NULL::integer            AS purchase_order_id,
+                       pa.id                    AS purchase_approval_id,
+                       1                        AS approval_level,
+                       pa.department_id         AS department_id,
+                       NULL::integer            AS partner_id,
+                       pa.company_id            AS company_id,
+                       NULL::integer            AS currency_id,
+                       NULL::numeric            AS amount_total,
+                       pa.date::timestamp       AS date
+                  FROM purchase_approval pa
+                 WHERE pa.approver_id IS NOT NULL
+                   AND pa.state = 'waiting_approval'
+            )
+        """ % self._table)
+
+    def action_open_document(self):
+        self.ensure_one()
+        record = self.purchase_order_id or self.purchase_approval_id
+        return {
+            'type': 'ir.actions.act_window',
+            'name': self.name,
+            'res_model': record._name,
+            'res_id': record.id,
+            'view_mode': 'form',
+        }
+
+    def action_approve_purchase_orders(self):
+        """Approve the selected POs at their current level in one go."""
+        orders = self.purchase_order_id
+        if orders:
+            orders.action_department_approve()
+        return True
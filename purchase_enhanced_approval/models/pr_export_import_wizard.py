@@ -1,17 +1,40 @@
 import csv
-import base64
 import io
+import tempfile
 
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
+from odoo.tools.misc import xlsxwriter
+
+EXPORT_HEADER = [
+    'pr_reference',
+    'date',
+    'requester_login',
+    'department',
+    'warehouse',
+    'product_reference',
+    'description',
+    'quantity',
+    'uom',
+]
+EXPORT_MIMETYPES = {
+    'csv': 'text/csv',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
 
 
 class PurchaseApprovalExportWizard(models.TransientModel):
     """
     Triggered from the gear ⚙ menu on the PR list view.
-    Exports selected (or all) PRs as a flat CSV — one row per product line,
-    repeating the PR header columns on every row so the file is self-contained
-    and can be re-imported without any manual preparation.
+    Exports selected (or all) PRs as a flat CSV or XLSX — one row per product
+    line, repeating the PR header columns on every row so the file is
+    self-contained and can be re-imported without any manual preparation.
+
+    Rows are produced by a generator that reads the PRs in batches (a few
+    batched reads per batch, never one query per record) and are written
+    straight to a temporary file, which is then stored as the download
+    attachment.  The same generator backs the streaming download
+    controller (controllers/main.py).
 
     Columns exported
     ----------------
@@ -31,12 +54,18 @@ class PurchaseApprovalExportWizard(models.TransientModel):
     _name = 'purchase.approval.export.wizard'
     _description = 'Export Purchase Requisitions'
 
+    _export_batch_size = 1000
+
     # Filled in by the server action via context
     approval_ids = fields.Many2many(
         'purchase.approval',
         string='Requests to Export',
     )
-    file_data = fields.Binary(string='Download File', readonly=True)
+    export_format = fields.Selection(
+        [('csv', 'CSV'), ('xlsx', 'XLSX')],
+        string='Format', default='csv', required=True,
+    )
+    attachment_id = fields.Many2one('ir.attachment', string='Export File', readonly=True)
     file_name = fields.Char(default='purchase_requisitions.csv')
     state = fields.Selection([('choose', 'Choose'), ('done', 'Done')], default='choose')
 
@@ -49,55 +78,137 @@ class PurchaseApprovalExportWizard(models.TransientModel):
             res['approval_ids'] = [(6, 0, active_ids)]
         return res
 
+    def unlink(self):
+        # The export files only live as long as their wizard
+        self.attachment_id.sudo().unlink()
+        return super().unlink()
+
+    # ── Row generator ───────────────────────────────────────────────────
+
+    def _get_export_approval_ids(self):
+        self.ensure_one()
+        if not self.approval_ids:
+            raise UserError(_('No Purchase Requisitions selected for export.'))
+        return self.env['purchase.approval'].search([('id', 'in', self.approval_ids.ids)], order='name').ids
+
+    def _iter_export_rows(self):
+        """Yield the header and then one list of values per exported line.
+
+        PRs are read ``_export_batch_size`` at a time with ``search_read``
+        and their lines, users, departments, warehouses, products and units
+        with one batched read each; names already seen are kept in small id
+        maps, so the number of queries does not grow with the number of lines.
+        """
+        approval_ids = self._get_export_approval_ids()
+        Approval = self.env['purchase.approval']
+        Line = self.env['purchase.approval.line']
+        maps = {
+            'res.users': ('login', {}),
+            'hr.department': ('name', {}),
+            'stock.warehouse': ('name', {}),
+            'uom.uom': ('name', {}),
+        }
+        products = {}
+
+        def resolve(model, ids):
+            fname, values = maps[model]
+            missing = list(set(ids) - set(values) - {False})
+            if missing:
+                for rec in self.env[model].browse(missing).read([fname]):
+                    values[rec['id']] = rec[fname] or ''
+            return values
+
+        yield list(EXPORT_HEADER)
+        for start in range(0, len(approval_ids), self._export_batch_size):
+            batch_ids = approval_ids[start:start + self._export_batch_size]
+            approvals = Approval.search_read(
+                [('id', 'in', batch_ids)],
+                ['name', 'date', 'requester_id', 'department_id', 'warehouse_id'],
+                order='name', load=None,
+            )
+            lines = Line.search_read(
+                [('approval_id', 'in', batch_ids)],
+                ['approval_id', 'product_id', 'quantity'],
+                order='approval_id, id', load=None,
+            )
+            lines_by_approval = {}
+            for line in lines:
+                lines_by_approval.setdefault(line['approval_id'], []).append(line)
+
+            users = resolve('res.users', [a['requester_id'] for a in approvals])
+            departments = resolve('hr.department', [a['department_id'] for a in approvals])
+            warehouses = resolve('stock.warehouse', [a['warehouse_id'] for a in approvals])
+
+            product_ids = list({line['product_id'] for line in lines} - set(products))
+            for product in self.env['product.product'].browse(product_ids):
+                # description is related to the product's display_name
+                products[product.id] = (
+                    product.default_code or product.display_name,
+                    product.display_name,
+                    product.uom_id.id,
+                )
+            uoms = resolve('uom.uom', [products[line['product_id']][2] for line in lines])
+
+            for pr in approvals:
+                base = [
+                    pr['name'],
+                    pr['date'].strftime('%Y-%m-%d') if pr['date'] else '',
+                    users.get(pr['requester_id'], ''),
+                    departments.get(pr['department_id'], ''),
+                    warehouses.get(pr['warehouse_id'], ''),
+                ]
+                pr_lines = lines_by_approval.get(pr['id'])
+                if pr_lines:
+                    for line in pr_lines:
+                        reference, description, uom_id = products[line['product_id']]
+                        yield base + [reference, description, line['quantity'], uoms.get(uom_id, '')]
+                else:
+                    # Export the PR header even if it has no lines yet
+                    yield base + ['', '', '', '']
+
+            # Keep memory flat on large exports
+            self.env.invalidate_all()
+
+    def _write_export_file(self, fileobj, export_format):
+        """Write all rows to the binary ``fileobj`` as CSV or XLSX."""
+        rows = self._iter_export_rows()
+        if export_format == 'xlsx':
+            workbook = xlsxwriter.Workbook(fileobj, {'constant_memory': True})
+            worksheet = workbook.add_worksheet('Requisitions')
+            bold = workbook.add_format({'bold': True})
+            for row_index, row in enumerate(rows):
+                worksheet.write_row(row_index, 0, row, bold if row_index == 0 else None)
+            workbook.close()
+        else:
+            text = io.TextIOWrapper(fileobj, encoding='utf-8', newline='', write_through=True)
+            csv.writer(text).writerows(rows)
+            text.detach()
+        fileobj.flush()
+
+    def _store_export_file(self, fileobj, file_name, export_format):
+        """ir.attachment holding the export written to ``fileobj``."""
+        fileobj.seek(0)
+        return self.env['ir.attachment'].sudo().create({
+            'name': file_name,
+            'res_model': self._name,
+            'res_id': self.id,
+            'mimetype': EXPORT_MIMETYPES[export_format],
+            'raw': fileobj.read(),
+        })
+
+    # ── Actions ─────────────────────────────────────────────────────────
+
     def action_export(self):
         self.ensure_one()
+        file_name = 'purchase_requisitions.%s' % self.export_format
 
-        approvals = self.approval_ids
-        if not approvals:
-            raise UserError(_('No Purchase Requisitions selected for export.'))
+        with tempfile.TemporaryFile() as tmp:
+            self._write_export_file(tmp, self.export_format)
+            attachment = self._store_export_file(tmp, file_name, self.export_format)
 
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        # Header row
-        writer.writerow([
-            'pr_reference',
-            'date',
-            'requester_login',
-            'department',
-            'warehouse',
-            'product_reference',
-            'description',
-            'quantity',
-            'uom',
-        ])
-
-        for pr in approvals.sorted('name'):
-            base = [
-                pr.name,
-                pr.date.strftime('%Y-%m-%d') if pr.date else '',
-                pr.requester_id.login if pr.requester_id else '',
-                pr.department_id.name if pr.department_id else '',
-                pr.warehouse_id.name if pr.warehouse_id else '',
-            ]
-            if pr.line_ids:
-                for line in pr.line_ids:
-                    product = line.product_id
-                    ref = product.default_code or product.display_name
-                    writer.writerow(base + [
-                        ref,
-                        line.description or '',
-                        line.quantity,
-                        line.product_uom_id.name if line.product_uom_id else '',
-                    ])
-            else:
-                # Export the PR header even if it has no lines yet
-                writer.writerow(base + ['', '', '', ''])
-
-        csv_bytes = output.getvalue().encode('utf-8')
         self.write({
-            'file_data': base64.b64encode(csv_bytes),
-            'file_name': 'purchase_requisitions.csv',
+            'attachment_id': attachment.id,
+            'file_name': file_name,
             'state': 'done',
         })
 
@@ -110,11 +221,30 @@ class PurchaseApprovalExportWizard(models.TransientModel):
             'target': 'new',
         }
 
+    def action_download(self):
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_url',
+            'url': '/web/content/%s?download=true' % self.attachment_id.id,
+            'target': 'self',
+        }
+
+    def action_stream_download(self):
+        """Download through the streaming controller, without storing a file."""
+        self.ensure_one()
+        self._get_export_approval_ids()
+        return {
+            'type': 'ir.actions.act_url',
+            'url': '/purchase_enhanced_approval/export/%s/%s' % (self.id, self.export_format),
+            'target': 'self',
+        }
+
 
 class PurchaseApprovalImportWizard(models.TransientModel):
     """
-    Accepts a CSV file in the same format produced by the export wizard.
-    Groups rows by pr_reference and creates one draft purchase.approval
+    Accepts a CSV (or XLSX) file in the same format produced by the export
+    wizard and hands it to the import engine (purchase.approval.import.result),
+    which groups rows by pr_reference and creates one draft purchase.approval
     per unique reference, with lines attached.
 
     Rules
@@ -126,243 +256,70 @@ class PurchaseApprovalImportWizard(models.TransientModel):
     * state      → always 'draft'
 
     If a pr_reference already exists in the database the rows are SKIPPED
-    and reported back to the user so nothing is duplicated.
+    and reported in the import result so nothing is duplicated.
+    Large files can be queued and imported in the background by a cron.
     """
     _name = 'purchase.approval.import.wizard'
     _description = 'Import Purchase Requisitions from CSV'
 
     file_data = fields.Binary(string='CSV File', required=True)
     file_name = fields.Char()
-    result_message = fields.Text(string='Import Result', readonly=True)
-    state = fields.Selection([('choose', 'Choose'), ('done', 'Done')], default='choose')
+    chunk_size = fields.Integer(
+        string='Batch Size', default=200,
+        help='Number of requisitions created (and committed, in background mode) per batch.')
+    run_in_background = fields.Boolean(
+        string='Import in Background',
+        help='Queue the file and import it with a scheduled action. Recommended for large files.')
+
+    def _get_upload_attachment(self):
+        """The attachment holding file_data, so the engine can read it from the filestore."""
+        return self.env['ir.attachment'].sudo().search([
+            ('res_model', '=', self._name),
+            ('res_field', '=', 'file_data'),
+            ('res_id', '=', self.id),
+        ], limit=1)
 
     def action_import(self):
         self.ensure_one()
 
         if not self.file_data:
             raise UserError(_('Please upload a CSV file first.'))
+        if self.chunk_size < 1:
+            raise UserError(_('The batch size must be at least 1.'))
 
-        raw = base64.b64decode(self.file_data)
-        try:
-            text = raw.decode('utf-8')
-        except UnicodeDecodeError:
-            text = raw.decode('latin-1')
-
-        reader = csv.DictReader(io.StringIO(text))
-
-        required_cols = {'pr_reference', 'department', 'product_reference', 'quantity'}
-        if not required_cols.issubset(set(reader.fieldnames or [])):
-            raise UserError(_(
-                'CSV is missing required columns.\n'
-                'Required: %s\nFound: %s'
-            ) % (', '.join(sorted(required_cols)),
-                 ', '.join(reader.fieldnames or [])))
-
-        # ── Build a dict: pr_reference → { header_info, lines: [...] }
-        grouped = {}
-        row_errors = []
-
-        for i, row in enumerate(reader, start=2):  # row 1 is the header
-            ref = (row.get('pr_reference') or '').strip()
-            if not ref:
-                row_errors.append(f'Row {i}: missing pr_reference, skipped.')
-                continue
-
-            if ref not in grouped:
-                grouped[ref] = {
-                    'date': row.get('date', '').strip(),
-                    'requester_login': row.get('requester_login', '').strip(),
-                    'department': row.get('department', '').strip(),
-                    'warehouse': row.get('warehouse', '').strip(),
-                    'lines': [],
-                }
-
-            product_ref = (row.get('product_reference') or '').strip()
-            qty_raw = (row.get('quantity') or '').strip()
-
-            # Skip empty-line rows (PR header with no products)
-            if not product_ref and not qty_raw:
-                continue
-
-            try:
-                qty = float(qty_raw) if qty_raw else 1.0
-            except ValueError:
-                row_errors.append(f'Row {i}: invalid quantity "{qty_raw}", defaulting to 1.')
-                qty = 1.0
-
-            grouped[ref]['lines'].append({
-                'product_ref': product_ref,
-                'description': (row.get('description') or '').strip(),
-                'quantity': qty,
+        result = self.env['purchase.approval.import.result'].create({
+            'name': self.file_name or 'purchase_requisitions.csv',
+            'chunk_size': self.chunk_size,
+        })
+        # Keep a copy of the upload on the result: the wizard is transient and
+        # the copy shares the filestore file instead of duplicating the data.
+        upload = self._get_upload_attachment()
+        if upload:
+            attachment = upload.copy({
+                'name': result.name,
+                'res_model': result._name,
+                'res_field': False,
+                'res_id': result.id,
             })
+        else:
+            attachment = self.env['ir.attachment'].create({
+                'name': result.name,
+                'datas': self.file_data,
+                'res_model': result._name,
+                'res_id': result.id,
+            })
+        result.attachment_id = attachment
 
-        if not grouped:
-            raise UserError(_('No valid rows found in the CSV file.'))
-
-        # ── Check for already-existing references
-        existing_names = self.env['purchase.approval'].search(
-            [('name', 'in', list(grouped.keys()))]
-        ).mapped('name')
-
-        skipped = []
-        to_create = {}
-        for ref, data in grouped.items():
-            if ref in existing_names:
-                skipped.append(ref)
-            else:
-                to_create[ref] = data
-
-        # ── Resolve lookups once for efficiency
-        # Users
-        logins = {d['requester_login'] for d in to_create.values() if d['requester_login']}
-        users_by_login = {
-            u.login: u
-            for u in self.env['res.users'].search([('login', 'in', list(logins))])
-        }
-
-        # Departments
-        dept_names = {d['department'] for d in to_create.values() if d['department']}
-        depts_by_name = {
-            dep.name: dep
-            for dep in self.env['hr.department'].search([('name', 'in', list(dept_names))])
-        }
-
-        # Warehouses
-        wh_names = {d['warehouse'] for d in to_create.values() if d['warehouse']}
-        whs_by_name = {
-            wh.name: wh
-            for wh in self.env['stock.warehouse'].search([('name', 'in', list(wh_names))])
-        }
-
-        # Products — try default_code first, then display_name
-        all_product_refs = set()
-        for data in to_create.values():
-            for line in data['lines']:
-                if line['product_ref']:
-                    all_product_refs.add(line['product_ref'])
-
-        products_by_ref = {}
-        if all_product_refs:
-            # Try internal reference (default_code) first
-            by_code = {
-                p.default_code: p
-                for p in self.env['product.product'].search(
-                    [('default_code', 'in', list(all_product_refs))]
-                )
-                if p.default_code
-            }
-            products_by_ref.update(by_code)
-            # Fall back to display_name for refs not matched by code
-            unmatched = all_product_refs - set(by_code.keys())
-            if unmatched:
-                by_name = {
-                    p.display_name: p
-                    for p in self.env['product.product'].search(
-                        [('name', 'in', list(unmatched))]
-                    )
-                }
-                products_by_ref.update(by_name)
-
-        # ── Create PRs
-        created_refs = []
-        creation_errors = []
-
-        PurchaseApproval = self.env['purchase.approval']
-
-        for ref, data in to_create.items():
-            dept = depts_by_name.get(data['department'])
-            if not dept:
-                creation_errors.append(
-                    f'{ref}: department "{data["department"]}" not found — skipped.'
-                )
-                continue
-
-            requester = users_by_login.get(data['requester_login']) or self.env.user
-            warehouse = whs_by_name.get(data['warehouse'])
-
-            # Parse date
-            pr_date = False
-            if data['date']:
-                try:
-                    from datetime import datetime
-                    pr_date = datetime.strptime(data['date'], '%Y-%m-%d').date()
-                except ValueError:
-                    pass  # will default to today
-
-            # Build line vals
-            line_vals = []
-            line_errors = []
-            for line in data['lines']:
-                product = products_by_ref.get(line['product_ref'])
-                if not product:
-                    line_errors.append(
-                        f'  • Product "{line["product_ref"]}" not found — line skipped.'
-                    )
-                    continue
-                line_vals.append((0, 0, {
-                    'product_id': product.id,
-                    'description': line['description'] or product.display_name,
-                    'quantity': line['quantity'],
-                }))
-
-            if line_errors:
-                creation_errors.append(
-                    f'{ref}: some lines skipped:\n' + '\n'.join(line_errors)
-                )
-
-            pr_vals = {
-                # Let the sequence generate a new name — we cannot reuse old names
-                # because the sequence counter won't know about them.
-                # The original ref is stored as a note in the chatter.
-                'department_id': dept.id,
-                'requester_id': requester.id,
-                'state': 'draft',
-                # approver_id intentionally omitted → stays False/draft
-            }
-            if pr_date:
-                pr_vals['date'] = pr_date
-            if warehouse:
-                pr_vals['warehouse_id'] = warehouse.id
-            if line_vals:
-                pr_vals['line_ids'] = line_vals
-
-            new_pr = PurchaseApproval.create(pr_vals)
-            # Record the original reference in the chatter for traceability
-            new_pr.message_post(
-                body=_('Imported from CSV. Original reference: <b>%s</b>') % ref
-            )
-            created_refs.append(f'{new_pr.name}  ← was {ref}')
-
-        # ── Build result message
-        lines_out = []
-        if created_refs:
-            lines_out.append(
-                _('✅  %d PR(s) created:\n') % len(created_refs)
-                + '\n'.join(f'   {r}' for r in created_refs)
-            )
-        if skipped:
-            lines_out.append(
-                _('⚠️  %d PR(s) skipped (reference already exists):\n') % len(skipped)
-                + '\n'.join(f'   {r}' for r in skipped)
-            )
-        if creation_errors:
-            lines_out.append(
-                _('❌  Errors:\n') + '\n'.join(f'   {e}' for e in creation_errors)
-            )
-        if row_errors:
-            lines_out.append(
-                _('ℹ️  Row warnings:\n') + '\n'.join(f'   {e}' for e in row_errors)
-            )
-
-        self.write({
-            'result_message': '\n\n'.join(lines_out) or _('Nothing to import.'),
-            'state': 'done',
-        })
+        if self.run_in_background:
+            self.env.ref('purchase_enhanced_approval.ir_cron_process_pr_imports')._trigger()
+        else:
+            result.action_start()
 
         return {
             'type': 'ir.actions.act_window',
-            'res_model': self._name,
-            'res_id': self.id,
+            'name': _('Import Result'),
+            'res_model': result._name,
+            'res_id': result.id,
             'view_mode': 'form',
-            'target': 'new',
-        }
\ No newline at end of file
+            'target': 'current',
+        }
@@ -0,0 +1,467 @@
+import codecs
+import csv
+import io
+import logging
+import threading
+from datetime import date, datetime, timedelta
+
+from markupsafe import Markup
+
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+_logger = logging.getLogger(__name__)
+
+REQUIRED_IMPORT_COLUMNS = {'pr_reference', 'department', 'product_reference', 'quantity'}
+# A running import commits after every chunk; one untouched for this long
+# belongs to a worker that was killed or timed out
+STALE_IMPORT_MINUTES = 60
+
+
+class PurchaseApprovalImportResult(models.Model):
+    """
+    One run of the PR import engine.
+
+    The uploaded file is kept as an attachment and parsed row by row (CSV
+    or XLSX), so the parsed rows never all sit in memory.  Rows are grouped by
+    pr_reference; every ``chunk_size`` references the lookups for that chunk
+    are resolved, the PRs are created with a single ``create(vals_list)``
+    inside a savepoint and the chatter notes are logged in one batch.
+
+    Progress counters are written after every chunk and every skipped row or
+    reference is stored as a result line, so a 50k-row file can be followed
+    (and audited) while it runs in the background.
+
+    Rows of one pr_reference must be contiguous (the export wizard writes
+    them that way); rows of a reference whose chunk was already imported are
+    reported and skipped.
+
+    An import left 'running' by a dead worker is queued again by the cron
+    and resumes after the rows of its last committed chunk (rows_processed),
+    so nothing is created or counted twice.
+    """
+    _name = 'purchase.approval.import.result'
+    _description = 'Purchase Requisition Import Result'
+    _order = 'id desc'
+
+    name = fields.Char(string='File', required=True, readonly=True)
+    attachment_id = fields.Many2one('ir.attachment', string='Uploaded File', readonly=True, ondelete='set null')
+    user_id = fields.Many2one('res.users', string='Imported By', default=lambda self: self.env.user, readonly=True)
+    company_id = fields.Many2one('res.company', string='Company', default=lambda self: self.env.company, readonly=True)
+    chunk_size = fields.Integer(string='Batch Size', default=200, readonly=True)
+    state = fields.Selection([
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string='Status', default='queued', readonly=True)
+    date_start = fields.Datetime(string='Started', readonly=True)
+    date_end = fields.Datetime(string='Finished', readonly=True)
+
+    rows_processed = fields.Integer(string='Rows Read', readonly=True)
+    created_count = fields.Integer(string='PRs Created', readonly=True)
+    skipped_count = fields.Integer(string='PRs Skipped', readonly=True)
+    error_count = fields.Integer(string='Errors', readonly=True)
+    warning_count = fields.Integer(string='Warnings', readonly=True)
+
+    line_ids = fields.One2many('purchase.approval.import.result.line', 'result_id', string='Details', readonly=True)
+    approval_ids = fields.Many2many('purchase.approval', string='Created Requisitions', readonly=True)
+
+    # ── Entry points ────────────────────────────────────────────────────
+
+    def action_start(self):
+        """Run the import in the current request (small files)."""
+        for result in self.filtered(lambda r: r.state == 'queued'):
+            result._run_import()
+        return True
+
+    def action_view_approvals(self):
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('Imported Requisitions'),
+            'res_model': 'purchase.approval',
+            'view_mode': 'list,form',
+            'domain': [('id', 'in', self.approval_ids.ids)],
+        }
+
+    @api.model
+    def _cron_process_imports(self):
+        """Process queued imports; each chunk is committed on its own.
+
+        Imports stuck in 'running' (no progress for STALE_IMPORT_MINUTES)
+        are resumed after their last committed chunk.
+        """
+        stale_date = fields.Datetime.now() - timedelta(minutes=STALE_IMPORT_MINUTES)
+        results = self.search([
+            '|', ('state', '=', 'queued'),
+            '&', ('state', '=', 'running'), ('write_date', '<', stale_date),
+        ], order='id')
+        for result in results:
+            if result.state == 'running':
+                _logger.warning("PR import %s was interrupted, restarting it", result.id)
+                result.write({
+                    'state': 'queued',
+                    'warning_count': result.warning_count + 1,
+                    'line_ids': [(0, 0, self._result_line_vals(
+                        'warning', _('The import was interrupted and has been resumed after row %s.')
+                        % (result.rows_processed + 1)))],
+                })
+            result.with_user(result.user_id).with_company(result.company_id)._run_import(commit=True)
+
+    # ── File reading ────────────────────────────────────────────────────
+
+    def _open_import_file(self):
+        """Binary file object of the uploaded file."""
+        self.ensure_one()
+        attachment = self.attachment_id.sudo()
+        if not attachment:
+            raise UserError(_('The uploaded file of this import is no longer available.'))
+        return io.BytesIO(attachment.raw or b'')
+
+    @staticmethod
+    def _detect_csv_encoding(fileobj):
+        """UTF-8 when the whole file decodes as such, latin-1 otherwise (checked block by block)."""
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        encoding = 'utf-8-sig'
+        try:
+            for block in iter(lambda: fileobj.read(65536), b''):
+                decoder.decode(block)
+            decoder.decode(b'', final=True)
+        except UnicodeDecodeError:
+            encoding = 'latin-1'
+        fileobj.seek(0)
+        return encoding
+
+    @staticmethod
+    def _cell_to_str(value):
+        if value is None:
+            return ''
+        if isinstance(value, datetime):
+            return value.strftime('%Y-%m-%d')
+        if isinstance(value, date):
+            return value.isoformat()
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return str(value).strip()
+
+    def _check_import_header(self, fieldnames):
+        if not REQUIRED_IMPORT_COLUMNS.issubset(set(fieldnames)):
+            raise UserError(_(
+                'File is missing required columns.\n'
+                'Required: %s\nFound: %s'
+            ) % (', '.join(sorted(REQUIRED_IMPORT_COLUMNS)),
+                 ', '.join(f for f in fieldnames if f)))
+
+    def _iter_import_rows(self, fileobj):
+        """Yield ``(row_number, row_dict)`` from the CSV or XLSX file, one row at a time."""
+        self.ensure_one()
+        if (self.name or '').lower().endswith('.xlsx'):
+            if openpyxl is None:
+                raise UserError(_('The Python library openpyxl is required to import XLSX files.'))
+            workbook = openpyxl.load_workbook(fileobj, read_only=True, data_only=True)
+            try:
+                rows = workbook.worksheets[0].iter_rows(values_only=True)
+                header = [self._cell_to_str(v) for v in next(rows, ())]
+                self._check_import_header(header)
+                for i, values in enumerate(rows, start=2):  # row 1 is the header
+                    if not values or all(v is None for v in values):
+                        continue
+                    yield i, {col: self._cell_to_str(v) for col, v in zip(header, values) if col}
+            finally:
+                workbook.close()
+            return
+
+        encoding = self._detect_csv_encoding(fileobj)
+        text = io.TextIOWrapper(fileobj, encoding=encoding, newline='')
+        reader = csv.DictReader(text)
+        self._check_import_header(reader.fieldnames or [])
+        for i, row in enumerate(reader, start=2):  # row 1 is the header
+            yield i, row
+
+    # ── Engine ──────────────────────────────────────────────────────────
+
+    def _run_import(self, commit=False):
+        self.ensure_one()
+        commit = commit and not getattr(threading.current_thread(), 'testing', False)
+        self.write({'state': 'running', 'date_start': self.date_start or fields.Datetime.now()})
+        if commit:
+            self.env.cr.commit()
+
+        chunk_size = max(self.chunk_size, 1)
+        lookups = {'users': {}, 'departments': {}, 'warehouses': {}, 'products': {}}
+        pending = {}        # pr_reference -> {header info, lines} of the current chunk
+        # references already imported by an earlier chunk (of this or an interrupted run)
+        flushed = set(self.line_ids.filtered('pr_reference').mapped('pr_reference'))
+        row_lines = []      # result line vals of rows read since the last chunk
+        # Rows of committed chunks; a chunk always ends right before a new
+        # reference, so an interrupted import resumes on a reference boundary
+        resume_after = self.rows_processed
+        rows_processed = 0
+
+        try:
+            with self._open_import_file() as fileobj:
+                for i, row in self._iter_import_rows(fileobj):
+                    rows_processed += 1
+                    if rows_processed <= resume_after:
+                        continue
+                    ref = (row.get('pr_reference') or '').strip()
+                    if not ref:
+                        row_lines.append(self._result_line_vals('warning', _('Missing pr_reference, skipped.'), row=i))
+                        continue
+                    if ref in flushed:
+                        row_lines.append(self._result_line_vals(
+                            'error', _('Rows of this reference are not contiguous; row skipped.'), ref=ref, row=i))
+                        continue
+
+                    if ref not in pending:
+                        if len(pending) >= chunk_size:
+                            self._import_chunk(pending, lookups, row_lines, rows_processed - 1, commit)
+                            flushed.update(pending)
+                            pending, row_lines = {}, []
+                        pending[ref] = {
+                            'row': i,
+                            'date': (row.get('date') or '').strip(),
+                            'requester_login': (row.get('requester_login') or '').strip(),
+                            'department': (row.get('department') or '').strip(),
+                            'warehouse': (row.get('warehouse') or '').strip(),
+                            'lines': [],
+                        }
+
+                    product_ref = (row.get('product_reference') or '').strip()
+                    qty_raw = (row.get('quantity') or '').strip()
+
+                    # Skip empty-line rows (PR header with no products)
+                    if not product_ref and not qty_raw:
+                        continue
+
+                    try:
+                        qty = float(qty_raw) if qty_raw else 1.0
+                    except ValueError:
+                        row_lines.append(self._result_line_vals(
+                            'warning', _('Invalid quantity "%s", defaulting to 1.') % qty_raw, ref=ref, row=i))
+                        qty = 1.0
+
+                    pending[ref]['lines'].append({
+                        'row': i,
+                        'product_ref': product_ref,
+                        'description': (row.get('description') or '').strip(),
+                        'quantity': qty,
+                    })
+
+                self._import_chunk(pending, lookups, row_lines, rows_processed, commit)
+        except Exception as e:
+            # Chunks committed so far stay imported; the current one is dropped
+            if commit:
+                self.env.cr.rollback()
+            elif not isinstance(e, UserError):
+                raise
+            _logger.info("PR import %s failed: %s", self.id, e)
+            self._finish_import('failed', str(e))
+        else:
+            if not self.rows_processed:
+                self._finish_import('done', _('No valid rows found in the file.'))
+            else:
+                self._finish_import('done')
+        if commit:
+            self.env.cr.commit()
+        return self.state == 'done'
+
+    def _finish_import(self, state, error=False):
+        vals = {'state': state, 'date_end': fields.Datetime.now()}
+        if error:
+            vals['line_ids'] = [(0, 0, self._result_line_vals('error', error))]
+            vals['error_count'] = self.error_count + 1
+        self.write(vals)
+
+    @api.model
+    def _result_line_vals(self, level, message, ref=False, row=False, approval_id=False):
+        return {
+            'level': level,
+            'message': message,
+            'pr_reference': ref,
+            'row_number': row,
+            'approval_id': approval_id,
+        }
+
+    def _resolve_chunk_lookups(self, groups, lookups):
+        """Fill ``lookups`` with the ids of the users, departments, warehouses and
+        products referenced by ``groups`` that earlier chunks did not resolve yet."""
+        def missing(key, values):
+            return list({v for v in values if v} - set(lookups[key]))
+
+        logins = missing('users', (g['requester_login'] for g in groups.values()))
+        if logins:
+            for user in self.env['res.users'].search_fetch([('login', 'in', logins)], ['login']):
+                lookups['users'][user.login] = user.id
+            lookups['users'].update({login: False for login in logins if login not in lookups['users']})
+
+        dept_names = missing('departments', (g['department'] for g in groups.values()))
+        if dept_names:
+            for dept in self.env['hr.department'].search_fetch([('name', 'in', dept_names)], ['name']):
+                lookups['departments'].setdefault(dept.name, dept.id)
+            lookups['departments'].update({n: False for n in dept_names if n not in lookups['departments']})
+
+        wh_names = missing('warehouses', (g['warehouse'] for g in groups.values()))
+        if wh_names:
+            for wh in self.env['stock.warehouse'].search_fetch([('name', 'in', wh_names)], ['name']):
+                lookups['warehouses'].setdefault(wh.name, wh.id)
+            lookups['warehouses'].update({n: False for n in wh_names if n not in lookups['warehouses']})
+
+        # Products — try default_code first, then name
+        product_refs = missing('products', (l['product_ref'] for g in groups.values() for l in g['lines']))
+        if product_refs:
+            Product = self.env['product.product']
+            for product in Product.search_fetch([('default_code', 'in', product_refs)], ['default_code']):
+                lookups['products'][product.default_code] = product.id
+            unmatched = [ref for ref in product_refs if ref not in lookups['products']]
+            if unmatched:
+                for product in Product.search_fetch([('name', 'in', unmatched)], ['name']):
+                    lookups['products'].setdefault(product.display_name, product.id)
+                    lookups['products'].setdefault(product.name, product.id)
+            lookups['products'].update({ref: False for ref in product_refs if ref not in lookups['products']})
+
+    def _prepare_approval_vals(self, ref, group, lookups, line_vals):
+        """purchase.approval vals of one grouped reference; problems go to ``line_vals``."""
+        dept_id = lookups['departments'].get(group['department'])
+        if not dept_id:
+            line_vals.append(self._result_line_vals(
+                'error', _('Department "%s" not found — skipped.') % group['department'], ref=ref, row=group['row']))
+            return False
+
+        # Parse date
+        pr_date = False
+        if group['date']:
+            try:
+                pr_date = datetime.strptime(group['date'], '%Y-%m-%d').date()
+            except ValueError:
+                pass  # will default to today
+
+        approval_lines = []
+        for line in group['lines']:
+            product_id = lookups['products'].get(line['product_ref'])
+            if not product_id:
+                line_vals.append(self._result_line_vals(
+                    'warning', _('Product "%s" not found — line skipped.') % line['product_ref'],
+                    ref=ref, row=line['row']))
+                continue
+            line_data = {
+                'product_id': product_id,
+                'quantity': line['quantity'],
+            }
+            if line['description']:
+                line_data['description'] = line['description']
+            approval_lines.append((0, 0, line_data))
+
+        vals = {
+            # Let the sequence generate a new name; the original ref is logged in the chatter
+            'department_id': dept_id,
+            'requester_id': lookups['users'].get(group['requester_login']) or self.env.user.id,
+            'state': 'draft',
+            # approver_id intentionally omitted → stays False/draft
+        }
+        if pr_date:
+            vals['date'] = pr_date
+        if lookups['warehouses'].get(group['warehouse']):
+            vals['warehouse_id'] = lookups['warehouses'][group['warehouse']]
+        if approval_lines:
+            vals['line_ids'] = approval_lines
+        return vals
+
+    def _import_chunk(self, groups, lookups, line_vals, rows_processed, commit):
+        """Create the PRs of one chunk of references and record its progress."""
+        self.ensure_one()
+        PurchaseApproval = self.env['purchase.approval']
+        created = PurchaseApproval
+        skipped = 0
+
+        if groups:
+            existing = set(PurchaseApproval.search_fetch([('name', 'in', list(groups))], ['name']).mapped('name'))
+            self._resolve_chunk_lookups(groups, lookups)
+
+            refs, vals_list = [], []
+            for ref, group in groups.items():
+                if ref in existing:
+                    skipped += 1
+                    line_vals.append(self._result_line_vals(
+                        'skipped', _('Reference already exists — skipped.'), ref=ref, row=group['row']))
+                    continue
+                vals = self._prepare_approval_vals(ref, group, lookups, line_vals)
+                if vals:
+                    refs.append(ref)
+                    vals_list.append(vals)
+                else:
+                    skipped += 1
+
+            created, created_refs = self._create_approvals(refs, vals_list, line_vals)
+            if created:
+                # Record the original reference in the chatter for traceability
+                created._message_log_batch(bodies={
+                    pr.id: Markup(_('Imported from file. Original reference: <b>%s</b>')) % ref
+                    for pr, ref in zip(created, created_refs)
+                })
+                line_vals.extend(
+                    self._result_line_vals('info', _('Created %s') % pr.name, ref=ref, approval_id=pr.id)
+                    for pr, ref in zip(created, created_refs)
+                )
+
+        self.write({
+            'rows_processed': rows_processed,
+            'created_count': self.created_count + len(created),
+            'skipped_count': self.skipped_count + skipped,
+            'warning_count': self.warning_count + sum(1 for v in line_vals if v['level'] == 'warning'),
+            'error_count': self.error_count + sum(1 for v in line_vals if v['level'] == 'error'),
+            'approval_ids': [(4, pr_id) for pr_id in created.ids],
+            'line_ids': [(0, 0, vals) for vals in line_vals],
+        })
+        self.env.flush_all()
+        if commit:
+            self.env.cr.commit()
+        # Drop the chunk's records from the cache so memory stays flat
+        self.env.invalidate_all()
+
+    def _create_approvals(self, refs, vals_list, line_vals):
+        """``create(vals_list)`` in a savepoint; on failure fall back to one
+        savepoint per PR so a single bad reference does not lose the chunk."""
+        PurchaseApproval = self.env['purchase.approval']
+        if not vals_list:
+            return PurchaseApproval, []
+        try:
+            with self.env.cr.savepoint():
+                return PurchaseApproval.create(vals_list), refs
+        except Exception:
+            _logger.info("PR import %s: batch create failed, retrying per reference", self.id)
+
+        created, created_refs = PurchaseApproval, []
+        for ref, vals in zip(refs, vals_list):
+            try:
+                with self.env.cr.savepoint():
+                    created |= PurchaseApproval.create(vals)
+                created_refs.append(ref)
+            except Exception as e:
+                line_vals.append(self._result_line_vals('error', str(e), ref=ref))
+        return created, created_refs
+
+
+class PurchaseApprovalImportResultLine(models.Model):
+    _name = 'purchase.approval.import.result.line'
+    _description = 'Purchase Requisition Import Result Line'
+    _order = 'id'
+
+    result_id = fields.Many2one('purchase.approval.import.result', string='Import', required=True,
+                                ondelete='cascade', index=True)
+    level = fields.Selection([
+        ('info', 'Created'),
+        ('skipped', 'Skipped'),
+        ('warning', 'Warning'),
+        ('error', 'Error'),
+    ], string='Type', required=True)
+    row_number = fields.Integer(string='Row')
+    pr_reference = fields.Char(string='File Reference')
+    approval_id = fields.Many2one('purchase.approval', string='Requisition', ondelete='set null')
+    message = fields.Text(string='Message')
@@ -1,6 +1,18 @@
+from collections import defaultdict
+
+from dateutil.relativedelta import relativedelta
+
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
 
+# approval_level -> hr.department field holding the approver of that level
+APPROVER_LEVEL_FIELDS = {
+    1: 'approver_level_1_id',
+    2: 'approver_level_2_id',
+    3: 'approver_level_3_id',
+    4: 'approver_level_4_id',
+}
+
 
 class PurchaseOrder(models.Model):
     _inherit = 'purchase.order'
@@ -70,94 +82,117 @@ class PurchaseOrder(models.Model):
         self.order_line = new_lines
 
     def action_send_for_approval(self):  # Renamed from button_confirm
-        """ Acts as 'Send for Approval' """
-        is_admin = self.env.user.has_group('base.group_system')
-        for order in self:
-            if not order.department_id:
-                raise UserError(_("Please select a Department before sending for approval."))
-
-            # Start the approval process
-            first_approver = order.department_id.approver_level_1_id
-            if not first_approver:
-                raise UserError(_("The selected department has no Level 1 approver assigned."))
-
-            # Set the state to start the chain
-            order.write({
+        """ Acts as 'Send for Approval' — works on any number of orders at once """
+        no_department = self.filtered(lambda o: not o.department_id)
+        if no_department:
+            raise UserError(_("Please select a Department before sending for approval.\n%s")
+                            % ', '.join(no_department.mapped('name')))
+
+        no_approver = self.filtered(lambda o: not o.department_id.approver_level_1_id)
+        if no_approver:
+            raise UserError(_("The selected department has no Level 1 approver assigned.\n%s")
+                            % ', '.join(no_approver.mapped('name')))
+
+        # Set the state to start the chain — one write per first approver
+        for first_approver, orders in self.grouped(lambda o: o.department_id.approver_level_1_id).items():
+            orders.write({
                 'approval_level': 1,
                 'current_approver_id': first_approver.id
             })
 
-            # Trigger notification and activity
-            order._create_approval_activity()
-            order._send_approval_email()
+        # Trigger notification and activity
+        self._create_approval_activity()
+        self._send_approval_email()
 
         return True
 
     def _create_approval_activity(self):
-        if self.current_approver_id:
-            self.activity_schedule(
-                'mail.mail_activity_data_todo',
-                user_id=self.current_approver_id.id,
-                summary=_("Purchase Approval Required"),
-                note=f"Level {self.approval_level} approval requested."
-            )
+        """ One 'To Do' activity per order for its current approver, created in a single call """
+        orders = self.filtered('current_approver_id')
+        if not orders:
+            return self.env['mail.activity']
+
+        activity_type = self.env.ref('mail.mail_activity_data_todo')
+        date_deadline = fields.Date.context_today(self) + relativedelta(
+            **{activity_type.delay_unit or 'days': activity_type.delay_count or 0})
+        res_model_id = self.env['ir.model']._get_id(self._name)
+        return self.env['mail.activity'].create([{
+            'activity_type_id': activity_type.id,
+            'res_model_id': res_model_id,
+            'res_id': order.id,
+            'user_id': order.current_approver_id.id,
+            'summary': _("Purchase Approval Required"),
+            'note': f"Level {order.approval_level} approval requested.",
+            'date_deadline': date_deadline,
+        } for order in orders])
 
     def action_department_approve(self):
-        """ Handles the progression through levels """
+        """ Handles the progression through levels — works on any number of orders at once """
 
         is_admin = self.env.user.has_group('base.group_system')
 
-        if self.current_approver_id != self.env.user and not is_admin:
-            raise UserError(_("It is not your turn to approve."))
-
-        self.activity_feedback(['mail.mail_activity_data_todo'])
+        not_my_turn = self.filtered(lambda o: o.current_approver_id != self.env.user)
+        if not_my_turn and not is_admin:
+            raise UserError(_("It is not your turn to approve: %s") % ', '.join(not_my_turn.mapped('name')))
 
-        next_approver = False
-        new_level = self.approval_level
+        # Close the pending 'To Do' activities, one feedback per level
+        for orders in self.grouped('approval_level').values():
+            orders.activity_feedback(['mail.mail_activity_data_todo'])
 
-        # Selection Logic
-        if self.approval_level == 1:
-            next_approver = self.department_id.approver_level_2_id
-            new_level = 2
-        elif self.approval_level == 2:
-            next_approver = self.department_id.approver_level_3_id
-            new_level = 3
-        elif self.approval_level == 3:
-            next_approver = self.department_id.approver_level_4_id
-            new_level = 4
-
-        if next_approver:
-            self.write({
+        # Selection Logic: level N goes to the level N+1 approver of the department, if any
+        to_advance = defaultdict(lambda: self.browse())
+        final_orders = self.browse()
+        for order in self:
+            next_level = order.approval_level + 1
+            next_field = APPROVER_LEVEL_FIELDS.get(next_level) if order.approval_level else False
+            next_approver = order.department_id[next_field] if next_field else False
+            if next_approver:
+                to_advance[(next_level, next_approver)] |= order
+            else:
+                final_orders |= order
+
+        advanced_orders = self.browse()
+        for (new_level, next_approver), orders in to_advance.items():
+            orders.write({
                 'approval_level': new_level,
                 'current_approver_id': next_approver.id
             })
-            self._create_approval_activity()
-        else:
-            # FINAL APPROVAL REACHED
-            self.write({
-                'current_approver_id': False,
-                'approval_level': 0
-            })
-            # 1. Call Odoo's native confirmation (this creates the Picking)
-            res = super(PurchaseOrder, self).button_confirm()
+            advanced_orders |= orders
+        advanced_orders._create_approval_activity()
+
+        if not final_orders:
+            return True
 
-            # 2. Make the Delivery "Ready"
-            self._prepare_receipts_to_ready()
-            return res
+        # FINAL APPROVAL REACHED
+        final_orders.write({
+            'current_approver_id': False,
+            'approval_level': 0
+        })
+        # 1. Call Odoo's native confirmation (this creates the Picking)
+        res = super(PurchaseOrder, final_orders).button_confirm()
+
+        # 2. Make the Delivery "Ready"
+        final_orders._prepare_receipts_to_ready()
+        return res
 
     def _prepare_receipts_to_ready(self):
         """
         Sets the associated picking to 'Ready' (Assigned)
         without validating it completely.
         """
-        for picking in self.picking_ids.filtered(lambda x: x.state not in ('done', 'cancel')):
-            # action_assign() checks stock/constraints and moves state from 'Waiting' to 'Assigned' (Ready)
-            picking.action_assign()
+        pickings = self.picking_ids.filtered(lambda x: x.state not in ('done', 'cancel'))
+        # action_assign() checks stock/constraints and moves state from 'Waiting' to 'Assigned' (Ready)
+        if pickings:
+            pickings.action_assign()
 
     def _send_approval_email(self):
+        """ Queue the approval emails (the mail queue cron sends them), one batch per approver """
         template = self.env.ref('purchase.email_template_edi_purchase', raise_if_not_found=False)
-        if template and self.current_approver_id.email:
-            template.send_mail(self.id, force_send=True, email_values={'email_to': self.current_approver_id.email})
+        if not template:
+            return
+        orders = self.filtered(lambda o: o.current_approver_id.email)
+        for approver, approver_orders in orders.grouped('current_approver_id').items():
+            template.send_mail_batch(approver_orders.ids, email_values={'email_to': approver.email})
 
     def _auto_validate_receipts(self):
         for picking in self.picking_ids.filtered(lambda x: x.state not in ('done', 'cancel')):
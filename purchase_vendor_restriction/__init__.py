@@ -1 +1,5 @@
 from . import models
+
+
+def post_init_hook(env):
+    env['product.category']._init_vendor_restricted_categories()
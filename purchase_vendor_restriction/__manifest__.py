@@ -1,6 +1,6 @@
 {
     'name': 'Purchase Vendor Restriction',
-    'version': '18.0.1.0.0',
+    'version': '18.0.1.1.0',
     'category': 'Purchase',
     'summary': 'Restrict PO to only allow vendors defined on product purchase tab',
     'description': """
@@ -12,7 +12,9 @@
     'depends': ['purchase'],
     'data': [
         'security/ir.model.access.csv',
+        'views/product_views.xml',
     ],
+    'post_init_hook': 'post_init_hook',
     'installable': True,
     'application': False,
     'license': 'LGPL-3',
@@ -0,0 +1,15 @@
+import logging
+
+from odoo import SUPERUSER_ID, api
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    """
+    Post-migration script to flag the RAW / PKG / SSP categories as vendor
+    restricted on databases where the module was already installed.
+    """
+    _logger.info("Running post-migration for purchase_vendor_restriction module version %s", version)
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    env['product.category']._init_vendor_restricted_categories()
@@ -1,47 +1,110 @@
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
 
-# Sirf in categories pe vendor restriction apply hogi
+# Install ke waqt in naam wali categories vendor restricted mark hoti hain
 RESTRICTED_CATEGORIES = ['RAW', 'PKG', 'SSP']
 
 
-def get_category_names(product):
-    """Product ki category aur uske saare parents ke naam return karta hai"""
-    names = []
-    cat = product.categ_id
-    while cat:
-        names.append(cat.name)
-        cat = cat.parent_id
-    return names
+class ProductCategory(models.Model):
+    _inherit = 'product.category'
+
+    vendor_restricted = fields.Boolean(
+        string='Vendor Restricted',
+        help='Is category aur iski sub-categories ki products sirf Purchase tab '
+             'ke vendors se hi kharidi ja sakti hain.',
+    )
+    vendor_restricted_company_ids = fields.Many2many(
+        'res.company',
+        string='Restricted For Companies',
+        help='Khali chhodein to restriction saari companies pe apply hogi.',
+    )
+    is_vendor_restricted = fields.Boolean(
+        string='Vendor Restricted (Effective)',
+        compute='_compute_vendor_restriction',
+        store=True,
+        index=True,
+        recursive=True,
+        help='Category khud ya uska koi parent vendor restricted hai.',
+    )
+    vendor_restriction_company_ids = fields.Many2many(
+        'res.company',
+        'product_category_vendor_restriction_company_rel',
+        string='Effective Restricted Companies',
+        compute='_compute_vendor_restriction',
+        store=True,
+        recursive=True,
+    )
+
+    @api.depends('vendor_restricted', 'vendor_restricted_company_ids',
+                 'parent_id.is_vendor_restricted', 'parent_id.vendor_restriction_company_ids')
+    def _compute_vendor_restriction(self):
+        for category in self:
+            if category.vendor_restricted:
+                category.is_vendor_restricted = True
+                category.vendor_restriction_company_ids = category.vendor_restricted_company_ids
+            else:
+                category.is_vendor_restricted = category.parent_id.is_vendor_restricted
+                category.vendor_restriction_company_ids = category.parent_id.vendor_restriction_company_ids
 
+    def _is_vendor_restricted_for_company(self, company):
+        self.ensure_one()
+        return self.is_vendor_restricted and (
+            not self.vendor_restriction_company_ids or company in self.vendor_restriction_company_ids
+        )
 
-class PurchaseOrderLine(models.Model):
-    _inherit = 'purchase.order.line'
+    @api.model
+    def _init_vendor_restricted_categories(self):
+        """Pehle se restricted (RAW / PKG / SSP) categories ko flag karein"""
+        self.search([('name', 'in', RESTRICTED_CATEGORIES)]).write({'vendor_restricted': True})
 
-    @api.constrains('product_id', 'order_id')
-    def _check_vendor_matches_product(self):
-        for line in self:
-            product = line.product_id
-            order = line.order_id
-            vendor = order.partner_id
 
-            if not product or not vendor:
-                continue
+class ProductTemplate(models.Model):
+    _inherit = 'product.template'
 
-            # Product ki category check karein
-            category_names = get_category_names(product)
-            is_restricted_category = any(c in RESTRICTED_CATEGORIES for c in category_names)
+    is_vendor_restricted = fields.Boolean(
+        string='Vendor Restricted',
+        related='categ_id.is_vendor_restricted',
+        store=True,
+        index=True,
+    )
 
-            # Get all vendors defined on this product's Purchase tab
-            product_vendors = self.env['product.supplierinfo'].search([
-                ('product_tmpl_id', '=', product.product_tmpl_id.id),
-            ])
 
-            if is_restricted_category:
-                # RAW / PKG / SSP → vendor ZAROOR match karna chahiye
-                if not product_vendors:
-                    # Vendor set hi nahi — error do
-                    raise ValidationError(_(
+class PurchaseOrderLine(models.Model):
+    _inherit = 'purchase.order.line'
+
+    def _check_vendor_restrictions(self):
+        """Saari lines ek saath validate karein aur saare errors ek hi baar dikhayein.
+
+        Sab templates ke vendors ek query mein load hote hain; category ki
+        restriction stored flag (is_vendor_restricted) se check hoti hai.
+        """
+        lines = self.filtered(lambda l: l.product_id and l.order_id.partner_id)
+        if not lines:
+            return
+
+        # Get all vendors defined on the products' Purchase tab, in one query
+        templates = lines.product_id.product_tmpl_id
+        vendor_ids_by_template = {
+            template.id: set(partner_ids)
+            for template, partner_ids in self.env['product.supplierinfo']._read_group(
+                [('product_tmpl_id', 'in', templates.ids)],
+                groupby=['product_tmpl_id'],
+                aggregates=['partner_id:array_agg'],
+            )
+        }
+
+        errors = []
+        for line in lines:
+            product = line.product_id
+            vendor = line.order_id.partner_id
+            allowed_vendor_ids = vendor_ids_by_template.get(product.product_tmpl_id.id, set())
+            is_restricted_category = product.is_vendor_restricted and \
+                product.categ_id._is_vendor_restricted_for_company(line.order_id.company_id)
+
+            if not allowed_vendor_ids:
+                if is_restricted_category:
+                    # Restricted category → vendor set hi nahi — error do
+                    errors.append(_(
                         "Vendor Not Set!\n\n"
                         "Product: %(product)s\n"
                         "Category: %(category)s\n\n"
@@ -50,48 +113,48 @@ class PurchaseOrderLine(models.Model):
                         product=product.display_name,
                         category=product.categ_id.complete_name,
                     ))
+                # Koi aur category → vendor set nahi — allow karo
+                continue
 
-                allowed_vendor_ids = product_vendors.mapped('partner_id').ids
-                if vendor.id not in allowed_vendor_ids:
-                    allowed_vendor_names = ', '.join(
-                        product_vendors.mapped('partner_id.name')
-                    )
-                    raise ValidationError(_(
-                        "Vendor Mismatch!\n\n"
-                        "Product: %(product)s\n"
-                        "Category: %(category)s\n"
-                        "Selected Vendor: %(vendor)s\n\n"
-                        "This product can only be purchased from: %(allowed)s\n\n"
-                        "Please select the correct vendor or update the "
-                        "product's Purchase tab to add this vendor.",
-                        product=product.display_name,
-                        category=product.categ_id.complete_name,
-                        vendor=vendor.name,
-                        allowed=allowed_vendor_names,
-                    ))
+            if vendor.id in allowed_vendor_ids:
+                continue
 
+            allowed_vendor_names = ', '.join(
+                self.env['res.partner'].browse(sorted(allowed_vendor_ids)).mapped('name')
+            )
+            if is_restricted_category:
+                errors.append(_(
+                    "Vendor Mismatch!\n\n"
+                    "Product: %(product)s\n"
+                    "Category: %(category)s\n"
+                    "Selected Vendor: %(vendor)s\n\n"
+                    "This product can only be purchased from: %(allowed)s\n\n"
+                    "Please select the correct vendor or update the "
+                    "product's Purchase tab to add this vendor.",
+                    product=product.display_name,
+                    category=product.categ_id.complete_name,
+                    vendor=vendor.name,
+                    allowed=allowed_vendor_names,
+                ))
             else:
-                # Koi aur category → sirf tab check karo jab vendor set ho
-                if not product_vendors:
-                    # Vendor set nahi — allow karo, koi restriction nahi
-                    continue
-
-                allowed_vendor_ids = product_vendors.mapped('partner_id').ids
-                if vendor.id not in allowed_vendor_ids:
-                    allowed_vendor_names = ', '.join(
-                        product_vendors.mapped('partner_id.name')
-                    )
-                    raise ValidationError(_(
-                        "Vendor Mismatch!\n\n"
-                        "Product: %(product)s\n"
-                        "Selected Vendor: %(vendor)s\n\n"
-                        "This product can only be purchased from: %(allowed)s\n\n"
-                        "Please select the correct vendor or update the "
-                        "product's Purchase tab to add this vendor.",
-                        product=product.display_name,
-                        vendor=vendor.name,
-                        allowed=allowed_vendor_names,
-                    ))
+                errors.append(_(
+                    "Vendor Mismatch!\n\n"
+                    "Product: %(product)s\n"
+                    "Selected Vendor: %(vendor)s\n\n"
+                    "This product can only be purchased from: %(allowed)s\n\n"
+                    "Please select the correct vendor or update the "
+                    "product's Purchase tab to add this vendor.",
+                    product=product.display_name,
+                    vendor=vendor.name,
+                    allowed=allowed_vendor_names,
+                ))
+
+        if errors:
+            raise ValidationError('\n\n----------\n\n'.join(errors))
+
+    @api.constrains('product_id', 'order_id')
+    def _check_vendor_matches_product(self):
+        self._check_vendor_restrictions()
 
 
 class PurchaseOrder(models.Model):
@@ -100,71 +163,4 @@ class PurchaseOrder(models.Model):
     @api.constrains('partner_id', 'order_line')
     def _check_all_lines_vendor(self):
         """Vendor change hone par bhi saari lines re-validate hon."""
-        for order in self:
-            vendor = order.partner_id
-            if not vendor:
-                continue
-
-            for line in order.order_line:
-                product = line.product_id
-                if not product:
-                    continue
-
-                category_names = get_category_names(product)
-                is_restricted_category = any(c in RESTRICTED_CATEGORIES for c in category_names)
-
-                product_vendors = self.env['product.supplierinfo'].search([
-                    ('product_tmpl_id', '=', product.product_tmpl_id.id),
-                ])
-
-                if is_restricted_category:
-                    if not product_vendors:
-                        raise ValidationError(_(
-                            "Vendor Not Set!\n\n"
-                            "Product: %(product)s\n"
-                            "Category: %(category)s\n\n"
-                            "Is category ki products ke liye product ki Purchase tab mein "
-                            "vendor set karna zaroori hai.",
-                            product=product.display_name,
-                            category=product.categ_id.complete_name,
-                        ))
-
-                    allowed_vendor_ids = product_vendors.mapped('partner_id').ids
-                    if vendor.id not in allowed_vendor_ids:
-                        allowed_vendor_names = ', '.join(
-                            product_vendors.mapped('partner_id.name')
-                        )
-                        raise ValidationError(_(
-                            "Vendor Mismatch!\n\n"
-                            "Product: %(product)s\n"
-                            "Category: %(category)s\n"
-                            "Selected Vendor: %(vendor)s\n\n"
-                            "This product can only be purchased from: %(allowed)s\n\n"
-                            "Please select the correct vendor or update the "
-                            "product's Purchase tab to add this vendor.",
-                            product=product.display_name,
-                            category=product.categ_id.complete_name,
-                            vendor=vendor.name,
-                            allowed=allowed_vendor_names,
-                        ))
-
-                else:
-                    if not product_vendors:
-                        continue
-
-                    allowed_vendor_ids = product_vendors.mapped('partner_id').ids
-                    if vendor.id not in allowed_vendor_ids:
-                        allowed_vendor_names = ', '.join(
-                            product_vendors.mapped('partner_id.name')
-                        )
-                        raise ValidationError(_(
-                            "Vendor Mismatch!\n\n"
-                            "Product: %(product)s\n"
-                            "Selected Vendor: %(vendor)s\n\n"
-                            "This product can only be purchased from: %(allowed)s\n\n"
-                            "Please select the correct vendor or update the "
-                            "product's Purchase tab to add this vendor.",
-                            product=product.display_name,
-                            vendor=vendor.name,
-                            allowed=allowed_vendor_names,
-                        ))
+        self.order_line._check_vendor_restrictions()
@@ -11,62 +11,99 @@ class MrpProduction(models.Model):
         string="Semi Finished Lot"
     )
 
-    def action_confirm(self):
-        """Override confirm to generate semi/finished lots automatically."""
-        res = super().action_confirm()
+    def _reserve_semi_wip_sequences(self, count):
+        """Reserve ``count`` numbers of the 'semi.wip.lot' sequence at once.
 
-        for mo in self:
-            tmpl = mo.product_id.product_tmpl_id
-            year = datetime.now().strftime("%y")
+        Standard sequences draw all numbers with one nextval over
+        generate_series, no-gap sequences with one counter update; both are
+        formatted by get_next_char.  Date-range sequences keep one _next()
+        per number, as their counter and prefix depend on the range.
+        """
+        sequence = self.env["ir.sequence"].search([
+            ("code", "=", "semi.wip.lot"),
+            ("company_id", "in", [self.env.company.id, False]),
+        ], order="company_id", limit=1)
+        if not sequence:
+            raise UserError("Sequence 'semi.wip.lot' is missing.")
 
-            # -----------------------
-            # SEMI-FINISHED PRODUCT
-            # -----------------------
-            if tmpl.is_semi_wip:
-                # Generate sequence
-                seq = self.env["ir.sequence"].next_by_code("semi.wip.lot")
-                initial = tmpl.lot_initial.upper()
+        if sequence.use_date_range:
+            return [sequence._next() for _i in range(count)]
 
-                # Lot name: INITIAL-WIP-YY-XXXX
-                lot_name = f"{initial}-WIP-{year}-{seq}"
+        increment = sequence.number_increment
+        if sequence.implementation == "standard":
+            # The postgres sequence already steps by number_increment
+            self.env.cr.execute(
+                "SELECT nextval(%s) FROM generate_series(1, %s)",
+                ["ir_sequence_%03d" % sequence.id, count],
+            )
+            numbers = [row[0] for row in self.env.cr.fetchall()]
+        else:
+            first = sequence._update_nogap(increment * count)
+            numbers = [first + increment * i for i in range(count)]
+        return [sequence.get_next_char(number) for number in numbers]
 
-                # Create the lot
-                lot = self.env["stock.lot"].create({
-                    "name": lot_name,
-                    "product_id": mo.product_id.id,
-                    "company_id": mo.company_id.id,
-                    "semi_sequence": seq,
-                    "lot_initial": initial,
-                })
+    def action_confirm(self):
+        """Override confirm to generate semi/finished lots automatically.
+
+        Lots of all confirmed MOs are generated together: semi WIP numbers
+        are reserved in one go (see _reserve_semi_wip_sequences), every lot
+        is created with a single create, the semi lots of finished MOs are
+        read in one query and lot_producing_id is flushed for all MOs at
+        once.
+        """
+        res = super().action_confirm()
 
-                # Assign lot to MO
-                mo.lot_producing_id = lot
+        year = datetime.now().strftime("%y")
+        semi_mos = self.filtered(lambda mo: mo.product_id.product_tmpl_id.is_semi_wip)
+        finished_mos = self - semi_mos
 
-            # -----------------------
-            # FINISHED PRODUCT
-            # -----------------------
-            else:
-                # Finished product requires a semi lot
-                if not mo.semi_lot_id:
-                    raise UserError(
-                        "Finished product requires a Semi-Finished Lot."
-                    )
+        # Finished product requires a semi lot
+        missing = finished_mos.filtered(lambda mo: not mo.semi_lot_id)
+        if missing:
+            raise UserError(
+                "Finished product requires a Semi-Finished Lot (%s)."
+                % ", ".join(missing.mapped("name"))
+            )
+        finished_mos.semi_lot_id.fetch(["lot_initial", "semi_sequence"])
 
-                semi_lot = mo.semi_lot_id
+        lot_vals_list = []
 
-                # Lot name: B-INITIAL-YY-XXXX (same sequence as semi)
-                lot_name = f"B-{semi_lot.lot_initial}-{year}-{semi_lot.semi_sequence}"
+        # -----------------------
+        # SEMI-FINISHED PRODUCT
+        # -----------------------
+        sequences = self._reserve_semi_wip_sequences(len(semi_mos)) if semi_mos else []
+        for mo, seq in zip(semi_mos, sequences):
+            initial = mo.product_id.product_tmpl_id.lot_initial.upper()
+            # Lot name: INITIAL-WIP-YY-XXXX
+            lot_vals_list.append({
+                "name": f"{initial}-WIP-{year}-{seq}",
+                "product_id": mo.product_id.id,
+                "company_id": mo.company_id.id,
+                "semi_sequence": seq,
+                "lot_initial": initial,
+            })
 
-                # Create the finished lot
-                lot = self.env["stock.lot"].create({
-                    "name": lot_name,
-                    "product_id": mo.product_id.id,
-                    "company_id": mo.company_id.id,
-                    "semi_sequence": semi_lot.semi_sequence,
-                    "lot_initial": semi_lot.lot_initial,
-                })
+        # -----------------------
+        # FINISHED PRODUCT
+        # -----------------------
+        for mo in finished_mos:
+            semi_lot = mo.semi_lot_id
+            # Lot name: B-INITIAL-YY-XXXX (same sequence as semi)
+            lot_vals_list.append({
+                "name": f"B-{semi_lot.lot_initial}-{year}-{semi_lot.semi_sequence}",
+                "product_id": mo.product_id.id,
+                "company_id": mo.company_id.id,
+                "semi_sequence": semi_lot.semi_sequence,
+                "lot_initial": semi_lot.lot_initial,
+            })
 
-                # Assign lot to MO
-                mo.lot_producing_id = lot
+        # Create all lots at once and assign them to their MOs
+        lots = self.env["stock.lot"].create(lot_vals_list)
+        # Every MO gets its own lot, so no grouped write is possible: the
+        # assignments only update the cache and mark the field dirty, and
+        # the flush below sends them to the database together
+        for mo, lot in zip(semi_mos + finished_mos, lots):
+            mo.lot_producing_id = lot
+        self.flush_recordset(["lot_producing_id"])
 
         return res
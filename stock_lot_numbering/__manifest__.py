@@ -0,0 +1,22 @@
+{
+    'name': 'Lot Numbering Counters',
+    'version': '18.0.1.0.0',
+    'category': 'Inventory',
+    'summary': 'Concurrency-safe lot number counters per product, prefix and year',
+    'description': """
+        Shared service used by the custom lot generators (custom_lot_code,
+        Maufacturing_Code) to hand out consecutive lot numbers.
+        - One counter row per (product, prefix, year)
+        - Counters are incremented with a single locking UPDATE, so parallel
+          confirmations never receive the same number
+        - New counters start after the highest number already used by
+          existing lots with the same prefix
+    """,
+    'depends': ['stock'],
+    'data': [
+        'security/ir.model.access.csv',
+    ],
+    'installable': True,
+    'application': False,
+    'license': 'LGPL-3',
+}
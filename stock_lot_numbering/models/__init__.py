@@ -0,0 +1 @@
+from . import stock_lot_counter
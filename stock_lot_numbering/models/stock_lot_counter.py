@@ -0,0 +1,81 @@
+import logging
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+
+class StockLotCounter(models.Model):
+    _name = 'stock.lot.counter'
+    _description = 'Lot Number Counter'
+    _rec_name = 'prefix'
+
+    product_id = fields.Many2one('product.product', string='Product', required=True, ondelete='cascade')
+    prefix = fields.Char(string='Prefix', required=True)
+    year = fields.Integer(string='Year', required=True, default=0,
+                          help='Counter year (two digits); 0 for counters that never reset.')
+    last_number = fields.Integer(string='Last Number', readonly=True)
+
+    _sql_constraints = [
+        ('product_prefix_year_uniq', 'unique(product_id, prefix, year)',
+         'Only one lot counter per product, prefix and year is allowed.'),
+    ]
+
+    @api.model
+    def _get_existing_max_number(self, product, prefix, separator='-'):
+        """Highest numeric suffix of the existing lots named ``<prefix><separator><n>``.
+
+        Only used once per counter, to start new counters after the lots
+        numbered before the counter existed.
+        """
+        self.env['stock.lot'].flush_model(['name', 'product_id'])
+        pattern = (prefix + separator).replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        self.env.cr.execute("""
+            SELECT COALESCE(MAX(substring(name FROM '(\\d+)$')::bigint), 0)
+              FROM stock_lot
+             WHERE product_id = %s
+               AND name LIKE %s
+               AND substring(name FROM char_length(%s) + 1) ~ '^\\d+$'
+        """, [product.id, pattern, prefix + separator])
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _reserve_numbers(self, product, prefix, count=1, year=0, separator='-'):
+        """Reserve ``count`` consecutive numbers for (product, prefix, year).
+
+        The counter row is incremented by a single UPDATE; the row lock it
+        takes serialises concurrent callers until their transaction ends, so
+        two transactions can never get the same numbers.  Returns the first
+        reserved number.
+        """
+        if count < 1:
+            raise ValueError("count must be at least 1")
+        cr = self.env.cr
+        params = [product.id, prefix, year]
+        cr.execute("SELECT 1 FROM stock_lot_counter WHERE product_id = %s AND prefix = %s AND year = %s", params)
+        if not cr.fetchone():
+            start = self._get_existing_max_number(product, prefix, separator)
+            cr.execute("""
+                INSERT INTO stock_lot_counter
+                       (product_id, prefix, year, last_number, create_uid, write_uid, create_date, write_date)
+                VALUES (%s, %s, %s, %s, %s, %s, now() at time zone 'UTC', now() at time zone 'UTC')
+                ON CONFLICT (product_id, prefix, year) DO NOTHING
+            """, params + [start, self.env.uid, self.env.uid])
+        cr.execute("""
+            UPDATE stock_lot_counter
+               SET last_number = last_number + %s,
+                   write_uid = %s,
+                   write_date = now() at time zone 'UTC'
+             WHERE product_id = %s AND prefix = %s AND year = %s
+         RETURNING last_number
+        """, [count, self.env.uid] + params)
+        last_number = cr.fetchone()[0]
+        self.invalidate_model(['last_number', 'write_uid', 'write_date'])
+        return last_number - count + 1
+
+    @api.model
+    def _next_lot_names(self, product, prefix, count=1, padding=4, year=0, separator='-'):
+        """Return ``count`` new lot names ``<prefix><separator><number>``."""
+        first = self._reserve_numbers(product, prefix, count=count, year=year, separator=separator)
+        names = [f"{prefix}{separator}{str(number).zfill(padding)}" for number in range(first, first + count)]
+        _logger.info(">>> Reserved lot numbers %s..%s for %s", names[0], names[-1], product.display_name)
+        return names